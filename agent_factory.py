@@ -6,7 +6,7 @@ from ollama import Client
 from utils.logger import get_logger
 from config.config_manager import ConfigManager
 from config.schema_validator import SchemaValidator
-from llm.ollama_client import OllamaClient
+from llm.ollama_client import OllamaClient, get_shared_client
 from databases.factory import DatabaseFactory
 from databases.base import IDatabaseAdapter
 from core.agent import ReActAgent
@@ -37,9 +37,9 @@ class AgentFactory:
         logger.info("agent_factory_initialized")
     
     def _create_ollama_client(self, host: str = "http://localhost:11434") -> OllamaClient:
-        """Create Ollama client."""
+        """Get the shared Ollama client for a host."""
         logger.info("creating_ollama_client", host=host)
-        return OllamaClient(host=host)
+        return get_shared_client(host)
     
     def _create_database_adapter(self, db_config: Dict[str, Any]) -> IDatabaseAdapter:
         """Create database adapter from configuration."""
@@ -79,6 +79,7 @@ class AgentFactory:
         tools = {}
         context = {
             "llm_client": llm_client,
+            "async_llm_client": llm_client.async_client,
             "db_adapter": db_adapter,
             "pii_masker": pii_masker
         }
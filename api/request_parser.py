@@ -165,8 +165,9 @@ class RequestParser:
         query_value = None
         
         for key in query_keys:
-            if key in data and data[key]:
-                query_value = data[key]
+            value = data.get(key)
+            if value:
+                query_value = value
                 break
         
         # If no query found, check if the whole data dict should be treated as query
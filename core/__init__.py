@@ -3,7 +3,7 @@ Core framework components for the multi-agent LLM system.
 """
 
 from .agent import IAgent, ReActAgent
-from .tool import ITool, BaseTool
+from .tool import ITool, BaseTool, run_many
 from .registry import ToolRegistry
 
 __all__ = [
@@ -11,6 +11,7 @@ __all__ = [
     'ReActAgent',
     'ITool',
     'BaseTool',
+    'run_many',
     'ToolRegistry',
 ]
 
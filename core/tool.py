@@ -1,8 +1,11 @@
 """
 Base tool interface and implementation.
 """
+import os
+import asyncio
 from abc import ABC, abstractmethod
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, List
+from structlog.contextvars import bound_contextvars
 from utils.logger import get_logger
 
 logger = get_logger(__name__)
@@ -14,6 +17,8 @@ class ITool(ABC):
     Tools are executable units that agents can use to perform actions.
     """
     
+    __slots__ = ()
+    
     @abstractmethod
     def execute(self, args: Dict[str, Any], trace_id: Optional[str] = None) -> str:
         """
@@ -55,6 +60,8 @@ class BaseTool(ITool):
     Provides validation, logging, and error handling.
     """
     
+    __slots__ = ("_name", "_description", "_parameter_schema")
+    
     def __init__(
         self,
         name: str,
@@ -138,22 +145,44 @@ class BaseTool(ITool):
         Execute the tool with validation.
         Subclasses should implement _execute_impl.
         """
-        log = logger.bind(trace_id=trace_id, tool_name=self._name)
-        
-        # Validate arguments
-        is_valid, error_msg = self._validate_args(args)
-        if not is_valid:
-            log.warning("tool_validation_failed", error=error_msg)
-            return f"Error: {error_msg}"
-        
-        try:
-            log.info("tool_execution_start", args=args)
-            result = self._execute_impl(args, trace_id)
-            log.info("tool_execution_success", result_preview=str(result)[:200])
-            return result
-        except Exception as e:
-            log.error("tool_execution_error", error=str(e), exc_info=True)
-            return f"Tool execution failed: {e}"
+        # Scope trace_id/tool_name to this call; every log inside the tool picks them up
+        with bound_contextvars(trace_id=trace_id, tool_name=self._name):
+            # Validate arguments
+            is_valid, error_msg = self._validate_args(args)
+            if not is_valid:
+                logger.warning("tool_validation_failed", error=error_msg)
+                return f"Error: {error_msg}"
+            
+            try:
+                logger.info("tool_execution_start", args=args)
+                result = self._execute_impl(args, trace_id)
+                logger.info("tool_execution_success", result_preview=str(result)[:200])
+                return result
+            except Exception as e:
+                logger.error("tool_execution_error", error=str(e), exc_info=True)
+                return f"Tool execution failed: {e}"
+    
+    async def aexecute(self, args: Dict[str, Any], trace_id: Optional[str] = None) -> str:
+        """
+        Execute the tool asynchronously with validation.
+        Subclasses with native async I/O should override _aexecute_impl.
+        """
+        # Scope trace_id/tool_name to this call; every log inside the tool picks them up
+        with bound_contextvars(trace_id=trace_id, tool_name=self._name):
+            # Validate arguments
+            is_valid, error_msg = self._validate_args(args)
+            if not is_valid:
+                logger.warning("tool_validation_failed", error=error_msg)
+                return f"Error: {error_msg}"
+            
+            try:
+                logger.info("tool_execution_start", args=args)
+                result = await self._aexecute_impl(args, trace_id)
+                logger.info("tool_execution_success", result_preview=str(result)[:200])
+                return result
+            except Exception as e:
+                logger.error("tool_execution_error", error=str(e), exc_info=True)
+                return f"Tool execution failed: {e}"
     
     @abstractmethod
     def _execute_impl(self, args: Dict[str, Any], trace_id: Optional[str] = None) -> str:
@@ -162,4 +191,40 @@ class BaseTool(ITool):
         Subclasses must implement this method.
         """
         pass
+    
+    async def _aexecute_impl(self, args: Dict[str, Any], trace_id: Optional[str] = None) -> str:
+        """
+        Async implementation of tool execution.
+        Defaults to running _execute_impl in a worker thread.
+        """
+        return await asyncio.to_thread(self._execute_impl, args, trace_id)
+
+
+async def run_many(
+    tool: BaseTool,
+    args_list: List[Dict[str, Any]],
+    concurrency: Optional[int] = None,
+    trace_id: Optional[str] = None
+) -> List[str]:
+    """
+    Execute a tool over many argument sets concurrently.
+    
+    Args:
+        tool: Tool to execute
+        args_list: Argument dictionaries, one per call
+        concurrency: Maximum in-flight calls (defaults to OLLAMA_NUM_PARALLEL, or 4)
+        trace_id: Optional trace ID for logging
+        
+    Returns:
+        Results in the same order as args_list
+    """
+    if concurrency is None:
+        concurrency = int(os.getenv("OLLAMA_NUM_PARALLEL", "4"))
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+    
+    async def run_one(args: Dict[str, Any]) -> str:
+        async with semaphore:
+            return await tool.aexecute(args, trace_id)
+    
+    return await asyncio.gather(*(run_one(args) for args in args_list))
 
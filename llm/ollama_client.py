@@ -2,14 +2,74 @@
 Ollama client wrapper with connection pooling and retry logic.
 """
 import time
-from typing import Dict, Any, Optional, List
-from ollama import Client
+import asyncio
+import threading
+from typing import Callable, Dict, Any, Optional, List, Tuple
+import httpx
+from ollama import Client, AsyncClient
 from utils.logger import get_logger
 from utils.exceptions import LLMError
 from llm.base import ILLMProvider
 
 logger = get_logger(__name__)
 
+# Keep-alive pool shared by every tool that uses a given client
+DEFAULT_POOL_LIMITS = httpx.Limits(
+    max_keepalive_connections=32,
+    max_connections=64,
+    keepalive_expiry=300
+)
+
+# Fail fast on an unreachable host instead of waiting the full request timeout
+DEFAULT_CONNECT_TIMEOUT = 5.0
+
+
+class LoopLocalAsyncClient:
+    """
+    AsyncClient stand-in that keeps one client, and so one pool, per event loop.
+    
+    httpx connections belong to the loop that opened them, so a single
+    AsyncClient shared across asyncio.run calls would reuse sockets from a
+    closed loop. Attribute access resolves against the running loop's client;
+    clients of loops that have since closed are dropped on the next lookup.
+    """
+    
+    __slots__ = ("_factory", "_clients", "_lock")
+    
+    def __init__(self, factory: Callable[[], AsyncClient]):
+        """
+        Initialize the per-loop client registry.
+        
+        Args:
+            factory: Builds a new AsyncClient for a loop
+        """
+        self._factory = factory
+        self._clients: Dict[asyncio.AbstractEventLoop, AsyncClient] = {}
+        self._lock = threading.Lock()
+    
+    def _client(self) -> AsyncClient:
+        """Return the running loop's AsyncClient, creating it on first use."""
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            client = self._clients.get(loop)
+            if client is None:
+                for closed in [other for other in self._clients if other.is_closed()]:
+                    del self._clients[closed]
+                client = self._factory()
+                self._clients[loop] = client
+            return client
+    
+    async def close(self):
+        """Close the running loop's client and its connections."""
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            client = self._clients.pop(loop, None)
+        if client is not None:
+            await client.close()
+    
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._client(), name)
+
 
 class OllamaClient(ILLMProvider):
     """
@@ -36,7 +96,13 @@ class OllamaClient(ILLMProvider):
         self.timeout = timeout
         self.max_retries = max_retries
         self.retry_delay = retry_delay
-        self._client = Client(host=host)
+        self._client = Client(
+            host=host,
+            timeout=httpx.Timeout(timeout, connect=DEFAULT_CONNECT_TIMEOUT),
+            limits=DEFAULT_POOL_LIMITS
+        )
+        self._async_client: Optional[LoopLocalAsyncClient] = None
+        self._async_client_lock = threading.Lock()
         
         # Test connection
         try:
@@ -45,6 +111,29 @@ class OllamaClient(ILLMProvider):
         except Exception as e:
             logger.warning("ollama_connection_test_failed", error=str(e))
     
+    @property
+    def async_client(self) -> LoopLocalAsyncClient:
+        """
+        Shared Ollama AsyncClient for this host, created on first use.
+        
+        Async callers on the same event loop reuse one keep-alive connection
+        pool instead of opening new connections per request; each loop gets
+        its own pool.
+        """
+        if self._async_client is None:
+            with self._async_client_lock:
+                if self._async_client is None:
+                    self._async_client = LoopLocalAsyncClient(self._new_async_client)
+        return self._async_client
+    
+    def _new_async_client(self) -> AsyncClient:
+        """Build an AsyncClient with this client's timeout and pool limits."""
+        return AsyncClient(
+            host=self.host,
+            timeout=httpx.Timeout(self.timeout, connect=DEFAULT_CONNECT_TIMEOUT),
+            limits=DEFAULT_POOL_LIMITS
+        )
+    
     def chat(
         self,
         model: str,
@@ -158,6 +247,36 @@ class OllamaClient(ILLMProvider):
             return False
 
 
+_SHARED_CLIENTS: Dict[Tuple[str, int], OllamaClient] = {}
+_SHARED_CLIENTS_LOCK = threading.Lock()
+
+
+def get_shared_client(host: str = "http://localhost:11434", timeout: int = 60) -> OllamaClient:
+    """
+    Get the process-wide OllamaClient for a host, creating it on first use.
+    
+    Every agent and tool built against the same host reuses one keep-alive
+    connection pool (and one lazily created AsyncClient per event loop) instead of paying
+    connection setup on each request. Pair this with the server-side
+    OLLAMA_NUM_PARALLEL (concurrent requests per model) and OLLAMA_KEEP_ALIVE
+    (how long models stay loaded) settings.
+    
+    Args:
+        host: Ollama server host URL
+        timeout: Request timeout in seconds
+        
+    Returns:
+        Shared OllamaClient instance
+    """
+    key = (host, timeout)
+    with _SHARED_CLIENTS_LOCK:
+        client = _SHARED_CLIENTS.get(key)
+        if client is None:
+            client = OllamaClient(host=host, timeout=timeout)
+            _SHARED_CLIENTS[key] = client
+        return client
+
+
 class OllamaClientPool:
     """
     Pool of Ollama clients for concurrent requests.
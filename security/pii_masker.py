@@ -1,11 +1,34 @@
 """
 PII masking using Presidio.
 """
+import re
 from typing import Optional
-from utils.logger import get_logger
+import pandas as pd
+from utils.logger import get_logger, trace_scope
 
 logger = get_logger(__name__)
 
+# Column names that identify PII; shared with SQLValidatorTool
+PII_COLUMN_PATTERNS = [
+    r'ssn', r'social_security', r'credit_card', r'cc_num',
+    r'phone', r'email', r'address', r'dob', r'date_of_birth'
+]
+
+_PII_COLUMN_RE = re.compile("|".join(f"(?:{p})" for p in PII_COLUMN_PATTERNS), re.IGNORECASE)
+
+# Structured PII values caught with vectorized str.replace before Presidio runs
+_PII_VALUE_RE = re.compile(
+    r"[\w.+-]+@[\w-]+\.[\w.-]+"          # email
+    r"|\b\d{3}-\d{2}-\d{4}\b"           # SSN
+    r"|\b(?:\d[ -]?){13,16}\b"          # card number
+    r"|(?:\+\d{1,2}[ .-]?)?\(?\b\d{3}\)?[ .-]\d{3}[ .-]\d{4}\b"  # phone
+)
+
+# Whole numeric values long enough to be phone or card numbers stored as integers
+_PII_NUMBER_RE = re.compile(r"\+?\d{10,19}")
+
+REDACTED = "<REDACTED>"
+
 # Lazy import to avoid issues with Python 3.14 compatibility
 _analyzer_engine = None
 _anonymizer_engine = None
@@ -82,7 +105,7 @@ class PIIMasker:
             anonymized_result = self.anonymizer.anonymize(
                 text=text_data,
                 analyzer_results=analyzer_results,
-                operators={"DEFAULT": self._operator_config("replace", {"new_value": "<REDACTED>"})}
+                operators={"DEFAULT": self._operator_config("replace", {"new_value": REDACTED})}
             )
             
             if analyzer_results:
@@ -96,4 +119,66 @@ class PIIMasker:
         except Exception as e:
             log.error("pii_masking_failed", error=str(e), exc_info=True)
             return "[PII masking failed. Data redacted.]"
-
+    
+    def _mask_distinct(self, values: pd.Series, trace_id: str = None) -> pd.Series:
+        """Run Presidio once per distinct non-null value of a text column."""
+        distinct = values.dropna().unique()
+        return values.map(dict(zip(distinct, (self.mask_text_result(v, trace_id) for v in distinct))))
+    
+    def _mask_header(self, name, trace_id: str = None):
+        """Mask PII in a column name, keeping the original label when nothing matches."""
+        text = _PII_VALUE_RE.sub(REDACTED, str(name))
+        if self._presidio_available:
+            text = self.mask_text_result(text, trace_id)
+        return name if text == str(name) else text
+    
+    def mask_dataframe(self, df: pd.DataFrame, trace_id: str = None) -> pd.DataFrame:
+        """
+        Mask PII in a query result column by column.
+        
+        Columns whose name matches PII_COLUMN_PATTERNS are redacted whole. Every
+        other non-boolean column is checked in its string form: a vectorized
+        regex pass for emails, SSNs, card and phone numbers, then (when Presidio
+        is available) each distinct value is analyzed once. In numeric columns,
+        whole values of 10 to 19 digits (phone and card numbers stored as
+        integers) are redacted too. A column only becomes text when one of its
+        values is masked. Column names get the same regex and Presidio pass.
+        
+        Args:
+            df: Query result
+            trace_id: Optional trace ID for logging
+            
+        Returns:
+            Masked copy of the DataFrame
+        """
+        masked = df.copy()
+        pii_columns = []
+        
+        for col in masked.columns:
+            column = masked[col]
+            if _PII_COLUMN_RE.search(str(col)):
+                masked[col] = REDACTED
+                pii_columns.append(str(col))
+                continue
+            
+            if pd.api.types.is_bool_dtype(column):
+                continue
+            
+            present = column.notna()
+            text = column.astype(str)
+            values = text.where(present)
+            if pd.api.types.is_numeric_dtype(column):
+                values = values.mask(values.str.fullmatch(_PII_NUMBER_RE, na=False), REDACTED)
+            values = values.str.replace(_PII_VALUE_RE, REDACTED, regex=True)
+            if self._presidio_available:
+                values = self._mask_distinct(values, trace_id)
+            changed = present & (values != text)
+            if changed.any():
+                masked[col] = column.astype(object).mask(changed, values)
+        
+        masked.columns = [self._mask_header(col, trace_id) for col in masked.columns]
+        
+        if pii_columns:
+            with trace_scope(trace_id):
+                logger.info("pii_columns_redacted", columns=pii_columns)
+        return masked
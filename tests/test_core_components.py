@@ -2,11 +2,12 @@
 Tests for core components (ResponseParser, ToolExecutor, ErrorHandler).
 """
 import pytest
-from unittest.mock import Mock, MagicMock
+from unittest.mock import Mock, MagicMock, patch
 from core.response_parser import ResponseParser
 from core.tool_executor import ToolExecutor
 from core.error_handler import ErrorHandler
 from core.tool import ITool
+from llm import ollama_client
 
 
 class MockTool(ITool):
@@ -178,3 +179,44 @@ class TestErrorHandler:
         assert "string" in error_msg
         assert "int" in error_msg
 
+
+class TestSharedOllamaClient:
+    """Test the per-host shared Ollama client."""
+    
+    def test_same_host_reuses_client(self):
+        """Test that one client (and connection pool) is built per host."""
+        with patch.dict(ollama_client._SHARED_CLIENTS, clear=True), \
+             patch.object(ollama_client, "OllamaClient", side_effect=lambda **kw: Mock(**kw)) as factory:
+            first = ollama_client.get_shared_client("http://a:11434")
+            second = ollama_client.get_shared_client("http://a:11434")
+            other = ollama_client.get_shared_client("http://b:11434")
+        
+        assert first is second
+        assert other is not first
+        assert factory.call_count == 2
+    
+    def test_async_client_is_per_event_loop(self):
+        """Test that each event loop gets its own AsyncClient, built once per loop."""
+        import asyncio
+        clients = ollama_client.LoopLocalAsyncClient(Mock)
+        
+        async def resolve():
+            return clients.chat, clients.chat
+        
+        first, again = asyncio.run(resolve())
+        second, _ = asyncio.run(resolve())
+        
+        assert first is again
+        assert second is not first
+        assert len(clients._clients) == 1
+    
+    def test_async_client_property_is_built_once(self):
+        """Test that the lazy async_client is created once under concurrent first use."""
+        from concurrent.futures import ThreadPoolExecutor
+        with patch.object(ollama_client, "Client"):
+            client = ollama_client.OllamaClient()
+        
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            results = list(pool.map(lambda _: client.async_client, range(32)))
+        
+        assert all(result is results[0] for result in results)
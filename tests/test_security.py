@@ -62,6 +62,56 @@ class TestPIIMasker:
         # Result should either be masked or original (if Presidio not available)
         assert isinstance(result, str)
         assert len(result) > 0
+    
+    @patch('security.pii_masker._import_presidio', side_effect=ImportError("no presidio"))
+    def test_mask_dataframe_without_presidio(self, mock_import):
+        """Test column-name redaction and vectorized value masking on a result frame."""
+        import pandas as pd
+        df = pd.DataFrame({
+            "id": [1, 2],
+            "Email_Address": ["a@example.com", "b@example.com"],
+            "note": ["call 555-123-4567 or mail c@example.org", None],
+        })
+        
+        masked = PIIMasker().mask_dataframe(df, trace_id="test")
+        
+        assert list(masked["id"]) == [1, 2]
+        assert list(masked["Email_Address"]) == ["<REDACTED>", "<REDACTED>"]
+        assert masked["note"][0] == "call <REDACTED> or mail <REDACTED>"
+        assert pd.isna(masked["note"][1])
+        assert df["Email_Address"][0] == "a@example.com"
+    
+    @patch('security.pii_masker._import_presidio', side_effect=ImportError("no presidio"))
+    def test_mask_dataframe_numeric_columns(self, mock_import):
+        """Test that card and phone numbers stored as integers are masked."""
+        import pandas as pd
+        df = pd.DataFrame({
+            "card": [4111111111111111, 42],
+            "contact": [5551234567, 5551234568],
+            "amount": [10, 20],
+        })
+        
+        masked = PIIMasker().mask_dataframe(df)
+        
+        assert list(masked["card"]) == ["<REDACTED>", 42]
+        assert list(masked["contact"]) == ["<REDACTED>", "<REDACTED>"]
+        assert masked["amount"].dtype == df["amount"].dtype
+    
+    @patch('security.pii_masker._import_presidio', side_effect=ImportError("no presidio"))
+    def test_mask_dataframe_headers_and_non_text_columns(self, mock_import):
+        """Test that categorical columns and column names are scanned too."""
+        import pandas as pd
+        df = pd.DataFrame({
+            "owner": pd.Categorical(["a@example.com", "team"]),
+            "seen": pd.to_datetime(["2024-01-01", None]),
+            "c@example.org": [1, 2],
+        })
+        
+        masked = PIIMasker().mask_dataframe(df)
+        
+        assert list(masked.columns) == ["owner", "seen", "<REDACTED>"]
+        assert list(masked["owner"]) == ["<REDACTED>", "team"]
+        assert masked["seen"].dtype == df["seen"].dtype
 
 
 class TestQueryValidator:
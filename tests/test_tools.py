@@ -1,15 +1,24 @@
 """
 Tests for tools.
 """
+import json
+import asyncio
 import pytest
-from unittest.mock import Mock, patch, MagicMock
+import structlog
+from unittest.mock import Mock, patch, MagicMock, AsyncMock
 from tools.sql_generator import SQLGeneratorTool
 from tools.sql_validator import SQLValidatorTool
 from tools.sql_executor import SQLExecutorTool
+from tools.schema_introspector import SchemaIntrospectorTool
 from tools.log_analyzer import LogAnalyzerTool, LogParserTool, PatternDetectorTool
-from tools.financial_extractor import FinancialExtractorTool, MessageParserTool, FieldValidatorTool
+from tools.financial_extractor import FinancialExtractorTool, MessageParserTool, FieldValidatorTool, create_financial_field_validator, FINANCIAL_EXTRACTION_SCHEMA
 from tools.bucketing_strategy import FieldAnalyzerTool, BucketStrategyGeneratorTool, BucketValidatorTool
-from utils.exceptions import ToolExecutionError
+from tools.field_extractor import GenericFieldExtractorTool
+from tools.field_extractor import create_field_validator
+from tools.factory import ToolFactory
+from core.tool import run_many
+from utils.extraction_cache import ExtractionCache
+from utils.exceptions import ToolExecutionError, ConfigurationError
 
 
 class TestSQLGeneratorTool:
@@ -52,6 +61,28 @@ class TestSQLGeneratorTool:
         
         # Check that SQL is in the result (format may vary)
         assert "SELECT" in result or "users" in result.lower()
+    
+    def test_parse_sql_from_response(self):
+        """Test that code fences, trailing semicolons and leading labels are removed."""
+        tool = SQLGeneratorTool(Mock(), "test-model")
+        
+        assert tool._parse_sql_from_response("```SQL\nSELECT 1;\n```") == "SELECT 1"
+        assert tool._parse_sql_from_response("SQL Query: SELECT 2;") == "SELECT 2"
+        assert tool._parse_sql_from_response("SELECT 3") == "SELECT 3"
+    
+    def test_construct_prompt_layout(self):
+        """Test that the prompt places schema, correction context and question in order."""
+        tool = SQLGeneratorTool(Mock(), "test-model", database_type="postgresql")
+        
+        fresh = tool._construct_prompt("Count users", "CREATE TABLE users (id INT)")
+        corrected = tool._construct_prompt("Count users", "CREATE TABLE users (id INT)", "bad column")
+        
+        assert fresh.startswith("# Role\nYou are a world-class POSTGRESQL SQL expert")
+        assert "PostgreSQL-Specific Guidelines" in fresh
+        assert "-- No previous errors. Generate a fresh query." in fresh
+        assert "-- bad column" in corrected
+        assert corrected.index("CREATE TABLE users") < corrected.index("-- bad column") < corrected.index("Count users")
+        assert fresh.endswith("# Your SQL Query (ONLY the query, nothing else):")
 
 
 class TestSQLValidatorTool:
@@ -92,6 +123,73 @@ class TestSQLValidatorTool:
         })
         
         assert "error" in result.lower() or "forbidden" in result.lower()
+    
+    def test_repeated_query_uses_cached_outcome(self):
+        """Test that re-validating a query skips parsing."""
+        import tools.sql_validator as sql_validator
+        tool = SQLValidatorTool(allowed_tables=["users"], database_type="clickhouse")
+        
+        with patch.object(sql_validator.sqlglot, "parse", wraps=sql_validator.sqlglot.parse) as parse:
+            first = tool.execute({"sql_query": "SELECT id FROM users"})
+            second = tool.execute({"sql_query": "SELECT id FROM users"})
+        
+        assert first == second == "SQL query is valid."
+        assert parse.call_count == 1
+    
+    def test_pii_column_rejected(self):
+        """Test that PII columns are caught and unauthorized tables take precedence."""
+        tool = SQLValidatorTool(allowed_tables=["users"], database_type="clickhouse")
+        
+        assert "PII column: 'email'" in tool.execute({"sql_query": "SELECT id, email FROM users"})
+        assert "unauthorized tables" in tool.execute({"sql_query": "SELECT email FROM users JOIN secrets ON 1 = 1"})
+    
+    def test_custom_pii_patterns(self):
+        """Test that custom PII patterns are combined case-insensitively."""
+        tool = SQLValidatorTool(allowed_tables=["users"], pii_patterns=[r"salary", r"^tax_"])
+        
+        assert "PII column: 'tax_id'" in tool.execute({"sql_query": "SELECT TAX_ID FROM users"})
+        assert tool.execute({"sql_query": "SELECT email FROM users"}) == "SQL query is valid."
+    
+    def test_multiple_statements_rejected(self):
+        """Test that stacked statements are rejected from the single parse."""
+        tool = SQLValidatorTool(allowed_tables=["users"], database_type="clickhouse")
+        
+        assert "Multiple SQL statements" in tool.execute({"sql_query": "SELECT id FROM users; DROP TABLE users"})
+        assert tool.execute({"sql_query": "SELECT id FROM users;"}) == "SQL query is valid."
+    
+    def test_validation_cache_is_bounded(self):
+        """Test that the least recently used outcomes are evicted."""
+        tool = SQLValidatorTool(allowed_tables=["users"], database_type="clickhouse", cache_size=2)
+        
+        for column in ("a", "b", "c"):
+            tool.execute({"sql_query": f"SELECT {column} FROM users"})
+        
+        assert len(tool._validation_cache) == 2
+        assert len(tool._parse_cache) == 2
+    
+    def test_correction_tries_default_dialect_first(self):
+        """Test that correction transpiles from sqlglot's default dialect before the named ones."""
+        import tools.sql_validator as sql_validator
+        tool = SQLValidatorTool(allowed_tables=["users"], database_type="clickhouse")
+        
+        with patch.object(sql_validator.sqlglot, "transpile", wraps=sql_validator.sqlglot.transpile) as transpile:
+            result = tool.execute({"sql_query": "SELECT TOP 5 id FROM users"})
+        
+        assert result == "SQL query corrected and validated. Corrected query: SELECT id FROM users LIMIT 5"
+        assert [c.kwargs["read"] for c in transpile.call_args_list] == [None, "tsql"]
+    
+    def test_get_validated_sql(self):
+        """Test that accepted queries can be fetched as rendered SQL, corrected if needed."""
+        tool = SQLValidatorTool(allowed_tables=["users"], database_type="clickhouse")
+        
+        tool.execute({"sql_query": "SELECT id FROM users"})
+        tool.execute({"sql_query": "SELECT TOP 5 id FROM users"})
+        tool.execute({"sql_query": "SELECT id FROM secrets"})
+        
+        assert tool.get_validated_sql("SELECT id FROM users") == "SELECT id FROM users"
+        assert tool.get_validated_sql("SELECT TOP 5 id FROM users") == "SELECT id FROM users LIMIT 5"
+        assert tool.get_validated_sql("SELECT id FROM secrets") is None
+        assert tool.get_validated_sql("SELECT name FROM users") is None
 
 
 class TestSQLExecutorTool:
@@ -117,6 +215,104 @@ class TestSQLExecutorTool:
         
         assert "executed successfully" in result.lower()
         mock_adapter.execute_query.assert_called_once()
+    
+    def test_sql_executor_markdown_rows(self):
+        """Test the markdown rendering of results, including the row limit."""
+        import pandas as pd
+        mock_adapter = Mock()
+        mock_adapter.execute_query.return_value = pd.DataFrame({"id": [1, 2, 3], "note": ["a|b", "c\nd", "e"]})
+        
+        full = SQLExecutorTool(mock_adapter).execute({"sql_query": "SELECT * FROM test"})
+        limited = SQLExecutorTool(mock_adapter, max_markdown_rows=1).execute({"sql_query": "SELECT * FROM test"})
+        
+        assert full.endswith("| id | note |\n|---|---|\n| 1 | a\\|b |\n| 2 | c d |\n| 3 | e |")
+        assert "| 1 | a\\|b |" in limited
+        assert "| 2 |" not in limited
+        assert limited.endswith("[2 of 3 rows omitted]")
+    
+    def test_sql_executor_runs_validated_statement(self):
+        """Test that the validator's statement is executed and caller-supplied SQL is ignored."""
+        import pandas as pd
+        mock_adapter = Mock()
+        mock_adapter.execute_query.return_value = pd.DataFrame({"id": [1, 2]})
+        validator = Mock()
+        validator.get_validated_sql.side_effect = lambda q: "SELECT id FROM users LIMIT 5" if q.startswith("SELECT TOP") else None
+        tool = SQLExecutorTool(mock_adapter, validator=validator)
+        
+        assert "parsed_sql" not in tool.get_parameter_schema()
+        tool.execute({"sql_query": "SELECT TOP 5 id FROM users", "parsed_sql": "DROP TABLE users"})
+        assert mock_adapter.execute_query.call_args[0][0] == "SELECT id FROM users LIMIT 5"
+        
+        tool.execute({"sql_query": "SELECT 1", "parsed_sql": "DROP TABLE users"})
+        assert mock_adapter.execute_query.call_args[0][0] == "SELECT 1"
+    
+    def test_sql_tools_share_validator(self):
+        """Test that executor and validator built from one context share a validator."""
+        from tools.sql_executor import create_sql_executor
+        from tools.sql_validator import create_sql_validator
+        mock_adapter = Mock()
+        mock_adapter.get_allowed_tables.return_value = ["users"]
+        mock_adapter.get_database_type.return_value = "clickhouse"
+        context = {"db_adapter": mock_adapter}
+        
+        executor = create_sql_executor({}, context)
+        validator = create_sql_validator({}, context)
+        
+        assert executor.validator is validator
+    
+    def test_sql_executor_scalar_result(self):
+        """Test that a single-cell result is returned without a table."""
+        import pandas as pd
+        mock_adapter = Mock()
+        mock_adapter.execute_query.return_value = pd.DataFrame({"count()": [42]})
+        
+        result = SQLExecutorTool(mock_adapter).execute({"sql_query": "SELECT count(*) FROM t"})
+        
+        assert result == "Query executed successfully. Result: 42"
+    
+    def test_sql_executor_masks_dataframe_before_rendering(self):
+        """Test that PII masking runs on the result frame, not the rendered text."""
+        import pandas as pd
+        mock_adapter = Mock()
+        mock_adapter.execute_query.return_value = pd.DataFrame({"email": ["a@example.com"]})
+        masker = Mock()
+        masker.mask_dataframe.return_value = pd.DataFrame({"email": ["<REDACTED>"], "id": [1]})
+        
+        result = SQLExecutorTool(mock_adapter, pii_masker=masker).execute({"sql_query": "SELECT email, id FROM t"})
+        
+        assert result.endswith("| <REDACTED> | 1 |")
+        masker.mask_text_result.assert_not_called()
+
+
+class TestSchemaIntrospectorTool:
+    """Tests for schema introspector tool."""
+    
+    def test_schema_is_cached_per_table_set(self):
+        """Test that repeated lookups of the same tables reuse the fetched schema."""
+        mock_adapter = Mock()
+        mock_adapter.get_schema.return_value = "CREATE TABLE logs (id Int64)"
+        tool = SchemaIntrospectorTool(mock_adapter)
+        
+        first = tool.execute({"tables": ["logs", "events"]})
+        second = tool.execute({"tables": ["events", "logs"]})
+        
+        assert "CREATE TABLE logs" in first
+        assert "CREATE TABLE logs" in second
+        mock_adapter.get_schema.assert_called_once()
+    
+    def test_invalidate_and_errors_are_not_cached(self):
+        """Test explicit invalidation and that failed lookups are retried."""
+        mock_adapter = Mock()
+        mock_adapter.get_allowed_tables.return_value = ["logs"]
+        mock_adapter.get_schema.side_effect = ["Error: timeout", "CREATE TABLE logs", "CREATE TABLE logs"]
+        tool = SchemaIntrospectorTool(mock_adapter)
+        
+        assert "Schema retrieval failed" in tool.execute({"tables": ["logs"]})
+        tool.execute({"tables": ["logs"]})
+        tool.invalidate_schema_cache()
+        tool.execute({"tables": ["logs"]})
+        
+        assert mock_adapter.get_schema.call_count == 3
 
 
 class TestLogParserTool:
@@ -131,6 +327,25 @@ class TestLogParserTool:
         
         assert "level" in result or "ERROR" in result
     
+    def test_log_parser_ndjson(self):
+        """Test that line-delimited JSON logs are parsed into a compact array."""
+        tool = LogParserTool(log_format="json")
+        result = tool.execute({
+            "log_data": '{"level": "ERROR", "message": "a"}\n{"level": "INFO", "message": "b"}\n'
+        })
+        
+        assert result == '[{"level":"ERROR","message":"a"},{"level":"INFO","message":"b"}]'
+    
+    def test_log_parser_pretty_printed_document(self):
+        """Test that a multi-line JSON document is not mistaken for NDJSON."""
+        tool = LogParserTool(log_format="json")
+        result = tool.execute({
+            "log_data": '{\n  "level": "ERROR",\n  "message": "test"\n}',
+            "pretty": True
+        })
+        
+        assert result == '{\n  "level": "ERROR",\n  "message": "test"\n}'
+    
     def test_log_parser_text(self):
         """Test parsing text logs."""
         tool = LogParserTool(log_format="text")
@@ -141,6 +356,132 @@ class TestLogParserTool:
         assert "ERROR" in result
 
 
+class TestPatternDetectorTool:
+    """Tests for pattern detector tool."""
+    
+    def test_stream_patterns_yields_incrementally(self):
+        """Test that streamed chunks are parsed into patterns and cached when complete."""
+        mock_llm = Mock()
+        mock_llm.chat.return_value = iter([
+            {'message': {'content': '{"patterns": [{"pattern_name": "disk'}},
+            {'message': {'content': '_full"}, {"pattern_name": "oom"}'}},
+            {'message': {'content': '], "anomalies": []}'}}
+        ])
+        cache = ExtractionCache()
+        tool = PatternDetectorTool(mock_llm, "test-model", cache=cache)
+        
+        patterns = list(tool.stream_patterns({"log_data": "ERROR disk full"}))
+        
+        assert [p["pattern_name"] for p in patterns] == ["disk_full", "oom"]
+        assert mock_llm.chat.call_args.kwargs["stream"] is True
+        assert tool.execute({"log_data": "ERROR disk full"}).startswith('{"patterns"')
+        mock_llm.chat.assert_called_once()
+    
+    def test_trims_logs_by_severity(self):
+        """Test that long logs keep the most severe lines in their original order."""
+        mock_llm = Mock()
+        mock_llm.chat.return_value = {'message': {'content': '{}'}}
+        tool = PatternDetectorTool(mock_llm, "test-model")
+        log_data = "\n".join([
+            "DEBUG cache miss",
+            "INFO request served",
+            "ERROR disk full",
+            "Traceback (most recent call last):",
+            "WARNING slow query",
+        ])
+        
+        tool.execute({"log_data": log_data, "max_log_lines": 3})
+        
+        prompt = mock_llm.chat.call_args.kwargs["messages"][0]["content"]
+        assert "[2 of 5 log lines omitted" in prompt
+        assert "ERROR disk full\nTraceback (most recent call last):\nWARNING slow query" in prompt
+        assert "DEBUG cache miss" not in prompt
+        assert "INFO request served" not in prompt
+    
+    def test_chat_options_bound_generation(self):
+        """Test that detection is deterministic and max_tokens overrides num_predict."""
+        mock_llm = Mock()
+        mock_llm.chat.return_value = {'message': {'content': '{}'}}
+        tool = PatternDetectorTool(mock_llm, "test-model")
+        
+        tool.execute({"log_data": "ERROR a"})
+        options = mock_llm.chat.call_args.kwargs["options"]
+        assert options["temperature"] == 0
+        assert options["num_predict"] == 2048
+        
+        tool.execute({"log_data": "ERROR b", "max_tokens": 256})
+        assert mock_llm.chat.call_args.kwargs["options"]["num_predict"] == 256
+    
+    def test_empty_log_data_skips_llm(self):
+        """Test that empty payloads get the canonical no-data analysis without an LLM call."""
+        mock_llm = Mock()
+        tool = PatternDetectorTool(mock_llm, "test-model")
+        
+        for log_data in ("", "   \n", "[]", "null"):
+            result = json.loads(tool.execute({"log_data": log_data, "pattern_type": "anomalies"}))
+            assert result["summary"]["total_log_entries"] == 0
+            assert result["summary"]["analysis_type"] == "anomalies"
+            assert result["patterns"] == []
+        mock_llm.chat.assert_not_called()
+    
+    def test_short_logs_not_trimmed(self):
+        """Test that logs within the line budget reach the prompt unchanged."""
+        mock_llm = Mock()
+        mock_llm.chat.return_value = {'message': {'content': '{}'}}
+        tool = PatternDetectorTool(mock_llm, "test-model")
+        
+        tool.execute({"log_data": "DEBUG a\nINFO b"})
+        
+        prompt = mock_llm.chat.call_args.kwargs["messages"][0]["content"]
+        assert "DEBUG a\nINFO b" in prompt
+        assert "omitted" not in prompt
+
+
+class TestLogAnalyzerTool:
+    """Tests for combined log analyzer tool."""
+    
+    def test_sends_compact_logs_to_llm(self):
+        """Test that JSON logs reach the detector prompt without indentation."""
+        mock_llm = Mock()
+        mock_llm.chat.return_value = {'message': {'content': '{"patterns": []}'}}
+        tool = LogAnalyzerTool(mock_llm, "test-model")
+        
+        result = tool.execute({"log_data": '{\n    "level": "ERROR",\n    "message": "boom"\n}'})
+        
+        prompt = mock_llm.chat.call_args.kwargs["messages"][0]["content"]
+        assert '{"level":"ERROR","message":"boom"}' in prompt
+        assert result.startswith("Log Analysis Results:")
+    
+    def test_json_logs_trimmed_per_entry(self):
+        """Test that the line budget applies to NDJSON entries, keeping errors first."""
+        import json
+        mock_llm = Mock()
+        mock_llm.chat.return_value = {'message': {'content': '{"patterns": []}'}}
+        tool = LogAnalyzerTool(mock_llm, "test-model")
+        entries = [
+            {"level": "ERROR" if i % 500 == 0 else "INFO", "message": f"event {i}"}
+            for i in range(2000)
+        ]
+        
+        tool.execute({"log_data": "\n".join(json.dumps(e) for e in entries), "max_log_lines": 10})
+        
+        prompt = mock_llm.chat.call_args.kwargs["messages"][0]["content"]
+        assert "[1990 of 2000 log lines omitted" in prompt
+        assert prompt.count('"message":') == 10
+        assert '{"level":"ERROR","message":"event 1500"}' in prompt
+        assert "event 1999" not in prompt
+    
+    def test_text_logs_pass_through(self):
+        """Test that non-JSON formats are sent to the detector unchanged."""
+        mock_llm = Mock()
+        mock_llm.chat.return_value = {'message': {'content': '{}'}}
+        tool = LogAnalyzerTool(mock_llm, "test-model", log_format="text")
+        
+        tool.execute({"log_data": "ERROR disk full"})
+        
+        assert "ERROR disk full" in mock_llm.chat.call_args.kwargs["messages"][0]["content"]
+
+
 class TestMessageParserTool:
     """Tests for message parser tool."""
     
@@ -167,6 +508,570 @@ class TestFieldAnalyzerTool:
         
         # Should return JSON with statistics
         assert "count" in result or "error" in result
+    
+    def test_field_analyzer_csv_column_stats(self):
+        """Test that CSV input is read by header and only the target column is analyzed."""
+        import json
+        tool = FieldAnalyzerTool()
+        result = json.loads(tool.execute({
+            "field_data": "col1,col2\n1,a\n3,b\n5,c",
+            "field_name": "col1"
+        }))
+        
+        assert result["count"] == 3
+        assert result["min"] == 1.0
+        assert result["max"] == 5.0
+        assert result["mean"] == 3.0
+    
+    def test_field_analyzer_quoted_csv_falls_back(self):
+        """Test that quoted CSV input is still parsed correctly."""
+        import json
+        tool = FieldAnalyzerTool()
+        result = json.loads(tool.execute({
+            "field_data": 'label,amount\n"a, b",10\n"c",30',
+            "field_name": "amount"
+        }))
+        
+        assert result["count"] == 2
+        assert result["mean"] == 20.0
+    
+    def test_field_analyzer_ragged_rows_stay_aligned(self):
+        """Test that rows with extra fields do not shift values into the wrong column."""
+        import json
+        tool = FieldAnalyzerTool()
+        result = json.loads(tool.execute({
+            "field_data": "a,b\n1,2,3\n4,5",
+            "field_name": "a"
+        }))
+        
+        assert result["count"] == 2
+        assert result["min"] == 1.0
+        assert result["max"] == 4.0
+    
+    def test_field_analyzer_streams_file_in_chunks(self, tmp_path):
+        """Test that stats accumulated over file chunks match the whole column."""
+        import json
+        data_file = tmp_path / "field.csv"
+        data_file.write_text("amount,label\n" + "\n".join(f"{i},x{i % 3}" for i in range(1, 11)))
+        tool = FieldAnalyzerTool(chunk_size=3, data_root=str(tmp_path))
+        
+        result = json.loads(tool.execute({
+            "field_data_path": "field.csv",
+            "field_name": "amount"
+        }))
+        
+        assert result["count"] == 10
+        assert result["unique"] == 10
+        assert result["min"] == 1.0
+        assert result["max"] == 10.0
+        assert result["mean"] == 5.5
+    
+    def test_field_analyzer_path_confined_to_data_root(self, tmp_path):
+        """Test that file paths are disabled by default and cannot leave data_root."""
+        import json
+        data_root = tmp_path / "data"
+        data_root.mkdir()
+        (tmp_path / "secret.csv").write_text("amount\n1\n")
+        
+        assert "field_data_path" not in FieldAnalyzerTool().get_parameter_schema()
+        disabled = json.loads(FieldAnalyzerTool().execute({
+            "field_data_path": str(tmp_path / "secret.csv"),
+            "field_name": "amount"
+        }))
+        assert "disabled" in disabled["error"]
+        
+        tool = FieldAnalyzerTool(data_root=str(data_root))
+        for path in ("../secret.csv", str(tmp_path / "secret.csv")):
+            result = json.loads(tool.execute({"field_data_path": path, "field_name": "amount"}))
+            assert "inside the configured data directory" in result["error"]
+    
+    def test_field_analyzer_reads_json_array_file(self, tmp_path):
+        """Test that a .json file holding a JSON array is read as a whole document."""
+        import json
+        (tmp_path / "field.json").write_text('[{"amount": 2}, {"amount": 4}]')
+        tool = FieldAnalyzerTool(data_root=str(tmp_path))
+        
+        result = json.loads(tool.execute({"field_data_path": "field.json", "field_name": "amount"}))
+        
+        assert result["count"] == 2
+        assert result["mean"] == 3.0
+    
+    def test_field_analyzer_missing_field(self):
+        """Test analysis of a field that is not present."""
+        tool = FieldAnalyzerTool()
+        result = tool.execute({
+            "field_data": '[{"a": 1}, {"a": 2}]',
+            "field_name": "b"
+        })
+        
+        assert "not found" in result
+
+
+class TestBucketStrategyGeneratorTool:
+    """Tests for bucket strategy generator tool."""
+    
+    def test_similar_analyses_reuse_cached_strategy(self):
+        """Test that near-identical field statistics hit the strategy cache."""
+        mock_llm = Mock()
+        mock_llm.chat.return_value = {'message': {'content': '{"buckets": []}'}}
+        tool = BucketStrategyGeneratorTool(mock_llm, "test-model")
+        
+        first = tool.execute({
+            "field_analysis": '{"count": 100, "unique": 40, "min": 0.0, "max": 99.0, "mean": 49.5001}',
+            "field_name": "amount"
+        })
+        second = tool.execute({
+            "field_analysis": '{"count": 120, "unique": 45, "min": 0.0, "max": 99.0, "mean": 49.5004}',
+            "field_name": "amount"
+        })
+        
+        assert first == second
+        mock_llm.chat.assert_called_once()
+    
+    def test_requests_schema_constrained_output(self):
+        """Test that the strategy JSON schema is passed as the structured output format."""
+        from tools.bucketing_strategy import BUCKET_STRATEGY_SCHEMA
+        mock_llm = Mock()
+        mock_llm.chat.return_value = {'message': {'content': '{"buckets": []}'}}
+        tool = BucketStrategyGeneratorTool(mock_llm, "test-model")
+        
+        tool.execute({"field_analysis": '{"min": 0, "max": 1}', "field_name": "ratio"})
+        
+        assert mock_llm.chat.call_args.kwargs["format"] is BUCKET_STRATEGY_SCHEMA
+    
+    def test_different_domain_misses_cache(self):
+        """Test that the domain is part of the cache key."""
+        mock_llm = Mock()
+        mock_llm.chat.return_value = {'message': {'content': '{"buckets": []}'}}
+        tool = BucketStrategyGeneratorTool(mock_llm, "test-model")
+        analysis = '{"count": 100, "unique": 40, "min": 0.0, "max": 99.0, "mean": 49.5}'
+        
+        tool.execute({"field_analysis": analysis, "field_name": "amount", "domain": "financial"})
+        tool.execute({"field_analysis": analysis, "field_name": "amount", "domain": "time"})
+        
+        assert mock_llm.chat.call_count == 2
+
+
+class TestBucketValidatorTool:
+    """Tests for bucket validator tool."""
+    
+    def test_bucket_validator_covers_range(self):
+        """Test validation of buckets that span the data range."""
+        tool = BucketValidatorTool()
+        result = tool.execute({
+            "strategy": '{"buckets": [{"name": "low", "min": 0, "max": 50}, {"name": "high", "min": 50, "max": 100}]}',
+            "field_analysis": '{"min": 0.0, "max": 100.0}'
+        })
+        
+        assert '"valid": true' in result
+        assert '"bucket_count": 2' in result
+    
+    def test_bucket_validator_rejects_missing_buckets_first(self):
+        """Test that a strategy without buckets is rejected before the analysis is parsed."""
+        tool = BucketValidatorTool()
+        result = tool.execute({
+            "strategy": '{"strategy_type": "custom"}',
+            "field_analysis": "not json"
+        })
+        
+        assert "Missing 'buckets'" in result
+    
+    def test_bucket_validator_rejects_malformed_buckets(self):
+        """Test that non-object buckets and non-numeric bounds are reported, not raised."""
+        import json
+        tool = BucketValidatorTool()
+        cases = {
+            '{"buckets": ["x"]}': "Bucket 0 must be an object",
+            '{"buckets": [{"min": 0, "max": 5}, {"min": "0", "max": 10}]}': "Bucket 1 has a non-numeric 'min'",
+            '{"buckets": [{"min": 0, "max": true}]}': "Bucket 0 has a non-numeric 'max'",
+        }
+        
+        for strategy, error in cases.items():
+            result = json.loads(tool.execute({"strategy": strategy, "field_analysis": '{"min": 0.0, "max": 10.0}'}))
+            assert result == {"valid": False, "error": error}
+    
+    def test_bucket_validator_rejects_malformed_field_analysis(self):
+        """Test that a non-object analysis or non-numeric range is reported, not raised."""
+        import json
+        tool = BucketValidatorTool()
+        cases = {
+            '[1, 2]': "Field analysis must be an object",
+            '{"min": "low", "max": 10.0}': "Field analysis has a non-numeric 'min'",
+            '{"min": 0.0, "max": [10]}': "Field analysis has a non-numeric 'max'",
+        }
+        
+        for field_analysis, error in cases.items():
+            result = json.loads(tool.execute({"strategy": '{"buckets": [{"min": 0, "max": 10}]}', "field_analysis": field_analysis}))
+            assert result == {"valid": False, "error": error}
+    
+    def test_bucket_validator_minimum_gap(self):
+        """Test validation of buckets that miss the data minimum."""
+        tool = BucketValidatorTool()
+        result = tool.execute({
+            "strategy": '{"buckets": [{"name": "high", "min": 10, "max": 100}]}',
+            "field_analysis": '{"min": 0.0, "max": 100.0}'
+        })
+        
+        assert "minimum" in result
+    
+    def test_bucket_validator_maximum_gap(self):
+        """Test validation of buckets that miss the data maximum."""
+        tool = BucketValidatorTool()
+        result = tool.execute({
+            "strategy": '{"buckets": [{"name": "low", "min": 0, "max": 50}]}',
+            "field_analysis": '{"min": 0.0, "max": 100.0}'
+        })
+        
+        assert "maximum" in result
+
+
+class TestGenericFieldExtractorTool:
+    """Tests for generic field extractor tool."""
+    
+    def test_batch_scales_generation_budget(self):
+        """Test that batched calls get a per-message num_predict budget."""
+        mock_llm = Mock()
+        mock_llm.chat.return_value = {'message': {'content': '{"results": [{"id": 0, "identifiers": []}, {"id": 1, "identifiers": []}]}'}}
+        tool = GenericFieldExtractorTool(mock_llm, "test-model", chat_options={"num_predict": 500})
+        
+        tool.extract_fields_batch(["qty 1", "qty 2"])
+        
+        from tools.field_extractor import BATCH_EXTRACTION_SCHEMA
+        options = mock_llm.chat.call_args.kwargs["options"]
+        assert options["num_predict"] == 1000
+        assert options["temperature"] == 0
+        assert "format" not in options
+        assert mock_llm.chat.call_args.kwargs["format"] is BATCH_EXTRACTION_SCHEMA
+    
+    def test_blank_message_skips_llm(self):
+        """Test that blank messages return an empty extraction without an LLM call."""
+        mock_llm = Mock()
+        tool = GenericFieldExtractorTool(mock_llm, "test-model")
+        
+        result = json.loads(tool.execute({"message": "  "}))
+        
+        assert result["numeric_fields"] == []
+        mock_llm.chat.assert_not_called()
+    
+    def test_instances_use_slots(self):
+        """Test that tool instances have no per-instance __dict__."""
+        tool = GenericFieldExtractorTool(Mock(), "test-model")
+        
+        assert not hasattr(tool, "__dict__")
+        with pytest.raises(AttributeError):
+            tool.unexpected = True
+    
+    def test_prompts_share_static_prefix(self):
+        """Test that only the trailing message differs between single-message prompts."""
+        mock_llm = Mock()
+        mock_llm.chat.return_value = {'message': {'content': '{}'}}
+        tool = GenericFieldExtractorTool(mock_llm, "test-model")
+        
+        tool.execute({"message": "first message", "domain": "financial"})
+        tool.execute({"message": "second", "domain": "financial"})
+        
+        first, second = (c.kwargs["messages"][0]["content"] for c in mock_llm.chat.call_args_list)
+        prefix = first.split("first message")[0]
+        assert second.startswith(prefix)
+        assert prefix.endswith("# Input Message/Log\n\n")
+    
+    def test_instruction_bullets_follow_field_types(self):
+        """Test that the guideline bullets depend only on the set of requested types."""
+        from tools.field_extractor import _build_instructions
+        
+        assert _build_instructions(frozenset(["identifiers", "numeric"])) == (
+            "- Numeric values (integers, floats, percentages, ratios)\n"
+            "- IDs (account numbers, transaction IDs, user IDs)\n"
+            "- Reference numbers"
+        )
+        assert _build_instructions(frozenset(["all"])).count("\n") == 8
+    
+    def test_batch_extracts_several_messages_per_call(self):
+        """Test that a message batch is answered by a single LLM call."""
+        mock_llm = Mock()
+        mock_llm.chat.return_value = {'message': {'content': '{"results": [{"id": 0, "numeric_fields": [{"value": 1}]}, {"id": 1, "numeric_fields": [{"value": 2}]}]}'}}
+        tool = GenericFieldExtractorTool(mock_llm, "test-model")
+        
+        results = tool.extract_fields_batch(["value 1", "value 2"])
+        
+        mock_llm.chat.assert_called_once()
+        prompt = mock_llm.chat.call_args.kwargs["messages"][0]["content"]
+        assert "<msg id=0>" in prompt and "<msg id=1>" in prompt
+        assert results == ['{"numeric_fields": [{"value": 1}]}', '{"numeric_fields": [{"value": 2}]}']
+    
+    def test_batch_falls_back_for_missing_ids(self):
+        """Test that messages omitted from a batched response are extracted individually."""
+        mock_llm = Mock()
+        mock_llm.chat.side_effect = [
+            {'message': {'content': '{"results": [{"id": 0, "identifiers": []}]}'}},
+            {'message': {'content': '{"identifiers": [{"value": "ID2"}]}'}}
+        ]
+        tool = GenericFieldExtractorTool(mock_llm, "test-model")
+        
+        results = tool.extract_fields_batch(["first", "second"])
+        
+        assert mock_llm.chat.call_count == 2
+        assert "<msg id=" not in mock_llm.chat.call_args.kwargs["messages"][0]["content"]
+        assert results[1] == '{"identifiers": [{"value": "ID2"}]}'
+    
+    def test_batch_rejects_id_only_entries(self):
+        """Test that entries carrying only an id are re-extracted and never cached."""
+        mock_llm = Mock()
+        mock_llm.chat.side_effect = [
+            {'message': {'content': '{"results": [{"id": 0}, {"id": 1, "identifiers": []}]}'}},
+            {'message': {'content': '{"numeric_fields": [{"value": 1}]}'}}
+        ]
+        tool = GenericFieldExtractorTool(mock_llm, "test-model", cache=ExtractionCache())
+        
+        results = tool.extract_fields_batch(["first", "second"])
+        
+        assert mock_llm.chat.call_count == 2
+        assert results == ['{"numeric_fields": [{"value": 1}]}', '{"identifiers": []}']
+    
+    def test_batch_keeps_results_when_a_fallback_fails(self):
+        """Test that one failing per-message fallback does not discard the batch."""
+        mock_llm = Mock()
+        mock_llm.chat.side_effect = [
+            {'message': {'content': '{"results": [{"id": 1, "identifiers": []}]}'}},
+            ConnectionError("model unavailable")
+        ]
+        tool = GenericFieldExtractorTool(mock_llm, "test-model")
+        
+        results = tool.extract_fields_batch(["first", "second"])
+        
+        assert json.loads(results[0]) == {"error": "Field extraction failed: model unavailable"}
+        assert results[1] == '{"identifiers": []}'
+    
+    def test_batch_budget_fits_context_window(self):
+        """Test that a full batch's num_predict leaves room for the prompt in num_ctx."""
+        mock_llm = Mock()
+        mock_llm.chat.return_value = {'message': {'content': '{"results": []}'}}
+        tool = GenericFieldExtractorTool(mock_llm, "test-model", max_format_retries=0)
+        
+        tool.extract_fields_batch(["message %d" % i for i in range(8)])
+        
+        batch_call = mock_llm.chat.call_args_list[0].kwargs
+        prompt_tokens = len(batch_call["messages"][0]["content"]) // 3
+        assert batch_call["options"]["num_predict"] + prompt_tokens <= batch_call["options"]["num_ctx"]
+    
+    def test_batch_respects_batch_size(self):
+        """Test that messages are split into batches of at most batch_size."""
+        mock_llm = Mock()
+        mock_llm.chat.return_value = {'message': {'content': '{"results": [{"id": 0, "identifiers": []}, {"id": 1, "identifiers": []}]}'}}
+        tool = GenericFieldExtractorTool(mock_llm, "test-model", batch_size=2)
+        
+        tool.extract_fields_batch(["a", "b", "c", "d"])
+        
+        assert mock_llm.chat.call_count == 2
+    
+    def test_batch_only_sends_uncached_messages(self):
+        """Test that cached messages are served from the extraction cache."""
+        mock_llm = Mock()
+        mock_llm.chat.return_value = {'message': {'content': '{"identifiers": []}'}}
+        tool = GenericFieldExtractorTool(mock_llm, "test-model", cache=ExtractionCache())
+        tool.execute({"message": "seen before"})
+        
+        results = tool.extract_fields_batch(["seen before", "new"])
+        
+        assert mock_llm.chat.call_count == 2
+        assert "seen before" not in mock_llm.chat.call_args.kwargs["messages"][0]["content"]
+        assert results == ['{"identifiers": []}', '{"identifiers": []}']
+    
+    def test_execute_message_batch(self):
+        """Test that execute returns per-message results for message_batch."""
+        mock_llm = Mock()
+        mock_llm.chat.return_value = {'message': {'content': '{"results": [{"id": 0, "other_fields": []}, {"id": 1, "other_fields": []}]}'}}
+        tool = GenericFieldExtractorTool(mock_llm, "test-model")
+        
+        result = tool.execute({"message_batch": ["a", "b"]})
+        
+        assert '"index": 1' in result
+        assert '"other_fields": []' in result
+
+
+class TestFinancialExtractorTool:
+    """Tests for financial extractor tool."""
+    
+    def test_cache_hit_skips_llm(self):
+        """Test that repeated messages are answered from the extraction cache."""
+        mock_llm = Mock()
+        mock_llm.chat.return_value = {'message': {'content': '{"amounts": []}'}}
+        tool = FinancialExtractorTool(mock_llm, "test-model", cache=ExtractionCache())
+        
+        first = tool.execute({"message": "Paid ten dollars"})
+        second = tool.execute({"message": "Paid ten dollars"})
+        
+        assert first == second
+        mock_llm.chat.assert_called_once()
+    
+    def test_regex_fast_path_skips_llm(self):
+        """Test that fully pattern-matchable messages are answered without the LLM."""
+        mock_llm = Mock()
+        tool = FinancialExtractorTool(mock_llm, "test-model")
+        
+        result = tool.execute({"message": "Paid $1,234.56 on 2024-01-15"})
+        
+        mock_llm.chat.assert_not_called()
+        assert '"value": 1234.56' in result
+        assert '"currency": "USD"' in result
+        assert '"2024-01-15"' in result
+    
+    def test_blank_message_skips_llm(self):
+        """Test that blank messages return an empty extraction without an LLM call."""
+        mock_llm = Mock()
+        tool = FinancialExtractorTool(mock_llm, "test-model", regex_fast_path=False)
+        
+        result = json.loads(tool.execute({"message": ""}))
+        
+        assert result["amounts"] == []
+        mock_llm.chat.assert_not_called()
+    
+    def test_bulk_extraction_returns_columns(self):
+        """Test that bulk extraction matches amounts in one pass and only sends unmatched messages to the LLM."""
+        mock_llm = Mock()
+        mock_llm.chat.return_value = {'message': {'content': '{"amounts": [{"value": 10, "currency": "USD"}]}'}}
+        tool = FinancialExtractorTool(mock_llm, "test-model")
+        
+        frame = tool.extract_financial_fields_bulk([
+            "Paid $1,200.50 and 30 EUR",
+            "Paid ten dollars",
+            "Refund GBP 5"
+        ])
+        
+        assert list(frame.columns) == ["msg_idx", "amount", "currency"]
+        assert frame["msg_idx"].tolist() == [0, 0, 1, 2]
+        assert frame["amount"].tolist() == [1200.5, 30.0, 10.0, 5.0]
+        assert frame["currency"].tolist() == ["USD", "EUR", "USD", "GBP"]
+        mock_llm.chat.assert_called_once()
+        assert "Paid ten dollars" in mock_llm.chat.call_args.kwargs["messages"][0]["content"]
+    
+    def test_bulk_extraction_empty_input(self):
+        """Test that bulk extraction of no messages returns an empty frame."""
+        mock_llm = Mock()
+        tool = FinancialExtractorTool(mock_llm, "test-model")
+        
+        frame = tool.extract_financial_fields_bulk([])
+        
+        assert list(frame.columns) == ["msg_idx", "amount", "currency"]
+        assert frame.empty
+        mock_llm.chat.assert_not_called()
+    
+    def test_bulk_extraction_continues_after_llm_failure(self):
+        """Test that one failing LLM fallback does not abort the bulk result."""
+        mock_llm = Mock()
+        mock_llm.chat.side_effect = [
+            Exception("model unavailable"),
+            {'message': {'content': '{"amounts": [{"value": 7, "currency": "USD"}]}'}}
+        ]
+        tool = FinancialExtractorTool(mock_llm, "test-model", retry_backoff=0)
+        
+        frame = tool.extract_financial_fields_bulk(["Paid ten dollars", "Refund GBP 5", "Paid seven dollars"])
+        
+        assert frame["msg_idx"].tolist() == [1, 2]
+        assert frame["amount"].tolist() == [5.0, 7.0]
+    
+    def test_regex_hints_are_passed_to_llm(self):
+        """Test that partial matches are injected into the prompt as hints."""
+        mock_llm = Mock()
+        mock_llm.chat.return_value = {'message': {'content': '{"amounts": []}'}}
+        tool = FinancialExtractorTool(mock_llm, "test-model")
+        
+        tool.execute({"message": "Order 42 cost $5"})
+        
+        prompt = mock_llm.chat.call_args.kwargs["messages"][0]["content"]
+        assert "# Hints Already Detected" in prompt
+        assert '"value": 5.0' in prompt
+        assert mock_llm.chat.call_args.kwargs["format"] is FINANCIAL_EXTRACTION_SCHEMA
+    
+    def test_malformed_json_is_corrected(self):
+        """Test that schema violations are fed back to the model for correction."""
+        mock_llm = Mock()
+        mock_llm.chat.side_effect = [
+            {'message': {'content': '{"amounts": [{"value": "$10"}]}'}},
+            {'message': {'content': '{"amounts": [{"value": 10}]}'}}
+        ]
+        tool = FinancialExtractorTool(mock_llm, "test-model", retry_backoff=0)
+        
+        result = tool.execute({"message": "Paid ten dollars"})
+        
+        assert result == '{"amounts": [{"value": 10}]}'
+        assert len(mock_llm.chat.call_args.kwargs["messages"]) == 3
+
+
+class TestAsyncToolExecution:
+    """Tests for async tool execution and fan-out."""
+    
+    def test_aexecute_uses_async_client(self):
+        """Test that aexecute awaits the async client instead of the sync one."""
+        mock_llm = Mock()
+        async_llm = AsyncMock()
+        async_llm.chat.return_value = {'message': {'content': '{"amounts": []}'}}
+        tool = FinancialExtractorTool(mock_llm, "test-model", async_llm=async_llm)
+        
+        result = asyncio.run(tool.aexecute({"message": "Paid ten dollars"}))
+        
+        assert result == '{"amounts": []}'
+        async_llm.chat.assert_awaited_once()
+        mock_llm.chat.assert_not_called()
+    
+    def test_aexecute_without_async_client_runs_sync_impl(self):
+        """Test that tools without an async client fall back to the sync implementation."""
+        mock_llm = Mock()
+        mock_llm.chat.return_value = {'message': {'content': '{"patterns": []}'}}
+        tool = PatternDetectorTool(mock_llm, "test-model")
+        
+        result = asyncio.run(tool.aexecute({"log_data": "ERROR boom"}))
+        
+        assert result == '{"patterns": []}'
+        mock_llm.chat.assert_called_once()
+    
+    def test_aexecute_validates_arguments(self):
+        """Test that aexecute applies the same argument validation as execute."""
+        tool = PatternDetectorTool(Mock(), "test-model", async_llm=AsyncMock())
+        
+        result = asyncio.run(tool.aexecute({}))
+        
+        assert "Required parameter 'log_data' is missing" in result
+    
+    def test_run_many_bounds_concurrency_and_preserves_order(self):
+        """Test that run_many keeps result order and never exceeds the concurrency limit."""
+        in_flight = 0
+        peak = 0
+        
+        async def chat(model, messages, **kwargs):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return {'message': {'content': messages[0]['content'].rsplit("# Log Data", 1)[1].split()[0]}}
+        
+        async_llm = AsyncMock()
+        async_llm.chat.side_effect = chat
+        tool = PatternDetectorTool(Mock(), "test-model", async_llm=async_llm)
+        args_list = [{"log_data": f"log{i}"} for i in range(6)]
+        
+        results = asyncio.run(run_many(tool, args_list, concurrency=2))
+        
+        assert results == [f"log{i}" for i in range(6)]
+        assert peak == 2
+    
+    def test_trace_id_is_scoped_to_the_call(self):
+        """Test that trace_id is bound in context for the tool body and unbound afterwards."""
+        seen = {}
+        
+        def chat(**kwargs):
+            seen.update(structlog.contextvars.get_contextvars())
+            return {'message': {'content': '{"patterns": []}'}}
+        
+        mock_llm = Mock()
+        mock_llm.chat.side_effect = chat
+        tool = PatternDetectorTool(mock_llm, "test-model")
+        
+        tool.execute({"log_data": "ERROR boom"}, trace_id="trace-1")
+        
+        assert seen == {"trace_id": "trace-1", "tool_name": "detect_patterns"}
+        assert "trace_id" not in structlog.contextvars.get_contextvars()
 
 
 class TestFieldValidatorTool:
@@ -180,6 +1085,76 @@ class TestFieldValidatorTool:
         })
         
         assert "valid" in result.lower()
+    
+    def test_financial_validator_factory(self):
+        """Test that the factory builds the financial validator."""
+        tool = create_financial_field_validator({}, {})
+        result = tool.execute({
+            "extracted_fields": '{"amounts": [{"value": 100, "currency": "USD"}]}'
+        })
+        
+        assert tool.get_name() == "validate_financial_fields"
+        assert '"valid": true' in result
+    
+    def test_field_validator_rejects_non_finite_amounts(self):
+        """Test that NaN and non-numeric amounts are reported invalid."""
+        tool = create_financial_field_validator({}, {})
+        result = tool.execute({
+            "extracted_fields": '{"amounts": [{"value": 100}, {"value": NaN}, {"value": "12"}, {"value": 2.5}]}'
+        })
+        
+        assert result.count("Valid amount") == 2
+        assert result.count("Invalid amount") == 2
+
+
+class TestGenericFieldValidatorTool:
+    """Tests for generic extracted-field validator tool."""
+    
+    def test_validates_all_categories(self):
+        """Test that every field in every category is checked once."""
+        tool = create_field_validator({}, {})
+        result = tool.execute({
+            "extracted_fields": '{"numeric_fields": [{"name": "qty", "value": 3}, {"value": 4}], '
+                                '"identifiers": [{"name": "id", "value": "A1"}], "other_fields": "bad"}'
+        })
+        
+        assert '"field_count": 3' in result
+        assert "Valid numeric_field: qty = 3" in result
+        assert "Invalid numeric_field: missing name or value" in result
+        assert "Valid identifier: id = A1" in result
+    
+    def test_invalid_json(self):
+        """Test that malformed input is reported as invalid."""
+        tool = create_field_validator({}, {})
+        result = tool.execute({"extracted_fields": "{nope"})
+        
+        assert '"valid": false' in result
+        assert "Invalid JSON in extracted fields" in result
+    
+    def test_compiled_traversal_matches_python(self):
+        """Test that the Cython traversal, when built, agrees with the pure-Python one."""
+        compiled = pytest.importorskip("tools._field_validator")
+        from tools._validator_core import validate_categories_py
+        categories = ("numeric_fields", "identifiers", "other_fields")
+        cases = [
+            [],
+            {"numeric_fields": "bad"},
+            {"numeric_fields": [{"name": "qty", "value": 3}, {"value": 4}, "x", None]},
+            {"identifiers": [{"name": "id", "value": None}], "other_fields": [{"name": "n"}]},
+        ]
+        
+        for fields in cases:
+            assert compiled.validate(fields, categories) == validate_categories_py(fields, categories)
+    
+    def test_no_argument_constructors(self):
+        """Test that the exported FieldValidatorTool classes still construct without arguments."""
+        import tools
+        from tools import financial_extractor
+        
+        assert tools.FieldValidatorTool().get_name() == "validate_fields"
+        financial = financial_extractor.FieldValidatorTool()
+        assert financial.get_name() == "validate_financial_fields"
+        assert isinstance(financial, tools.ExtractedFieldValidatorTool)
 
 
 class TestToolValidation:
@@ -210,3 +1185,50 @@ class TestToolValidation:
         # Should handle gracefully or return error
         assert isinstance(result, str)
 
+
+
+class TestToolFactory:
+    """Tests for the tool factory."""
+    
+    def test_default_creators_resolve_on_first_use(self):
+        """Test that default creators are imported lazily and cached."""
+        factory = ToolFactory()
+        assert isinstance(factory._creators["bucket_validator"], tuple)
+        
+        tool = factory.create("bucket_validator", {}, {})
+        
+        assert tool.get_name() == "validate_bucketing_strategy"
+        assert callable(factory._creators["bucket_validator"])
+    
+    def test_create_with_llm_context(self):
+        """Test creating an LLM-backed tool from the shared context."""
+        factory = ToolFactory()
+        llm_client = Mock()
+        
+        tool = factory.create("log_analyzer", {"model": "test-model"}, {"llm_client": llm_client})
+        
+        assert tool.get_name() == "analyze_logs"
+        assert tool.llm is llm_client._client
+    
+    def test_sql_generator_host_uses_shared_client(self):
+        """Test that a per-tool host resolves to that host's shared pooled client."""
+        factory = ToolFactory()
+        shared = Mock()
+        
+        with patch("tools.sql_generator.get_shared_client", return_value=shared) as get_shared_client:
+            tool = factory.create("sql_generator", {"host": "http://sql-llm:11434"}, {"llm_client": Mock()})
+        
+        get_shared_client.assert_called_once_with("http://sql-llm:11434")
+        assert tool.sql_llm is shared._client
+    
+    def test_missing_context_raises_configuration_error(self):
+        """Test that a creator's missing dependency surfaces as ConfigurationError."""
+        factory = ToolFactory()
+        with pytest.raises(ConfigurationError):
+            factory.create("sql_validator", {}, {})
+    
+    def test_unknown_tool_type(self):
+        """Test that unknown tool types are rejected."""
+        factory = ToolFactory()
+        with pytest.raises(ConfigurationError):
+            factory.create("does_not_exist", {}, {})
@@ -3,7 +3,7 @@ Tests for utility functions.
 """
 import pytest
 import time
-from unittest.mock import Mock, patch
+from unittest.mock import Mock, patch, AsyncMock
 from utils.exceptions import (
     AgentFrameworkError,
     AgentError,
@@ -11,10 +11,17 @@ from utils.exceptions import (
     DatabaseError,
     LLMError,
     ConfigurationError,
-    ValidationError
+    ValidationError,
+    CircuitOpenError
 )
-from utils.retry import retry_with_backoff, RetryHandler
+from utils.retry import retry_with_backoff, RetryHandler, CircuitBreaker, RetryBudget, chat_with_json_feedback
+from utils.json_parser import validate_json_response, iter_json_array_items, extract_json_from_text
 from utils.cache import SimpleCache, cached
+from utils import json_codec
+from utils.extraction_cache import ExtractionCache
+from utils import validate_numeric
+from utils import validation
+from utils.validation import validate_dict_structure, validate_required_fields, make_string_validator, validate_string_field, sanitize_string
 
 
 class TestExceptions:
@@ -54,6 +61,16 @@ class TestExceptions:
         """Test validation error."""
         error = ValidationError("test error", field="test_field")
         assert error.field == "test_field"
+    
+    def test_exceptions_use_slots_and_pickle(self):
+        """Test that context attributes live in slots and survive pickling."""
+        import pickle
+        error = ToolExecutionError("test error", tool_name="test_tool")
+        
+        assert not error.__dict__
+        restored = pickle.loads(pickle.dumps(error))
+        assert str(restored) == "test error"
+        assert restored.tool_name == "test_tool"
 
 
 class TestRetryHandler:
@@ -97,7 +114,7 @@ class TestRetryHandler:
     @patch('utils.retry.time.sleep')
     def test_retry_handler_exponential_backoff(self, mock_sleep):
         """Test exponential backoff."""
-        handler = RetryHandler(max_retries=3, initial_delay=1.0, exponential_base=2.0)
+        handler = RetryHandler(max_retries=3, initial_delay=1.0, exponential_base=2.0, jitter="none")
         call_count = [0]
         
         def failing_func():
@@ -112,6 +129,270 @@ class TestRetryHandler:
         assert mock_sleep.call_count == 2
         assert mock_sleep.call_args_list[0][0][0] == 1.0  # First delay
         assert mock_sleep.call_args_list[1][0][0] == 2.0  # Second delay (exponential)
+    
+    @patch('utils.retry.time.sleep')
+    def test_retry_handler_jitter(self, mock_sleep):
+        """Test that full and equal jitter stay within their ranges of the capped delay."""
+        def always_failing_func():
+            raise ValueError("test error")
+        
+        for jitter, low in (("full", 0.0), ("equal", 0.5)):
+            mock_sleep.reset_mock()
+            handler = RetryHandler(max_retries=4, initial_delay=1.0, max_delay=3.0, jitter=jitter)
+            with pytest.raises(ValueError):
+                handler.execute(always_failing_func, exceptions=(ValueError,))
+            
+            delays = [c[0][0] for c in mock_sleep.call_args_list]
+            assert len(delays) == 3
+            for delay, capped in zip(delays, (1.0, 2.0, 3.0)):
+                assert low * capped <= delay <= capped
+    
+    def test_execute_async_backs_off_without_blocking(self):
+        """Test that the async path awaits asyncio.sleep and retries the coroutine."""
+        import asyncio
+        handler = RetryHandler(max_retries=3, initial_delay=1.0, jitter="none")
+        call_count = [0]
+        
+        async def flaky():
+            call_count[0] += 1
+            if call_count[0] < 3:
+                raise ValueError("test error")
+            return "success"
+        
+        with patch('utils.retry.asyncio.sleep', new_callable=AsyncMock) as mock_sleep, \
+                patch('utils.retry.time.sleep') as blocking_sleep:
+            result = asyncio.run(handler.execute_async(flaky, exceptions=(ValueError,)))
+        
+        assert result == "success"
+        assert [c[0][0] for c in mock_sleep.call_args_list] == [1.0, 2.0]
+        blocking_sleep.assert_not_called()
+    
+    def test_decorator_wraps_coroutine_functions(self):
+        """Test that retry_with_backoff returns an awaitable wrapper for coroutine functions."""
+        import asyncio
+        import inspect
+        call_count = [0]
+        
+        @retry_with_backoff(max_retries=2, initial_delay=0, exceptions=(ValueError,))
+        async def flaky():
+            call_count[0] += 1
+            if call_count[0] < 2:
+                raise ValueError("test error")
+            return "success"
+        
+        assert inspect.iscoroutinefunction(flaky)
+        assert asyncio.run(flaky()) == "success"
+        assert call_count[0] == 2
+    
+    @patch('utils.retry.time.sleep')
+    def test_circuit_opens_after_threshold(self, mock_sleep):
+        """Test that an open circuit refuses calls without invoking the target or sleeping."""
+        handler = RetryHandler(max_retries=2, failure_threshold=3, recovery_timeout=60.0, jitter="none")
+        target = Mock(side_effect=ValueError("down"), __name__="target", __qualname__="target")
+        
+        for _ in range(2):
+            with pytest.raises(ValueError):
+                handler.execute(target, exceptions=(ValueError,))
+        mock_sleep.reset_mock()
+        target.reset_mock()
+        
+        with pytest.raises(CircuitOpenError):
+            handler.execute(target, exceptions=(ValueError,))
+        target.assert_not_called()
+        mock_sleep.assert_not_called()
+    
+    @patch('utils.retry.time.sleep')
+    def test_circuit_is_per_instance_for_bound_methods(self, mock_sleep):
+        """Test that one failing client instance does not open the circuit for another."""
+        class Client:
+            def __init__(self, healthy):
+                self.healthy = healthy
+            
+            def call(self):
+                if not self.healthy:
+                    raise ValueError("down")
+                return "ok"
+        
+        handler = RetryHandler(max_retries=1, failure_threshold=1, recovery_timeout=60.0)
+        broken, healthy = Client(False), Client(True)
+        
+        with pytest.raises(ValueError):
+            handler.execute(broken.call, exceptions=(ValueError,))
+        with pytest.raises(CircuitOpenError):
+            handler.execute(broken.call, exceptions=(ValueError,))
+        assert handler.execute(healthy.call) == "ok"
+        
+        with pytest.raises(ValueError):
+            handler.execute(broken.call, exceptions=(ValueError,), breaker_key="host-a")
+        with pytest.raises(CircuitOpenError, match="host-a"):
+            handler.execute(healthy.call, breaker_key="host-a")
+    
+    def test_circuit_half_open_probe_closes_on_success(self):
+        """Test that after the recovery timeout one probe is allowed and success closes the circuit."""
+        breaker = CircuitBreaker("target", failure_threshold=1, recovery_timeout=0.05)
+        breaker.record_failure()
+        
+        assert breaker.allow() is False
+        time.sleep(0.1)
+        assert breaker.allow() is True
+        assert breaker.allow() is False  # Only one probe at a time
+        breaker.record_success()
+        assert breaker.state == CircuitBreaker.CLOSED
+        assert breaker.allow() is True
+    
+    @patch('utils.retry.time.sleep')
+    def test_retry_budget_limits_retries(self, mock_sleep):
+        """Test that an exhausted retry budget stops retrying early."""
+        handler = RetryHandler(max_retries=5, retry_budget=RetryBudget(rate=0.0, burst=1))
+        target = Mock(side_effect=ValueError("down"), __name__="target")
+        
+        with pytest.raises(ValueError):
+            handler.execute(target, exceptions=(ValueError,))
+        
+        assert target.call_count == 2
+        assert mock_sleep.call_count == 1
+    
+    @patch('utils.retry.time.sleep')
+    def test_non_retryable_raised_immediately(self, mock_sleep):
+        """Test that configuration and validation errors are not retried."""
+        handler = RetryHandler(max_retries=3)
+        target = Mock(side_effect=ValidationError("bad input"), __name__="target")
+        
+        with pytest.raises(ValidationError):
+            handler.execute(target)
+        
+        assert target.call_count == 1
+        mock_sleep.assert_not_called()
+    
+    def test_unknown_jitter_rejected(self):
+        """Test that an unknown jitter strategy is rejected at construction."""
+        with pytest.raises(ValueError):
+            RetryHandler(jitter="random")
+        with pytest.raises(ValueError):
+            retry_with_backoff(jitter="random")
+    
+    @patch('utils.retry.time.sleep')
+    @patch('utils.retry.logger')
+    def test_attempt_logs_error_type_only(self, mock_logger, mock_sleep):
+        """Test that intermediate attempts log the error type and the final one the message."""
+        mock_logger.isEnabledFor.return_value = True
+        handler = RetryHandler(max_retries=2, jitter="none")
+        target = Mock(side_effect=ValueError("long message"), __name__="target", __qualname__="target")
+        
+        with pytest.raises(ValueError):
+            handler.execute(target)
+        
+        assert mock_logger.warning.call_args.kwargs["error_type"] == "ValueError"
+        assert mock_logger.error.call_args.kwargs["error"] == "long message"
+        
+        mock_logger.reset_mock()
+        mock_logger.isEnabledFor.return_value = False
+        with pytest.raises(ValueError):
+            handler.execute(target)
+        mock_logger.warning.assert_not_called()
+
+
+class TestJsonFeedbackRetry:
+    """Tests for retry-with-feedback on malformed LLM JSON."""
+    
+    def test_validate_json_response(self):
+        """Test JSON and schema validation error reporting."""
+        schema = {"type": "object", "properties": {"amounts": {"type": "array"}}}
+        assert validate_json_response('{"amounts": []}', schema) is None
+        assert "invalid JSON" in validate_json_response("{oops", schema)
+        assert "amounts" in validate_json_response('{"amounts": "x"}', schema)
+        assert "object" in validate_json_response("[1]")
+    
+    @patch('utils.retry.time.sleep')
+    def test_feeds_error_back_until_valid(self, mock_sleep):
+        """Test that the bad answer and the error are appended to the conversation."""
+        chat = Mock(side_effect=["not json", '{"ok": true}'])
+        
+        result = chat_with_json_feedback(chat, [{"role": "user", "content": "go"}])
+        
+        assert result == '{"ok": true}'
+        retry_messages = chat.call_args_list[1][0][0]
+        assert retry_messages[1] == {"role": "assistant", "content": "not json"}
+        assert "Fix and retry, JSON only" in retry_messages[2]["content"]
+        mock_sleep.assert_called_once_with(1.0)
+    
+    @patch('utils.retry.time.sleep')
+    def test_returns_last_response_when_exhausted(self, mock_sleep):
+        """Test that retries are capped and the last response is returned."""
+        chat = Mock(return_value="still not json")
+        
+        result = chat_with_json_feedback(chat, [{"role": "user", "content": "go"}], max_retries=2)
+        
+        assert result == "still not json"
+        assert chat.call_count == 3
+        assert [c[0][0] for c in mock_sleep.call_args_list] == [1.0, 2.0]
+
+
+class TestExtractJsonFromText:
+    """Tests for extracting a JSON object from surrounding text."""
+    
+    def test_object_after_prose(self):
+        """Test that an object embedded in prose is extracted exactly."""
+        text = 'Here you go: {"thought": "use }{ braces", "final_answer": "ok"} Hope that helps {'
+        
+        extracted, success = extract_json_from_text(text)
+        
+        assert success is True
+        assert extracted == '{"thought": "use }{ braces", "final_answer": "ok"}'
+    
+    def test_skips_unparsable_brace(self):
+        """Test that scanning continues past a "{" that does not start valid JSON."""
+        extracted, success = extract_json_from_text('set {x} then {"a": 1}')
+        
+        assert success is True
+        assert extracted == '{"a": 1}'
+    
+    def test_thought_and_tool_call_lines(self):
+        """Test that a mid-text "Thought: ... Tool call: {...}" pair is combined into one object."""
+        extracted, success = extract_json_from_text('Plan. Thought: look it up. Tool call: {"name": "t", "args": {}}')
+        
+        assert success is True
+        assert json_codec.loads(extracted) == {"thought": "look it up.", "tool_call": {"name": "t", "args": {}}}
+    
+    def test_adversarial_input_is_linear(self):
+        """Test that repeated markers and deep nesting neither hang nor raise."""
+        start = time.monotonic()
+        
+        assert extract_json_from_text("x Thought: Tool call: " * 3000) == (None, False)
+        assert extract_json_from_text('{"a":' * 5000) == (None, False)
+        assert time.monotonic() - start < 2.0
+    
+    def test_no_object(self):
+        """Test that text without a JSON object fails."""
+        assert extract_json_from_text("no json here") == (None, False)
+
+
+class TestIterJsonArrayItems:
+    """Tests for incremental JSON array parsing."""
+    
+    def test_yields_items_across_chunk_boundaries(self):
+        """Test that items split across chunks are yielded once complete."""
+        text = '{"summary": {"n": 2}, "patterns": [{"name": "a"}, {"name": "b, ]"}], "anomalies": []}'
+        chunks = [text[i:i + 7] for i in range(0, len(text), 7)]
+        
+        assert list(iter_json_array_items(chunks, "patterns")) == [{"name": "a"}, {"name": "b, ]"}]
+    
+    def test_items_arrive_before_stream_ends(self):
+        """Test that the first item is available before the document is complete."""
+        seen = []
+        
+        def chunks():
+            yield '{"patterns": [{"name": "a"},'
+            seen.append("second chunk requested")
+            yield ' {"name": "b"}]}'
+        
+        items = iter_json_array_items(chunks(), "patterns")
+        assert next(items) == {"name": "a"}
+        assert seen == []
+    
+    def test_missing_key_yields_nothing(self):
+        """Test that a document without the key produces no items."""
+        assert list(iter_json_array_items(['{"other": [1, 2]}'], "patterns")) == []
 
 
 class TestSimpleCache:
@@ -161,6 +442,43 @@ class TestSimpleCache:
         # Wait for expiry
         time.sleep(0.2)
         assert cache.get("key1") is None
+    
+    def test_cache_evicts_least_recently_used(self):
+        """Test that the cache stays within maxsize and keeps recently read keys."""
+        cache = SimpleCache(maxsize=2)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)
+        
+        assert cache.get("b") is None
+        assert cache.get("a") == 1
+        assert cache.get("c") == 3
+    
+    def test_expired_entries_purged_on_set(self):
+        """Test that expired entries are dropped periodically without being read."""
+        cache = SimpleCache(purge_interval=2)
+        cache.set("old", 1, ttl=0.05)
+        time.sleep(0.1)
+        cache.set("new", 2)
+        
+        assert "old" not in cache._cache
+        assert cache.get("new") == 2
+    
+    def test_concurrent_access_keeps_bound(self):
+        """Test that get and set from many threads never raise and respect maxsize."""
+        from concurrent.futures import ThreadPoolExecutor
+        cache = SimpleCache(maxsize=8, purge_interval=4)
+        
+        def churn(worker):
+            for i in range(2000):
+                cache.set((worker, i % 16), i)
+                cache.get((worker, (i + 1) % 16))
+        
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            list(pool.map(churn, range(8)))
+        
+        assert len(cache._cache) <= 8
 
 
 class TestCachedDecorator:
@@ -189,4 +507,301 @@ class TestCachedDecorator:
         result3 = test_func(10)
         assert result3 == 20
         assert call_count[0] == 2
+    
+    def test_cached_decorator_unhashable_args(self):
+        """Test that unhashable arguments are keyed by digest."""
+        call_count = [0]
+        
+        @cached(ttl=3600)
+        def total(values, scale=1):
+            call_count[0] += 1
+            return sum(values) * scale
+        
+        assert total([1, 2], scale=2) == 6
+        assert total([1, 2], scale=2) == 6
+        assert total([1, 3], scale=2) == 8
+        assert call_count[0] == 2
+    
+    def test_cached_decorator_keys_by_type(self):
+        """Test that equal values of different types get separate entries."""
+        @cached(ttl=3600)
+        def describe(x):
+            return type(x).__name__
+        
+        assert [describe(1), describe(1.0), describe(True)] == ["int", "float", "bool"]
+    
+    def test_cached_decorator_bypasses_unkeyable_args(self):
+        """Test that arguments without a faithful key are never served from cache."""
+        import numpy as np
+        call_count = [0]
+        
+        @cached(ttl=3600)
+        def total(values):
+            call_count[0] += 1
+            return float(values.sum())
+        
+        first = np.zeros(2000)
+        second = first.copy()
+        second[1000] = 1.0
+        
+        assert repr(first) == repr(second)
+        assert total(first) == 0.0
+        assert total(second) == 1.0
+        assert call_count[0] == 2
+
+
+
+class TestJsonCodec:
+    """Tests for the JSON codec helpers."""
+    
+    def test_round_trip(self):
+        """Test that dumps output parses back to the same object."""
+        data = {"b": [1, 2.5, None], "a": {"nested": True}}
+        assert json_codec.loads(json_codec.dumps(data)) == data
+    
+    def test_indent_and_sort_keys(self):
+        """Test pretty-printing and key ordering."""
+        result = json_codec.dumps({"b": 1, "a": 2}, indent=True, sort_keys=True)
+        assert result.index('"a"') < result.index('"b"')
+        assert "\n  " in result
+    
+    def test_invalid_json_raises_decode_error(self):
+        """Test that invalid input raises json.JSONDecodeError."""
+        import json
+        with pytest.raises(json.JSONDecodeError):
+            json_codec.loads("{not json")
+    
+    def test_accepts_stdlib_only_documents(self):
+        """Test that NaN, huge floats and wide ints parse as json.loads parses them."""
+        import math
+        data = json_codec.loads('{"a": NaN, "b": 1e400, "c": 18446744073709551617}')
+        
+        assert math.isnan(data["a"])
+        assert data["b"] == float("inf")
+        assert data["c"] == 2**64 + 1
+        assert json_codec.loads(b'[123456789012345678901]') == [123456789012345678901]
+    
+    def test_parse_llm_response_accepts_nan(self):
+        """Test that JSON found by the extraction scan also parses."""
+        from utils.json_parser import parse_llm_response
+        parsed, error = parse_llm_response('x {"a": NaN} y')
+        
+        assert error is None
+        assert parsed["a"] != parsed["a"]
+    
+    @patch('utils.json_codec.orjson', None)
+    def test_stdlib_fallback(self):
+        """Test the stdlib path when orjson is unavailable."""
+        assert json_codec.dumps({"a": 1}) == '{"a": 1}'
+        assert json_codec.loads('{"a": 1}') == {"a": 1}
+
 
+class TestLogSerializer:
+    """Tests for the orjson-backed structlog serializer."""
+    
+    def test_renders_event_with_fallback(self):
+        """Test that values orjson cannot encode go through structlog's fallback."""
+        import json
+        import structlog
+        from utils.logger import _orjson_serializer
+        
+        renderer = structlog.processors.JSONRenderer(serializer=_orjson_serializer)
+        line = renderer(None, "info", {"event": "sql", "tables": {"users"}, "code": 1})
+        
+        assert json.loads(line) == {"event": "sql", "tables": "{'users'}", "code": 1}
+    
+    def test_wide_integers_fall_back_to_stdlib(self):
+        """Test that ints beyond 64 bits render instead of raising."""
+        import json
+        import structlog
+        from utils.logger import _orjson_serializer
+        
+        renderer = structlog.processors.JSONRenderer(serializer=_orjson_serializer)
+        line = renderer(None, "info", {"event": "tool_execution_start", "args": {"n": 2**70}})
+        
+        assert json.loads(line) == {"event": "tool_execution_start", "args": {"n": 2**70}}
+
+
+class TestExtractionCache:
+    """Tests for the content-addressable extraction cache."""
+    
+    def test_key_parts_are_length_prefixed(self):
+        """Test that shifting text between key parts changes the key."""
+        assert ExtractionCache.make_key("m", "abx", "y") != ExtractionCache.make_key("m", "ab", "xy")
+        assert ExtractionCache.make_key("m", "ab", "xy") == ExtractionCache.make_key("m", "ab", "xy")
+    
+    def test_persisted_entries_survive_new_instance(self, tmp_path):
+        """Test that entries written to cache_dir are read back by a fresh cache."""
+        key = ExtractionCache.make_key("ollama", "model", "1", "message")
+        ExtractionCache(cache_dir=str(tmp_path)).put(key, '{"amounts": []}', {"model": "model"})
+        
+        assert ExtractionCache(cache_dir=str(tmp_path)).get(key) == '{"amounts": []}'
+    
+    def test_non_object_disk_entry_is_a_miss(self, tmp_path):
+        """Test that a persisted file holding valid non-object JSON is treated as a miss."""
+        cache = ExtractionCache(cache_dir=str(tmp_path))
+        key = ExtractionCache.make_key("model", "message")
+        path = tmp_path / key[:2] / f"{key}.json"
+        path.parent.mkdir()
+        path.write_text("[1, 2]")
+        
+        assert cache.get(key) is None
+    
+    def test_invalid_entries_are_rejected(self):
+        """Test that non-object output is not stored and failing validation evicts."""
+        cache = ExtractionCache()
+        assert cache.put("k1", "not json") is False
+        assert cache.get("k1") is None
+        
+        cache.put("k2", '{"numeric_fields": "oops"}')
+        assert cache.get("k2", validator=lambda d: isinstance(d["numeric_fields"], list)) is None
+        assert cache.get("k2") is None
+    
+    def test_memory_is_bounded(self):
+        """Test that the least recently used entry is evicted past max_entries."""
+        cache = ExtractionCache(max_entries=2)
+        cache.put("a", "{}")
+        cache.put("b", "{}")
+        cache.get("a")
+        cache.put("c", "{}")
+        
+        assert cache.get("b") is None
+        assert cache.get("a") == "{}"
+    
+    def test_from_config_is_opt_in(self):
+        """Test that caching is disabled unless configured."""
+        assert ExtractionCache.from_config({}) is None
+        assert isinstance(ExtractionCache.from_config({"extraction_cache": True}), ExtractionCache)
+
+
+class TestValidateNumeric:
+    """Tests for vectorized numeric value checks."""
+    
+    def test_rejects_nan_inf_and_out_of_range(self):
+        """Test that only finite values within the magnitude cap pass."""
+        import numpy as np
+        values = np.array([1.5, np.nan, np.inf, -np.inf, 1e19, -2.0])
+        
+        result = validate_numeric.check_numeric_values(values)
+        
+        assert result.tolist() == [True, False, False, False, False, True]
+    
+    def test_loop_matches_numpy(self):
+        """Test that the loop kernel agrees with the vectorized path."""
+        import numpy as np
+        values = np.array([0.0, np.nan, 1e18, -1e17, 3.25])
+        
+        assert validate_numeric._check_loop(values).tolist() == validate_numeric._check_numpy(values).tolist()
+
+
+class TestValidateDictStructure:
+    """Tests for schema-based dictionary validation."""
+    
+    SCHEMA = {
+        "name": {"type": "str", "required": True},
+        "count": {"type": "int", "default": 1},
+        "tags": {"type": "list"}
+    }
+    
+    def test_defaults_and_types(self):
+        """Test that defaults fill missing fields and types are checked."""
+        assert validate_dict_structure({"name": "a"}, self.SCHEMA) == {"name": "a", "count": 1}
+        with pytest.raises(ValidationError, match="Required field 'name'"):
+            validate_dict_structure({"count": 2}, self.SCHEMA)
+        with pytest.raises(ValidationError, match="Expected int, got str"):
+            validate_dict_structure({"name": "a", "count": "2"}, self.SCHEMA)
+    
+    def test_schema_compiled_once(self):
+        """Test that repeated validation reuses the compiled schema."""
+        schema = dict(self.SCHEMA)
+        validate_dict_structure({"name": "a"}, schema)
+        compiled = validation._SCHEMA_CACHE[id(schema)][1]
+        validate_dict_structure({"name": "b"}, schema)
+        
+        assert validation._compiled_schema(schema) is compiled
+    
+    def test_type_checks_keep_isinstance_semantics(self):
+        """Test that subclasses pass, unknown types are unchecked and spelling is kept."""
+        from collections import OrderedDict
+        schema = {
+            "flag": {"type": "int"},
+            "meta": {"type": "dict"},
+            "blob": {"type": "bytes"},
+            "ratio": {"type": "Float"}
+        }
+        data = {"flag": True, "meta": OrderedDict(a=1), "blob": b"x"}
+        
+        assert validate_dict_structure(data, schema) == data
+        with pytest.raises(ValidationError, match="Expected Float, got int"):
+            validate_dict_structure({"ratio": 1}, schema)
+
+
+class TestValidateRequiredFields:
+    """Tests for required-field checks."""
+    
+    def test_reports_missing_and_none_sorted(self):
+        """Test that absent and None fields are reported in sorted order."""
+        data = {"a": 1, "b": None, "c": 0}
+        
+        validate_required_fields(data, frozenset({"a", "c"}))
+        with pytest.raises(ValidationError, match="Missing required fields: b, d"):
+            validate_required_fields(data, ["d", "a", "b"])
+
+
+class TestStringValidator:
+    """Tests for string field validators."""
+    
+    def test_prebuilt_validator(self):
+        """Test that a prebuilt validator applies only its configured checks."""
+        validate = make_string_validator("mode", max_length=5, allowed_values=["fast", "slow"])
+        
+        assert validate("fast") == "fast"
+        with pytest.raises(ValidationError, match="at most 5"):
+            validate("faster")
+        with pytest.raises(ValidationError, match=r"one of \['fast', 'slow'\], got 'mid'"):
+            validate("mid")
+        with pytest.raises(ValidationError, match="must be a string"):
+            validate(3)
+    
+    def test_wrapper_matches_validator(self):
+        """Test that validate_string_field keeps its one-shot behavior."""
+        assert validate_string_field("abc", "name", min_length=1) == "abc"
+        with pytest.raises(ValidationError, match="at least 2"):
+            validate_string_field("a", "name", min_length=2)
+
+
+class TestCompiledValidation:
+    """Tests for the mypyc-compiled validation module."""
+    
+    def test_compiled_module_matches_python(self):
+        """Test that the mypyc build, when present, agrees with the pure-Python source."""
+        import importlib.util
+        import os
+        if validation.__file__.endswith(".py"):
+            pytest.skip("utils.validation is not compiled with mypyc")
+        source = os.path.join(os.path.dirname(validation.__file__), "validation.py")
+        spec = importlib.util.spec_from_file_location("_validation_py", source)
+        pure = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(pure)
+        schema = {"name": {"type": "str", "required": True}, "count": {"type": "int", "default": 1}}
+        
+        for module in (validation, pure):
+            assert module.validate_dict_structure({"name": "a"}, schema) == {"name": "a", "count": 1}
+            assert module.sanitize_string("  abcdef  ", max_length=3) == "abc"
+            assert module.make_string_validator("mode", allowed_values=["fast"])("fast") == "fast"
+            with pytest.raises(ValidationError, match="Expected int, got str"):
+                module.validate_dict_structure({"name": "a", "count": "2"}, schema)
+            with pytest.raises(ValidationError, match="Missing required fields: b, d"):
+                module.validate_required_fields({"a": 1, "b": None}, ["d", "a", "b"])
+
+class TestSanitizeString:
+    """Tests for string sanitization."""
+    
+    def test_strips_converts_and_truncates(self):
+        """Test stripping, conversion of non-strings and truncation logging."""
+        assert sanitize_string(None) == ""
+        assert sanitize_string(42) == "42"
+        with patch("utils.validation.logger") as mock_logger:
+            assert sanitize_string("  abcdef  ", max_length=3) == "abc"
+        
+        mock_logger.warning.assert_called_once_with("string_truncated", original_length=10, truncated_length=3)
@@ -1,16 +1,38 @@
 """
 Tools for agent execution.
+
+Tool classes are imported on first access so that importing a single tool
+module (or the tool factory) does not load every tool's dependencies.
 """
+import importlib
 
 from .base_tool import BaseTool
-from .sql_generator import SQLGeneratorTool
-from .sql_validator import SQLValidatorTool
-from .sql_executor import SQLExecutorTool
-from .log_analyzer import LogAnalyzerTool
-from .financial_extractor import FinancialExtractorTool
-from .field_extractor import GenericFieldExtractorTool, FieldValidatorTool
-from .bucketing_strategy import FieldAnalyzerTool, BucketStrategyGeneratorTool, BucketValidatorTool
-from .schema_introspector import SchemaIntrospectorTool, ListTablesTool
+
+_LAZY_EXPORTS = {
+    'SQLGeneratorTool': '.sql_generator',
+    'SQLValidatorTool': '.sql_validator',
+    'SQLExecutorTool': '.sql_executor',
+    'LogAnalyzerTool': '.log_analyzer',
+    'FinancialExtractorTool': '.financial_extractor',
+    'GenericFieldExtractorTool': '.field_extractor',
+    'FieldValidatorTool': '.field_extractor',
+    'ExtractedFieldValidatorTool': '._validator_core',
+    'FieldAnalyzerTool': '.bucketing_strategy',
+    'BucketStrategyGeneratorTool': '.bucketing_strategy',
+    'BucketValidatorTool': '.bucketing_strategy',
+    'SchemaIntrospectorTool': '.schema_introspector',
+    'ListTablesTool': '.schema_introspector',
+}
+
+
+def __getattr__(name: str):
+    module_name = _LAZY_EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
 
 __all__ = [
     'BaseTool',
@@ -21,10 +43,10 @@ __all__ = [
     'FinancialExtractorTool',
     'GenericFieldExtractorTool',
     'FieldValidatorTool',
+    'ExtractedFieldValidatorTool',
     'FieldAnalyzerTool',
     'BucketStrategyGeneratorTool',
     'BucketValidatorTool',
     'SchemaIntrospectorTool',
     'ListTablesTool',
 ]
-
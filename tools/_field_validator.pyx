@@ -0,0 +1,44 @@
+# cython: language_level=3
+"""
+Compiled traversal for ExtractedFieldValidatorTool.
+
+Build in place with ``cythonize -i tools/_field_validator.pyx`` (the Docker
+image does this). When the extension is not built, tools._validator_core
+falls back to the equivalent pure-Python traversal.
+"""
+from cpython.dict cimport PyDict_Check
+from cpython.list cimport PyList_Check
+
+
+cpdef tuple validate(object fields, tuple categories):
+    """
+    Validate every field of every category list in one pass.
+
+    Args:
+        fields: Decoded extraction output
+        categories: Category keys to validate, in order
+
+    Returns:
+        (field_count, validation_results)
+    """
+    cdef list results = []
+    cdef object items
+    cdef object field
+    cdef str category
+    cdef str label
+
+    if not PyDict_Check(fields):
+        return 0, results
+
+    for category in categories:
+        items = (<dict>fields).get(category)
+        if not PyList_Check(items):
+            continue
+        label = category[:-1]
+        for field in <list>items:
+            if PyDict_Check(field) and "name" in <dict>field and "value" in <dict>field:
+                results.append(f"Valid {label}: {(<dict>field)['name']} = {(<dict>field)['value']}")
+            else:
+                results.append(f"Invalid {label}: missing name or value")
+
+    return len(results), results
@@ -0,0 +1,113 @@
+"""
+Shared validator tool for extracted-field JSON.
+"""
+import json
+from typing import Dict, Any, Optional, List, Tuple, Sequence, Callable
+from core.tool import BaseTool
+from utils.json_codec import loads as _loads, dumps as _dumps
+
+# (fields, categories) -> (field_count, validation_results)
+FieldCheck = Callable[[Any, Tuple[str, ...]], Tuple[int, List[str]]]
+
+
+def validate_categories_py(fields: Any, categories: Tuple[str, ...]) -> Tuple[int, List[str]]:
+    """
+    Check that every field of every category list has a name and a value.
+    
+    Pure-Python twin of tools/_field_validator.pyx, used when the compiled
+    extension is not built.
+    
+    Returns:
+        (field_count, validation_results)
+    """
+    if not isinstance(fields, dict):
+        return 0, []
+    results = [
+        f"Valid {category[:-1]}: {field['name']} = {field['value']}"
+        if isinstance(field, dict) and "name" in field and "value" in field
+        else f"Invalid {category[:-1]}: missing name or value"
+        for category in categories
+        if isinstance(fields.get(category), list)
+        for field in fields[category]
+    ]
+    return len(results), results
+
+
+try:
+    from tools._field_validator import validate as validate_categories
+except ImportError:  # Cython extension is optional; fall back to pure Python
+    validate_categories = validate_categories_py
+
+
+def _decode(text: str) -> Any:
+    """
+    Decode extracted fields, accepting the NaN/Infinity literals orjson rejects.
+    
+    Such values are then reported per field instead of failing the document.
+    """
+    try:
+        return _loads(text)
+    except json.JSONDecodeError:
+        return json.loads(text)
+
+
+class ExtractedFieldValidatorTool(BaseTool):
+    """
+    Tool for validating extracted fields, parametrized by category and check.
+    
+    The no-argument FieldValidatorTool classes in tools.field_extractor and
+    tools.financial_extractor preset it for their extraction output.
+    """
+    
+    __slots__ = ("categories", "_check")
+    
+    def __init__(
+        self,
+        name: str,
+        description: str,
+        categories: Sequence[str],
+        check: Optional[FieldCheck] = None
+    ):
+        """
+        Initialize field validator.
+        
+        Args:
+            name: Tool name
+            description: Tool description
+            categories: Top-level keys of the extraction whose lists are validated
+            check: Validation function (defaults to a name/value presence check)
+        """
+        self.categories = tuple(categories)
+        self._check = check or validate_categories
+        super().__init__(
+            name=name,
+            description=description,
+            parameter_schema={
+                "extracted_fields": {
+                    "type": "str",
+                    "required": True,
+                    "description": "JSON string of extracted fields"
+                }
+            }
+        )
+    
+    def _execute_impl(self, args: Dict[str, Any], trace_id: Optional[str] = None) -> str:
+        """Validate extracted fields."""
+        extracted_fields = args["extracted_fields"]
+        
+        try:
+            fields = _decode(extracted_fields)
+        except json.JSONDecodeError as e:
+            return _dumps({
+                "valid": False,
+                "error": f"Invalid JSON in extracted fields: {e}",
+                "raw_data": extracted_fields[:500]
+            }, indent=True)
+        
+        field_count, validation_results = self._check(fields, self.categories)
+        return _dumps({
+            "valid": field_count > 0,
+            "field_count": field_count,
+            "validation_results": validation_results,
+            "fields": fields
+        }, indent=True)
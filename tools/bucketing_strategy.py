@@ -1,114 +1,163 @@
 """
 Domain-aware bucketing strategy tools.
 """
+import io
+import os
 import json
-from typing import Dict, Any, Optional, List
+import math
+import hashlib
+from typing import Dict, Any, Optional, List, Iterable, Iterator, Tuple
 from ollama import Client
+import numpy as np
 import pandas as pd
 from core.tool import BaseTool
+from utils.cache import SimpleCache
+from utils.json_codec import loads as _loads, dumps as _dumps
 from utils.logger import get_logger
-from utils.exceptions import ToolExecutionError
+from utils.exceptions import ToolExecutionError, ConfigurationError
+
+try:
+    from numba import njit
+except ImportError:  # Numba is optional; fall back to plain numpy
+    njit = None
 
 logger = get_logger(__name__)
 
+COVERAGE_OK = 0
+COVERAGE_MIN_GAP = 1
+COVERAGE_MAX_GAP = 2
 
-class FieldAnalyzerTool(BaseTool):
-    """Tool for analyzing field distribution."""
-    
-    def __init__(self):
-        super().__init__(
-            name="analyze_field",
-            description="Analyze field distribution and statistics",
-            parameter_schema={
-                "field_data": {
-                    "type": "str",
-                    "required": True,
-                    "description": "Field data (CSV or JSON)"
-                },
-                "field_name": {
-                    "type": "str",
-                    "required": True,
-                    "description": "Name of the field to analyze"
-                }
-            }
-        )
+
+def _is_number(value: Any) -> bool:
+    """Check that a decoded JSON value is an int or float (bool excluded)."""
+    return not isinstance(value, bool) and isinstance(value, (int, float))
+
+
+def _check_coverage(mins: np.ndarray, maxs: np.ndarray, data_min: float, data_max: float) -> int:
+    """
+    Check that bucket bounds span the data range; returns a COVERAGE_* status code.
     
-    def _execute_impl(self, args: Dict[str, Any], trace_id: Optional[str] = None) -> str:
-        """Analyze field distribution."""
-        field_data = args["field_data"]
-        field_name = args["field_name"]
-        
-        try:
-            # Try to parse as CSV or JSON
-            if field_data.startswith("["):
-                data = json.loads(field_data)
-                df = pd.DataFrame(data)
-            else:
-                # Assume CSV-like format
-                lines = field_data.split("\n")
-                df = pd.DataFrame([line.split(",") for line in lines if line.strip()])
-            
-            if field_name in df.columns:
-                field_values = df[field_name]
-                stats = {
-                    "count": len(field_values),
-                    "unique": field_values.nunique(),
-                    "min": float(field_values.min()) if pd.api.types.is_numeric_dtype(field_values) else None,
-                    "max": float(field_values.max()) if pd.api.types.is_numeric_dtype(field_values) else None,
-                    "mean": float(field_values.mean()) if pd.api.types.is_numeric_dtype(field_values) else None,
-                    "sample_values": field_values.head(10).tolist()
-                }
-                return json.dumps(stats, indent=2)
-            else:
-                return json.dumps({"error": f"Field '{field_name}' not found"})
-        except Exception as e:
-            return json.dumps({"error": str(e)})
+    NaN entries mark buckets without that bound and are ignored.
+    """
+    present_mins = mins[~np.isnan(mins)]
+    if present_mins.size > 0 and present_mins.min() > data_min:
+        return COVERAGE_MIN_GAP
+    present_maxs = maxs[~np.isnan(maxs)]
+    if present_maxs.size > 0 and present_maxs.max() < data_max:
+        return COVERAGE_MAX_GAP
+    return COVERAGE_OK
 
 
-class BucketStrategyGeneratorTool(BaseTool):
-    """Tool for generating domain-aware bucketing strategy using LLM."""
+def _minmaxsum(values: np.ndarray) -> Tuple[float, float, float]:
+    """Return (min, max, sum) of a non-empty float64 array."""
+    return values.min(), values.max(), values.sum()
+
+
+def _minmaxsum_loop(values: np.ndarray) -> Tuple[float, float, float]:
+    """Single-pass (min, max, sum); only used when compiled by Numba."""
+    data_min = values[0]
+    data_max = values[0]
+    total = 0.0
+    for i in range(values.size):
+        value = values[i]
+        if value < data_min:
+            data_min = value
+        if value > data_max:
+            data_max = value
+        total += value
+    return data_min, data_max, total
+
+
+if njit is not None:
+    _check_coverage = njit(cache=True)(_check_coverage)
+    _minmaxsum = njit(cache=True, fastmath=True)(_minmaxsum_loop)
+
+
+def _scan_csv_column(field_data: str, field_name: str) -> Optional[pd.Series]:
+    """
+    Extract a single column from simple CSV text using vectorized byte scans.
     
-    def __init__(self, llm: Client, model_name: str):
-        """
-        Initialize bucket strategy generator.
-        
-        Args:
-            llm: Ollama client
-            model_name: Model name
-        """
-        self.llm = llm
-        self.model_name = model_name
-        super().__init__(
-            name="generate_bucketing_strategy",
-            description="Generate domain-aware bucketing strategy for a field using LLM",
-            parameter_schema={
-                "field_analysis": {
-                    "type": "str",
-                    "required": True,
-                    "description": "Field analysis results (JSON)"
-                },
-                "field_name": {
-                    "type": "str",
-                    "required": True,
-                    "description": "Name of the field"
+    Newline and comma offsets are located with numpy comparisons, the target
+    column's byte ranges are gathered into one buffer, and only that column is
+    handed to the C CSV parser for type inference.
+    
+    Returns:
+        Series of column values, or None if the input needs the full CSV parser
+        (quoted fields, CR line endings, ragged rows, or an unknown column)
+    """
+    raw = field_data.encode("utf-8")
+    if not raw.endswith(b"\n"):
+        raw += b"\n"
+    buf = np.frombuffer(raw, dtype=np.uint8)
+    if (buf == 0x22).any() or (buf == 0x0D).any():
+        return None
+    
+    line_ends = np.flatnonzero(buf == 0x0A)
+    line_starts = np.concatenate(([0], line_ends[:-1] + 1))
+    non_blank = line_ends > line_starts
+    line_starts = line_starts[non_blank]
+    line_ends = line_ends[non_blank]
+    if line_starts.size < 2:
+        return None
+    
+    header = raw[line_starts[0]:line_ends[0]].decode("utf-8").split(",")
+    if field_name not in header:
+        return None
+    column = header.index(field_name)
+    
+    commas = np.flatnonzero(buf == 0x2C)
+    first_comma = np.searchsorted(commas, line_starts)
+    comma_counts = np.searchsorted(commas, line_ends) - first_comma
+    if (comma_counts != len(header) - 1).any():
+        return None
+    
+    first_comma = first_comma[1:]
+    starts = line_starts[1:] if column == 0 else commas[first_comma + column - 1] + 1
+    ends = line_ends[1:] if column == len(header) - 1 else commas[first_comma + column]
+    
+    # Gather each field plus its trailing delimiter, then turn delimiters into newlines
+    lengths = ends - starts + 1
+    offsets = np.cumsum(lengths) - lengths
+    gather = np.arange(lengths.sum()) - np.repeat(offsets, lengths) + np.repeat(starts, lengths)
+    column_bytes = buf[gather]
+    column_bytes[offsets + lengths - 1] = 0x0A
+    
+    return pd.read_csv(
+        io.BytesIO(column_bytes.tobytes()),
+        engine="c",
+        header=None,
+        names=[field_name],
+        skip_blank_lines=False
+    )[field_name]
+
+# JSON schema passed to Ollama structured outputs so decoding is constrained to it
+BUCKET_STRATEGY_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "strategy_type": {
+            "type": "string",
+            "enum": ["equal_width", "equal_frequency", "domain_specific", "quantile_based", "custom"]
+        },
+        "strategy_rationale": {"type": "string"},
+        "buckets": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "properties": {
+                    "name": {"type": "string"},
+                    "min": {"type": "number"},
+                    "max": {"type": "number"},
+                    "description": {"type": "string"}
                 },
-                "domain": {
-                    "type": "str",
-                    "required": False,
-                    "default": "general",
-                    "description": "Domain context (e.g., financial, time, categorical)"
-                }
+                "required": ["name", "min", "max"]
             }
-        )
-    
-    def _execute_impl(self, args: Dict[str, Any], trace_id: Optional[str] = None) -> str:
-        """Generate bucketing strategy."""
-        log = logger.bind(trace_id=trace_id)
-        field_analysis = args["field_analysis"]
-        field_name = args["field_name"]
-        domain = args.get("domain", "general")
-        
-        prompt = f"""# Role
+        }
+    },
+    "required": ["strategy_type", "buckets"]
+}
+
+# str.format template; {field_name}, {domain} and {field_analysis} are filled per call
+BUCKET_STRATEGY_PROMPT_TEMPLATE = """# Role
 You are an expert data scientist and statistician specializing in creating optimal bucketing strategies for data analysis, feature engineering, and business intelligence.
 
 # Your Task
@@ -155,22 +204,7 @@ Choose the most appropriate strategy type:
 
 # Output Format
 
-Return a comprehensive JSON object:
-{{
-    "strategy_type": "equal_width|equal_frequency|domain_specific|quantile_based|custom",
-    "strategy_rationale": "Detailed explanation of why this strategy type was chosen for this field and domain",
-    "buckets": [
-        {{
-            "name": "descriptive_bucket_name",
-            "min": minimum_value_inclusive,
-            "max": maximum_value_exclusive,
-            "description": "what this bucket represents and when to use it",
-            "expected_frequency": "high|medium|low (estimated)"
-        }}
-    ],
-    "implementation_notes": "Any special considerations for implementing this bucketing strategy",
-    "alternatives_considered": "Brief note about other strategies considered and why they were rejected"
-}}
+Return a JSON object with the chosen "strategy_type", a brief "strategy_rationale", and the "buckets" list. Each bucket has a descriptive "name", an inclusive "min", an exclusive "max", and a short "description".
 
 # Quality Checklist
 
@@ -183,22 +217,325 @@ Return a comprehensive JSON object:
 
 # Your Bucketing Strategy (JSON only, no other text):
 """
+
+
+class FieldAnalyzerTool(BaseTool):
+    """Tool for analyzing field distribution."""
+    
+    __slots__ = ("chunk_size", "data_root")
+    
+    # Inline field data above this size should be passed as a file path instead
+    LARGE_FIELD_DATA_BYTES = 50 * 1024 * 1024
+    
+    def __init__(self, chunk_size: int = 100_000, data_root: Optional[str] = None):
+        """
+        Initialize field analyzer.
+        
+        Args:
+            chunk_size: Rows read per chunk when streaming from field_data_path
+            data_root: Directory that field_data_path is resolved against; the
+                parameter is disabled when not set
+        """
+        self.chunk_size = chunk_size
+        self.data_root = os.path.realpath(data_root) if data_root else None
+        parameter_schema = {
+            "field_data": {
+                "type": "str",
+                "required": False,
+                "description": "Field data (CSV or JSON)"
+            },
+            "field_name": {
+                "type": "str",
+                "required": True,
+                "description": "Name of the field to analyze"
+            },
+            "pretty": {
+                "type": "bool",
+                "required": False,
+                "default": False,
+                "description": "Indent the JSON output for human reading"
+            }
+        }
+        if self.data_root is not None:
+            parameter_schema["field_data_path"] = {
+                "type": "str",
+                "required": False,
+                "description": "Path, relative to the data directory, of a CSV, JSON or NDJSON file to stream instead of passing field_data"
+            }
+        super().__init__(
+            name="analyze_field",
+            description="Analyze field distribution and statistics",
+            parameter_schema=parameter_schema
+        )
+    
+    def _resolve_data_path(self, field_data_path: str) -> str:
+        """
+        Resolve field_data_path inside data_root.
+        
+        Raises:
+            ValueError: If file access is disabled or the path escapes data_root
+        """
+        if self.data_root is None:
+            raise ValueError("field_data_path is disabled; no data_root is configured")
+        path = os.path.realpath(os.path.join(self.data_root, field_data_path))
+        if os.path.commonpath([self.data_root, path]) != self.data_root:
+            raise ValueError("field_data_path must be inside the configured data directory")
+        return path
+    
+    def _load_field_values(self, field_data: str, field_name: str) -> Optional[pd.Series]:
+        """
+        Load only the requested column from CSV or JSON field data.
+        
+        Returns:
+            Series of field values, or None if the field is not present
+        """
+        stripped = field_data.lstrip()
+        if stripped.startswith(("[", "{")):
+            data = _loads(stripped)
+            if isinstance(data, dict):
+                # Column-oriented: {"field": [values...]}
+                values = data.get(field_name)
+                return pd.Series(values) if isinstance(values, list) else None
+            records = [row for row in data if isinstance(row, dict)]
+            if not any(field_name in row for row in records):
+                return None
+            return pd.Series([row.get(field_name) for row in records])
+        
+        # CSV with a header row: scan out the one column when the layout is simple
+        values = _scan_csv_column(field_data, field_name)
+        if values is not None:
+            return values
+        
+        # Quoted or irregular CSV: let the C parser skip every other column. index_col=False
+        # keeps rows with extra fields aligned to the header instead of shifting them
+        df = pd.read_csv(
+            io.StringIO(field_data),
+            engine="c",
+            usecols=lambda col: col == field_name,
+            index_col=False
+        )
+        if field_name not in df.columns:
+            return None
+        return df[field_name]
+    
+    def _iter_field_chunks(self, path: str, field_name: str) -> Iterator[pd.Series]:
+        """Stream the requested column from a CSV or NDJSON file in chunks; JSON files are read whole."""
+        if path.endswith(".json"):
+            df = pd.read_json(path)
+            if field_name in df.columns:
+                yield df[field_name]
+            return
+        if path.endswith((".jsonl", ".ndjson")):
+            reader = pd.read_json(path, lines=True, chunksize=self.chunk_size)
+        else:
+            reader = pd.read_csv(
+                path,
+                engine="c",
+                usecols=lambda col: col == field_name,
+                index_col=False,
+                chunksize=self.chunk_size
+            )
+        with reader:
+            for chunk in reader:
+                if field_name in chunk.columns:
+                    yield chunk[field_name]
+    
+    def _compute_stats(self, chunks: Iterable[pd.Series]) -> Optional[Dict[str, Any]]:
+        """
+        Accumulate field statistics over one or more chunks of values.
+        
+        Returns:
+            Statistics dictionary, or None if no chunk contained the field
+        """
+        found = False
+        count = 0
+        non_null = 0
+        total = 0.0
+        data_min = None
+        data_max = None
+        is_numeric = True
+        unique_values = set()
+        sample_values: List[Any] = []
+        
+        for values in chunks:
+            found = True
+            count += len(values)
+            if len(sample_values) < 10:
+                sample_values.extend(values.head(10 - len(sample_values)).tolist())
+            
+            present = values.dropna()
+            unique_values.update(present.unique())
+            
+            if not is_numeric or present.empty:
+                continue
+            if not pd.api.types.is_numeric_dtype(present):
+                is_numeric = False
+                continue
+            
+            chunk_min, chunk_max, chunk_sum = _minmaxsum(
+                np.ascontiguousarray(present.to_numpy(dtype=np.float64))
+            )
+            data_min = float(chunk_min) if data_min is None else min(data_min, float(chunk_min))
+            data_max = float(chunk_max) if data_max is None else max(data_max, float(chunk_max))
+            total += float(chunk_sum)
+            non_null += len(present)
+        
+        if not found:
+            return None
+        
+        numeric = is_numeric and non_null > 0
+        return {
+            "count": count,
+            "unique": len(unique_values),
+            "min": data_min if numeric else None,
+            "max": data_max if numeric else None,
+            "mean": total / non_null if numeric else None,
+            "sample_values": sample_values
+        }
+    
+    def _execute_impl(self, args: Dict[str, Any], trace_id: Optional[str] = None) -> str:
+        """Analyze field distribution."""
+        field_data = args.get("field_data")
+        field_data_path = args.get("field_data_path")
+        field_name = args["field_name"]
+        
+        try:
+            if field_data_path:
+                path = self._resolve_data_path(field_data_path)
+                stats = self._compute_stats(self._iter_field_chunks(path, field_name))
+            elif field_data:
+                if len(field_data) > self.LARGE_FIELD_DATA_BYTES:
+                    logger.warning(
+                        "large_inline_field_data",
+                        size=len(field_data),
+                        hint="pass field_data_path to stream the data instead"
+                    )
+                field_values = self._load_field_values(field_data, field_name)
+                stats = self._compute_stats([field_values]) if field_values is not None else None
+            else:
+                return _dumps({"error": "Either 'field_data' or 'field_data_path' is required"})
+            
+            if stats is None:
+                return _dumps({"error": f"Field '{field_name}' not found"})
+            return _dumps(stats, indent=args.get("pretty", False))
+        except Exception as e:
+            return _dumps({"error": str(e)})
+
+
+class BucketStrategyGeneratorTool(BaseTool):
+    """Tool for generating domain-aware bucketing strategy using LLM."""
+    
+    __slots__ = ("llm", "model_name", "_strategy_cache")
+    
+    def __init__(self, llm: Client, model_name: str, cache_ttl: Optional[int] = 3600):
+        """
+        Initialize bucket strategy generator.
+        
+        Args:
+            llm: Ollama client
+            model_name: Model name
+            cache_ttl: Time-to-live in seconds for cached strategies (None disables caching)
+        """
+        self.llm = llm
+        self.model_name = model_name
+        self._strategy_cache = SimpleCache(default_ttl=cache_ttl) if cache_ttl else None
+        super().__init__(
+            name="generate_bucketing_strategy",
+            description="Generate domain-aware bucketing strategy for a field using LLM",
+            parameter_schema={
+                "field_analysis": {
+                    "type": "str",
+                    "required": True,
+                    "description": "Field analysis results (JSON)"
+                },
+                "field_name": {
+                    "type": "str",
+                    "required": True,
+                    "description": "Name of the field"
+                },
+                "domain": {
+                    "type": "str",
+                    "required": False,
+                    "default": "general",
+                    "description": "Domain context (e.g., financial, time, categorical)"
+                }
+            }
+        )
+    
+    def _fingerprint(self, field_analysis: str, field_name: str, domain: str) -> str:
+        """
+        Build a cache key from a normalized view of the field statistics.
+        
+        Numeric stats are rounded and the unique count is bucketed to log2 so
+        near-identical analyses map to the same strategy.
+        """
+        try:
+            stats = _loads(field_analysis)
+        except (json.JSONDecodeError, TypeError):
+            stats = None
+        
+        if isinstance(stats, dict):
+            def _round(value: Any) -> Any:
+                return round(value, 3) if isinstance(value, (int, float)) else None
+            
+            unique = stats.get("unique")
+            fingerprint = {
+                "min": _round(stats.get("min")),
+                "max": _round(stats.get("max")),
+                "mean": _round(stats.get("mean")),
+                "unique_log2": int(math.log2(unique + 1)) if isinstance(unique, (int, float)) and unique >= 0 else None,
+            }
+            # Categorical fields have no numeric range, so their samples drive the strategy
+            if fingerprint["min"] is None and fingerprint["max"] is None:
+                fingerprint["sample_values"] = stats.get("sample_values")
+        else:
+            fingerprint = {"raw": field_analysis}
+        
+        fingerprint.update(model=self.model_name, field_name=field_name, domain=domain)
+        key_str = _dumps(fingerprint, sort_keys=True)
+        return hashlib.blake2b(key_str.encode(), digest_size=16).hexdigest()
+    
+    def _execute_impl(self, args: Dict[str, Any], trace_id: Optional[str] = None) -> str:
+        """Generate bucketing strategy."""
+        field_analysis = args["field_analysis"]
+        field_name = args["field_name"]
+        domain = args.get("domain", "general")
+        
+        cache_key = None
+        if self._strategy_cache is not None:
+            cache_key = self._fingerprint(field_analysis, field_name, domain)
+            cached_strategy = self._strategy_cache.get(cache_key)
+            if cached_strategy is not None:
+                logger.info("bucket_strategy_cache_hit", field_name=field_name, domain=domain)
+                return cached_strategy
+        
+        prompt = BUCKET_STRATEGY_PROMPT_TEMPLATE.format_map({
+            "field_name": field_name,
+            "domain": domain,
+            "field_analysis": field_analysis,
+        })
         
         try:
             response = self.llm.chat(
                 model=self.model_name,
                 messages=[{'role': 'user', 'content': prompt}],
-                options={"format": "json"}
+                format=BUCKET_STRATEGY_SCHEMA
             )
-            return response['message']['content']
+            strategy = response['message']['content']
         except Exception as e:
-            log.error("bucket_strategy_generation_failed", error=str(e))
+            logger.error("bucket_strategy_generation_failed", error=str(e))
             raise ToolExecutionError(f"Bucket strategy generation failed: {e}", "generate_bucketing_strategy") from e
+        
+        if cache_key is not None and strategy:
+            self._strategy_cache.set(cache_key, strategy)
+        return strategy
 
 
 class BucketValidatorTool(BaseTool):
     """Tool for validating bucketing strategy."""
     
+    __slots__ = ()
+    
     def __init__(self):
         super().__init__(
             name="validate_bucketing_strategy",
@@ -223,35 +560,83 @@ class BucketValidatorTool(BaseTool):
         field_analysis = args["field_analysis"]
         
         try:
-            strategy_json = json.loads(strategy)
-            analysis_json = json.loads(field_analysis)
+            strategy_json = _loads(strategy)
             
-            # Basic validation
-            if "buckets" not in strategy_json:
-                return json.dumps({"valid": False, "error": "Missing 'buckets' in strategy"})
+            # Basic validation; reject before parsing the (possibly large) field analysis
+            if not isinstance(strategy_json, dict) or "buckets" not in strategy_json:
+                return _dumps({"valid": False, "error": "Missing 'buckets' in strategy"})
             
             buckets = strategy_json["buckets"]
             if not isinstance(buckets, list) or len(buckets) == 0:
-                return json.dumps({"valid": False, "error": "Buckets must be a non-empty list"})
+                return _dumps({"valid": False, "error": "Buckets must be a non-empty list"})
+            
+            for index, bucket in enumerate(buckets):
+                if not isinstance(bucket, dict):
+                    return _dumps({"valid": False, "error": f"Bucket {index} must be an object"})
+                for bound in ("min", "max"):
+                    value = bucket.get(bound)
+                    if value is not None and not _is_number(value):
+                        return _dumps({"valid": False, "error": f"Bucket {index} has a non-numeric '{bound}'"})
+            
+            analysis_json = _loads(field_analysis)
+            if not isinstance(analysis_json, dict):
+                return _dumps({"valid": False, "error": "Field analysis must be an object"})
             
             # Check if buckets cover the data range
-            if "min" in analysis_json and "max" in analysis_json:
-                data_min = analysis_json["min"]
-                data_max = analysis_json["max"]
-                
-                bucket_mins = [b.get("min") for b in buckets if "min" in b]
-                bucket_maxs = [b.get("max") for b in buckets if "max" in b]
+            data_min = analysis_json.get("min")
+            data_max = analysis_json.get("max")
+            for bound, value in (("min", data_min), ("max", data_max)):
+                if value is not None and not _is_number(value):
+                    return _dumps({"valid": False, "error": f"Field analysis has a non-numeric '{bound}'"})
+            if data_min is not None and data_max is not None:
+                # Struct-of-arrays view of the bucket bounds; NaN marks a missing bound
+                bucket_count = len(buckets)
+                bucket_mins = np.fromiter(
+                    (np.nan if b.get("min") is None else b["min"] for b in buckets),
+                    dtype=np.float64,
+                    count=bucket_count
+                )
+                bucket_maxs = np.fromiter(
+                    (np.nan if b.get("max") is None else b["max"] for b in buckets),
+                    dtype=np.float64,
+                    count=bucket_count
+                )
                 
-                if bucket_mins and min(bucket_mins) > data_min:
-                    return json.dumps({"valid": False, "error": "Buckets don't cover minimum value"})
-                if bucket_maxs and max(bucket_maxs) < data_max:
-                    return json.dumps({"valid": False, "error": "Buckets don't cover maximum value"})
+                coverage = _check_coverage(bucket_mins, bucket_maxs, float(data_min), float(data_max))
+                if coverage == COVERAGE_MIN_GAP:
+                    return _dumps({"valid": False, "error": "Buckets don't cover minimum value"})
+                if coverage == COVERAGE_MAX_GAP:
+                    return _dumps({"valid": False, "error": "Buckets don't cover maximum value"})
             
-            return json.dumps({
+            return _dumps({
                 "valid": True,
                 "strategy": strategy_json,
                 "bucket_count": len(buckets)
-            }, indent=2)
+            }, indent=True)
         except json.JSONDecodeError as e:
-            return json.dumps({"valid": False, "error": f"Invalid JSON: {e}"})
+            return _dumps({"valid": False, "error": f"Invalid JSON: {e}"})
+
+
+def create_field_analyzer(config: Dict[str, Any], context: Dict[str, Any]) -> FieldAnalyzerTool:
+    """
+    Create a FieldAnalyzerTool.
+    
+    field_data_path is only offered when the tool config sets "data_root".
+    """
+    return FieldAnalyzerTool(data_root=config.get("data_root"))
+
+
+def create_bucket_strategy_generator(config: Dict[str, Any], context: Dict[str, Any]) -> BucketStrategyGeneratorTool:
+    """Create a BucketStrategyGeneratorTool from tool config and shared factory context."""
+    llm_client = context.get("llm_client")
+    if not llm_client:
+        raise ConfigurationError("llm_client required for bucket_strategy_generator")
+    return BucketStrategyGeneratorTool(
+        llm=llm_client._client,
+        model_name=config.get("model", "llama3.2")
+    )
+
 
+def create_bucket_validator(config: Dict[str, Any], context: Dict[str, Any]) -> BucketValidatorTool:
+    """Create a BucketValidatorTool."""
+    return BucketValidatorTool()
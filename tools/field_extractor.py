@@ -2,237 +2,622 @@
 Generic field extraction tools for extracting interesting numerical and categorical fields.
 """
 import json
-from typing import Dict, Any, Optional, List
-from ollama import Client
+from functools import lru_cache
+from typing import Dict, Any, Optional, List, Iterator, Tuple
+from ollama import Client, AsyncClient
 from core.tool import BaseTool
-from utils.logger import get_logger
-from utils.exceptions import ToolExecutionError
+from tools._validator_core import ExtractedFieldValidatorTool
+from utils.logger import get_logger, trace_scope
+from utils.extraction_cache import ExtractionCache
+from utils.retry import chat_with_json_feedback, achat_with_json_feedback
+from utils.exceptions import ToolExecutionError, ConfigurationError
 
 logger = get_logger(__name__)
 
+# Top-level keys of an extraction result
+EXTRACTION_CATEGORIES = (
+    "numeric_fields",
+    "financial_fields",
+    "temporal_fields",
+    "categorical_fields",
+    "identifiers",
+    "other_fields",
+)
 
-class GenericFieldExtractorTool(BaseTool):
-    """Generic tool for extracting interesting fields from messages using LLM."""
-    
-    def __init__(self, llm: Client, model_name: str, field_types: Optional[List[str]] = None):
-        """
-        Initialize generic field extractor.
-        
-        Args:
-            llm: Ollama client
-            model_name: Model name for extraction
-            field_types: Optional list of field types to focus on (e.g., ["numeric", "financial", "temporal"])
-                        If None, extracts all interesting fields
-        """
-        self.llm = llm
-        self.model_name = model_name
-        self.field_types = field_types or ["numeric", "categorical", "temporal", "identifiers"]
-        
-        field_types_desc = ", ".join(self.field_types) if self.field_types else "all types"
-        super().__init__(
-            name="extract_fields",
-            description=f"Extract interesting fields ({field_types_desc}) from messages/logs. Can extract numeric values, categorical data, dates, IDs, and other structured information.",
-            parameter_schema={
-                "message": {
-                    "type": "str",
-                    "required": True,
-                    "description": "Message or log text to extract fields from"
-                },
-                "field_types": {
-                    "type": "str",
-                    "required": False,
-                    "description": "Comma-separated list of field types to extract (numeric, categorical, temporal, identifiers, financial). If not specified, extracts all interesting fields."
-                },
-                "domain": {
-                    "type": "str",
-                    "required": False,
-                    "description": "Domain context (e.g., financial, technical, general) to guide extraction"
-                }
-            }
-        )
-    
-    def _execute_impl(self, args: Dict[str, Any], trace_id: Optional[str] = None) -> str:
-        """Extract fields from message."""
-        log = logger.bind(trace_id=trace_id)
-        message = args["message"]
-        requested_field_types = args.get("field_types", "").split(",") if args.get("field_types") else self.field_types
-        domain = args.get("domain", "general")
-        
-        # Build extraction instructions based on field types
-        extraction_instructions = []
-        if "numeric" in requested_field_types or "all" in requested_field_types:
-            extraction_instructions.append("- Numeric values (integers, floats, percentages, ratios)")
-        if "financial" in requested_field_types or "all" in requested_field_types:
-            extraction_instructions.append("- Financial amounts (with or without currency symbols)")
-            extraction_instructions.append("- Currency codes")
-            extraction_instructions.append("- Stock prices, volumes, market data")
-        if "temporal" in requested_field_types or "all" in requested_field_types:
-            extraction_instructions.append("- Dates and timestamps")
-            extraction_instructions.append("- Time durations")
-        if "categorical" in requested_field_types or "all" in requested_field_types:
-            extraction_instructions.append("- Categorical values (status codes, types, categories)")
-        if "identifiers" in requested_field_types or "all" in requested_field_types:
-            extraction_instructions.append("- IDs (account numbers, transaction IDs, user IDs)")
-            extraction_instructions.append("- Reference numbers")
-        
-        field_types_list = ", ".join(requested_field_types) if requested_field_types else "all types"
-        
-        prompt = f"""# Role
-You are an expert data extraction specialist with deep knowledge of structured data extraction, field identification, and domain-specific patterns.
 
-# Your Task
-Extract all interesting, relevant, and analyzable fields from the provided message/log text. Focus on fields that would be valuable for data analysis, bucketing strategies, statistical processing, or business intelligence.
+# JSON schema of one extraction result, used to ask the model to self-correct
+EXTRACTION_SCHEMA = {
+    "type": "object",
+    "properties": {
+        category: {"type": "array", "items": {"type": "object"}}
+        for category in EXTRACTION_CATEGORIES
+    }
+}
 
-# Domain Context
-Domain: {domain}
-This context should guide your extraction - understand what types of fields are most relevant in this domain.
+# JSON schema of a batched extraction response
+BATCH_EXTRACTION_SCHEMA = {
+    "type": "object",
+    "required": ["results"],
+    "properties": {
+        "results": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "required": ["id"],
+                "properties": {"id": {"type": "integer"}}
+            }
+        }
+    }
+}
 
-# Field Types to Extract
-Target field types: {field_types_list}
 
-# Extraction Guidelines
+# Ollama options for extraction calls: deterministic output with bounded
+# generation and a context window that fits a full message batch. JSON output
+# is enforced separately, by passing the response schema as chat(format=...)
+DEFAULT_CHAT_OPTIONS = {"temperature": 0, "num_predict": 1024, "num_ctx": 8192}
 
-{chr(10).join(extraction_instructions)}
+# Conservative characters-per-token ratio for estimating a prompt's share of num_ctx
+_CHARS_PER_TOKEN = 3
 
-# Extraction Strategy
+# Extraction returned for blank messages without calling the LLM
+_EMPTY_EXTRACTION = json.dumps({category: [] for category in EXTRACTION_CATEGORIES})
 
-1. **Scan** the entire message/log systematically
-2. **Identify** all potential fields matching the target types
-3. **Categorize** each field into the appropriate category
-4. **Extract** the value, name, and relevant metadata
-5. **Validate** that extracted values are meaningful and useful
-6. **Contextualize** each field with surrounding context
 
-# Quality Criteria
+def _is_valid_extraction(data: Any) -> bool:
+    """Check that decoded extraction output has the expected category lists."""
+    return isinstance(data, dict) and all(
+        isinstance(data.get(category, []), list) for category in EXTRACTION_CATEGORIES
+    )
 
-Extract fields that are:
-- ✅ Numerically meaningful (not just random numbers)
-- ✅ Structurally significant (IDs, codes, references)
-- ✅ Temporally relevant (dates, times, durations)
-- ✅ Categorically distinct (statuses, types, classifications)
-- ✅ Financially relevant (amounts, prices, values)
-- ✅ Useful for analysis or bucketing
 
-# Output Format
+def _is_valid_batch_entry(entry: Any) -> bool:
+    """Check that a batched entry, with its id removed, carries at least one category."""
+    return _is_valid_extraction(entry) and any(category in entry for category in EXTRACTION_CATEGORIES)
 
-Return a JSON object with this exact structure:
-{{
+
+# Shape of one extraction result, shared by the single-message and batch prompts
+EXTRACTION_OUTPUT_STRUCTURE = """{
     "numeric_fields": [
-        {{
+        {
             "name": "descriptive_field_name",
             "value": 123.45,
             "unit": "unit_if_applicable",
             "context": "surrounding context explaining where this value appears"
-        }}
+        }
     ],
     "financial_fields": [
-        {{
+        {
             "name": "descriptive_field_name",
             "value": 1234.56,
             "currency": "USD|EUR|etc_or_null",
             "context": "surrounding context"
-        }}
+        }
     ],
     "temporal_fields": [
-        {{
+        {
             "name": "descriptive_field_name",
             "value": "2024-01-15",
             "type": "date|time|duration",
             "context": "surrounding context"
-        }}
+        }
     ],
     "categorical_fields": [
-        {{
+        {
             "name": "descriptive_field_name",
             "value": "category_value",
             "context": "surrounding context"
-        }}
+        }
     ],
     "identifiers": [
-        {{
+        {
             "name": "descriptive_field_name",
             "value": "ID12345",
             "type": "id|reference|code",
             "context": "surrounding context"
-        }}
+        }
     ],
     "other_fields": [
-        {{
+        {
             "name": "descriptive_field_name",
             "value": "any_value",
             "type": "field_type_description",
             "context": "surrounding context"
-        }}
+        }
     ]
-}}
+}"""
+
+
+# Extraction guideline bullets per field type, in prompt order
+_EXTRACTION_INSTRUCTIONS = {
+    "numeric": ("- Numeric values (integers, floats, percentages, ratios)",),
+    "financial": (
+        "- Financial amounts (with or without currency symbols)",
+        "- Currency codes",
+        "- Stock prices, volumes, market data",
+    ),
+    "temporal": ("- Dates and timestamps", "- Time durations"),
+    "categorical": ("- Categorical values (status codes, types, categories)",),
+    "identifiers": ("- IDs (account numbers, transaction IDs, user IDs)", "- Reference numbers"),
+}
+
+
+@lru_cache(maxsize=64)
+def _build_instructions(types: frozenset) -> str:
+    """Join the guideline bullets for a set of field types ("all" selects every type)."""
+    return "\n".join(
+        line
+        for field_type, lines in _EXTRACTION_INSTRUCTIONS.items()
+        if field_type in types or "all" in types
+        for line in lines
+    )
+
+
+@lru_cache(maxsize=16)
+def _extraction_guidelines(requested_field_types: Tuple[str, ...], domain: str) -> str:
+    """Build the role, domain and extraction-guideline sections of the prompt."""
+    extraction_instructions = _build_instructions(frozenset(requested_field_types))
+    
+    field_types_list = ", ".join(requested_field_types) if requested_field_types else "all types"
+    
+    return f"""# Role
+You are an expert data extraction specialist with deep knowledge of structured data extraction, field identification, and domain-specific patterns.
+
+# Your Task
+Extract all interesting, relevant, and analyzable fields from the provided message/log text. Focus on fields that would be valuable for data analysis, bucketing strategies, statistical processing, or business intelligence.
+
+# Domain Context
+Domain: {domain}
+This context should guide your extraction - understand what types of fields are most relevant in this domain.
+
+# Field Types to Extract
+Target field types: {field_types_list}
+
+# Extraction Guidelines
+
+{extraction_instructions}
+
+# Extraction Strategy
+
+1. **Scan** the entire message/log systematically
+2. **Identify** all potential fields matching the target types
+3. **Categorize** each field into the appropriate category
+4. **Extract** the value, name, and relevant metadata
+5. **Validate** that extracted values are meaningful and useful
+6. **Contextualize** each field with surrounding context
+
+# Quality Criteria
+
+Extract fields that are:
+- ✅ Numerically meaningful (not just random numbers)
+- ✅ Structurally significant (IDs, codes, references)
+- ✅ Temporally relevant (dates, times, durations)
+- ✅ Categorically distinct (statuses, types, classifications)
+- ✅ Financially relevant (amounts, prices, values)
+- ✅ Useful for analysis or bucketing
+"""
+
+
+@lru_cache(maxsize=16)
+def _single_prompt_prefix(requested_field_types: Tuple[str, ...], domain: str) -> str:
+    """Build everything in the single-message prompt that precedes the message."""
+    return f"""{_extraction_guidelines(requested_field_types, domain)}
+# Output Format
+
+Return a JSON object with this exact structure:
+{EXTRACTION_OUTPUT_STRUCTURE}
 
 # Input Message/Log
 
-{message}
+"""
+
+
+_SINGLE_PROMPT_SUFFIX = """
 
 # Your Extraction (JSON only, no other text):
 """
+
+
+class GenericFieldExtractorTool(BaseTool):
+    """Generic tool for extracting interesting fields from messages using LLM."""
+    
+    __slots__ = (
+        "llm",
+        "async_llm",
+        "model_name",
+        "field_types",
+        "batch_size",
+        "max_batch_chars",
+        "cache",
+        "max_format_retries",
+        "retry_backoff",
+        "_chat_options",
+    )
+    
+    # Bump whenever the prompt changes so cached extractions are not reused
+    PROMPT_VERSION = "1"
+    
+    def __init__(
+        self,
+        llm: Client,
+        model_name: str,
+        field_types: Optional[List[str]] = None,
+        batch_size: int = 8,
+        max_batch_chars: int = 16000,
+        async_llm: Optional[AsyncClient] = None,
+        cache: Optional[ExtractionCache] = None,
+        max_format_retries: int = 2,
+        retry_backoff: float = 1.0,
+        chat_options: Optional[Dict[str, Any]] = None
+    ):
+        """
+        Initialize generic field extractor.
         
-        try:
+        Args:
+            llm: Ollama client
+            model_name: Model name for extraction
+            field_types: Optional list of field types to focus on (e.g., ["numeric", "financial", "temporal"])
+                        If None, extracts all interesting fields
+            batch_size: Maximum number of messages sent in one LLM call for message_batch
+            max_batch_chars: Approximate cap on message characters per batched call (~4K tokens)
+            async_llm: Optional async Ollama client used by aexecute
+            cache: Optional extraction cache for repeated messages
+            max_format_retries: Correction rounds when the model returns malformed JSON
+            retry_backoff: Linear backoff in seconds between correction rounds
+            chat_options: Ollama options merged over DEFAULT_CHAT_OPTIONS
+        """
+        self.llm = llm
+        self.async_llm = async_llm
+        self.model_name = model_name
+        self.field_types = field_types or ["numeric", "categorical", "temporal", "identifiers"]
+        self.batch_size = batch_size
+        self.max_batch_chars = max_batch_chars
+        self.cache = cache
+        self.max_format_retries = max_format_retries
+        self.retry_backoff = retry_backoff
+        self._chat_options = {**DEFAULT_CHAT_OPTIONS, **(chat_options or {})}
+        
+        field_types_desc = ", ".join(self.field_types) if self.field_types else "all types"
+        super().__init__(
+            name="extract_fields",
+            description=f"Extract interesting fields ({field_types_desc}) from messages/logs. Can extract numeric values, categorical data, dates, IDs, and other structured information.",
+            parameter_schema={
+                "message": {
+                    "type": "str",
+                    "required": False,
+                    "description": "Message or log text to extract fields from"
+                },
+                "message_batch": {
+                    "type": "list",
+                    "required": False,
+                    "description": "List of messages to extract fields from; messages are grouped into batched LLM calls. Use instead of 'message'."
+                },
+                "field_types": {
+                    "type": "str",
+                    "required": False,
+                    "description": "Comma-separated list of field types to extract (numeric, categorical, temporal, identifiers, financial). If not specified, extracts all interesting fields."
+                },
+                "domain": {
+                    "type": "str",
+                    "required": False,
+                    "description": "Domain context (e.g., financial, technical, general) to guide extraction"
+                },
+                "max_tokens": {
+                    "type": "int",
+                    "required": False,
+                    "description": "Maximum tokens to generate per message (overrides the configured num_predict)"
+                }
+            }
+        )
+    
+    def _build_prompt(self, message: str, requested_field_types: List[str], domain: str) -> str:
+        """Build the prompt for extracting fields from a single message."""
+        return _single_prompt_prefix(tuple(requested_field_types), domain) + message + _SINGLE_PROMPT_SUFFIX
+    
+    def _build_batch_prompt(self, messages: List[str], requested_field_types: List[str], domain: str) -> str:
+        """Build one prompt that extracts fields from several numbered messages."""
+        message_sections = "\n".join(
+            f"<msg id={i}>\n{message}\n</msg>" for i, message in enumerate(messages)
+        )
+        return f"""{_extraction_guidelines(tuple(requested_field_types), domain)}
+# Output Format
+
+You will receive {len(messages)} messages, each wrapped in <msg id=N>...</msg>. Extract fields from each message independently.
+
+Return a JSON object of the form {{"results": [...]}} with exactly one entry per message. Each entry has an "id" key holding the message id plus the keys of this structure:
+{EXTRACTION_OUTPUT_STRUCTURE}
+
+# Input Messages
+
+{message_sections}
+
+# Your Extractions (JSON only, no other text):
+"""
+    
+    def _options(self, max_tokens: Optional[int] = None) -> Dict[str, Any]:
+        """Return the chat options, with num_predict overridden when max_tokens is set."""
+        if max_tokens is None:
+            return self._chat_options
+        return {**self._chat_options, "num_predict": max_tokens}
+    
+    def _chat(
+        self,
+        prompt: str,
+        schema: Dict[str, Any] = EXTRACTION_SCHEMA,
+        trace_id: Optional[str] = None,
+        max_tokens: Optional[int] = None
+    ) -> str:
+        """Send a schema-constrained chat request, asking the model to fix malformed output."""
+        options = self._options(max_tokens)
+        
+        def send(messages: List[Dict[str, str]]) -> str:
             response = self.llm.chat(
                 model=self.model_name,
-                messages=[{'role': 'user', 'content': prompt}],
-                options={"format": "json"}
+                messages=messages,
+                options=options,
+                format=schema
             )
             return response['message']['content']
+        
+        return chat_with_json_feedback(
+            send,
+            [{'role': 'user', 'content': prompt}],
+            schema,
+            self.max_format_retries,
+            self.retry_backoff,
+            trace_id
+        )
+    
+    async def _achat(
+        self,
+        prompt: str,
+        schema: Dict[str, Any] = EXTRACTION_SCHEMA,
+        trace_id: Optional[str] = None,
+        max_tokens: Optional[int] = None
+    ) -> str:
+        """Async variant of _chat using the async client."""
+        options = self._options(max_tokens)
+        
+        async def send(messages: List[Dict[str, str]]) -> str:
+            response = await self.async_llm.chat(
+                model=self.model_name,
+                messages=messages,
+                options=options,
+                format=schema
+            )
+            return response['message']['content']
+        
+        return await achat_with_json_feedback(
+            send,
+            [{'role': 'user', 'content': prompt}],
+            schema,
+            self.max_format_retries,
+            self.retry_backoff,
+            trace_id
+        )
+    
+    def _resolve_field_types(self, field_types: Optional[str]) -> List[str]:
+        """Parse the comma-separated field_types argument, defaulting to the tool's types."""
+        return field_types.split(",") if field_types else self.field_types
+    
+    def _cache_key(self, message: str, requested_field_types: List[str], domain: str) -> Optional[str]:
+        """Return the extraction cache key for a message, or None if caching is off."""
+        if self.cache is None:
+            return None
+        return ExtractionCache.make_key(
+            "ollama", self.model_name, self.PROMPT_VERSION, message, domain, ",".join(requested_field_types)
+        )
+    
+    def _cached(self, key: Optional[str]) -> Optional[str]:
+        """Return a cached, re-validated extraction for key, if any."""
+        if key is None:
+            return None
+        return self.cache.get(key, validator=_is_valid_extraction)
+    
+    def _store(self, key: Optional[str], content: str, domain: str):
+        """Write an extraction back to the cache."""
+        if key is not None:
+            self.cache.put(
+                key,
+                content,
+                {"model": self.model_name, "prompt_version": self.PROMPT_VERSION, "domain": domain},
+                validator=_is_valid_extraction
+            )
+    
+    def _extract_one(
+        self,
+        message: str,
+        requested_field_types: List[str],
+        domain: str,
+        trace_id: Optional[str] = None,
+        max_tokens: Optional[int] = None
+    ) -> str:
+        """Extract fields from a single message, consulting the cache first."""
+        if not message.strip():
+            return _EMPTY_EXTRACTION
+        key = self._cache_key(message, requested_field_types, domain)
+        cached = self._cached(key)
+        if cached is not None:
+            return cached
+        content = self._chat(self._build_prompt(message, requested_field_types, domain), trace_id=trace_id, max_tokens=max_tokens)
+        self._store(key, content, domain)
+        return content
+    
+    def _iter_batches(self, messages: List[str], indices: List[int]) -> Iterator[List[int]]:
+        """Group message indices into batches bounded by count and total characters."""
+        batch: List[int] = []
+        batch_chars = 0
+        for i in indices:
+            message = messages[i]
+            if batch and (len(batch) >= self.batch_size or batch_chars + len(message) > self.max_batch_chars):
+                yield batch
+                batch, batch_chars = [], 0
+            batch.append(i)
+            batch_chars += len(message)
+        if batch:
+            yield batch
+    
+    def _batch_token_budget(self, prompt: str, requested: int) -> int:
+        """Cap a batched call's num_predict so the prompt and the output both fit in num_ctx."""
+        return min(requested, self._chat_options["num_ctx"] - len(prompt) // _CHARS_PER_TOKEN)
+    
+    def extract_fields_batch(
+        self,
+        messages: List[str],
+        field_types: Optional[str] = None,
+        domain: str = "general",
+        trace_id: Optional[str] = None,
+        max_tokens: Optional[int] = None
+    ) -> List[str]:
+        """
+        Extract fields from many messages, packing several messages per LLM call.
+        
+        Messages the model omits or answers malformed are retried with a
+        single-message call. A message whose retry fails gets an {"error": ...}
+        object instead, without losing the rest of the batch.
+        
+        Args:
+            messages: Message texts
+            field_types: Optional comma-separated field types
+            domain: Domain context
+            trace_id: Optional trace ID for logging
+            max_tokens: Optional per-message generation budget (scaled by batch size)
+            
+        Returns:
+            Extraction JSON strings aligned with the input messages
+        """
+        with trace_scope(trace_id):
+            requested_field_types = self._resolve_field_types(field_types)
+            keys = [self._cache_key(message, requested_field_types, domain) for message in messages]
+            results: List[Optional[str]] = [
+                _EMPTY_EXTRACTION if not message.strip() else self._cached(key)
+                for message, key in zip(messages, keys)
+            ]
+            pending = [i for i, result in enumerate(results) if result is None]
+            per_message_tokens = max_tokens or self._chat_options["num_predict"]
+            
+            for batch in self._iter_batches(messages, pending):
+                if len(batch) > 1:
+                    prompt = self._build_batch_prompt([messages[i] for i in batch], requested_field_types, domain)
+                    budget = self._batch_token_budget(prompt, per_message_tokens * len(batch))
+                    entries: Any = []
+                    if budget < per_message_tokens:
+                        logger.info("batch_field_extraction_skipped", batch_size=len(batch), token_budget=budget)
+                    else:
+                        try:
+                            content = self._chat(prompt, BATCH_EXTRACTION_SCHEMA, trace_id, budget)
+                            entries = json.loads(content).get("results", [])
+                        except Exception as e:
+                            logger.warning("batch_field_extraction_failed", batch_size=len(batch), error=str(e))
+                    for entry in entries if isinstance(entries, list) else []:
+                        if not isinstance(entry, dict) or not isinstance(entry.get("id"), int):
+                            continue
+                        position = entry.pop("id")
+                        if 0 <= position < len(batch) and _is_valid_batch_entry(entry):
+                            i = batch[position]
+                            results[i] = json.dumps(entry)
+                            self._store(keys[i], results[i], domain)
+                
+                missing = [i for i in batch if results[i] is None]
+                if missing and len(batch) > 1:
+                    logger.info("batch_field_extraction_fallback", missing_count=len(missing), batch_size=len(batch))
+                for i in missing:
+                    try:
+                        results[i] = self._chat(
+                            self._build_prompt(messages[i], requested_field_types, domain), trace_id=trace_id, max_tokens=max_tokens
+                        )
+                    except Exception as e:
+                        logger.warning("batch_message_extraction_failed", msg_idx=i, error=str(e))
+                        results[i] = json.dumps({"error": f"Field extraction failed: {e}"})
+                        continue
+                    self._store(keys[i], results[i], domain)
+        
+        return results
+    
+    def _execute_impl(self, args: Dict[str, Any], trace_id: Optional[str] = None) -> str:
+        """Extract fields from a message or a batch of messages."""
+        message = args.get("message")
+        message_batch = args.get("message_batch")
+        domain = args.get("domain", "general")
+        
+        try:
+            if message_batch:
+                extractions = self.extract_fields_batch(
+                    [str(m) for m in message_batch], args.get("field_types"), domain, trace_id, args.get("max_tokens")
+                )
+                results = []
+                for index, extraction in enumerate(extractions):
+                    try:
+                        results.append({"index": index, "extraction": json.loads(extraction)})
+                    except json.JSONDecodeError:
+                        results.append({"index": index, "extraction": extraction})
+                return json.dumps({"results": results}, indent=2)
+            
+            if message is None:
+                return "Error: Either 'message' or 'message_batch' is required."
+            
+            requested_field_types = self._resolve_field_types(args.get("field_types"))
+            return self._extract_one(message, requested_field_types, domain, trace_id, args.get("max_tokens"))
         except Exception as e:
-            log.error("field_extraction_failed", error=str(e), domain=domain)
+            logger.error("field_extraction_failed", error=str(e), domain=domain)
+            raise ToolExecutionError(f"Field extraction failed: {e}", "extract_fields") from e
+    
+    async def _aexecute_impl(self, args: Dict[str, Any], trace_id: Optional[str] = None) -> str:
+        """Extract fields from a single message using the async client."""
+        message = args.get("message")
+        if self.async_llm is None or args.get("message_batch") or message is None:
+            return await super()._aexecute_impl(args, trace_id)
+        
+        if not message.strip():
+            return _EMPTY_EXTRACTION
+        
+        domain = args.get("domain", "general")
+        requested_field_types = self._resolve_field_types(args.get("field_types"))
+        key = self._cache_key(message, requested_field_types, domain)
+        cached = self._cached(key)
+        if cached is not None:
+            return cached
+        prompt = self._build_prompt(message, requested_field_types, domain)
+        
+        try:
+            content = await self._achat(prompt, trace_id=trace_id, max_tokens=args.get("max_tokens"))
+            self._store(key, content, domain)
+            return content
+        except Exception as e:
+            logger.error("field_extraction_failed", error=str(e), domain=domain)
             raise ToolExecutionError(f"Field extraction failed: {e}", "extract_fields") from e
 
 
-class FieldValidatorTool(BaseTool):
+class FieldValidatorTool(ExtractedFieldValidatorTool):
     """Tool for validating extracted fields."""
     
+    __slots__ = ()
+    
     def __init__(self):
         super().__init__(
             name="validate_fields",
             description="Validate extracted fields for correctness and completeness",
-            parameter_schema={
-                "extracted_fields": {
-                    "type": "str",
-                    "required": True,
-                    "description": "JSON string of extracted fields"
-                }
-            }
+            categories=EXTRACTION_CATEGORIES
         )
-    
-    def _execute_impl(self, args: Dict[str, Any], trace_id: Optional[str] = None) -> str:
-        """Validate extracted fields."""
-        extracted_fields = args["extracted_fields"]
-        
-        try:
-            fields = json.loads(extracted_fields)
-            validation_results = []
-            field_count = 0
-            
-            # Validate all field types
-            field_categories = ["numeric_fields", "financial_fields", "temporal_fields", 
-                             "categorical_fields", "identifiers", "other_fields"]
-            
-            for category in field_categories:
-                if category in fields and isinstance(fields[category], list):
-                    for field in fields[category]:
-                        field_count += 1
-                        if isinstance(field, dict) and "name" in field and "value" in field:
-                            validation_results.append(f"Valid {category[:-1]}: {field.get('name')} = {field.get('value')}")
-                        else:
-                            validation_results.append(f"Invalid {category[:-1]}: missing name or value")
-            
-            return json.dumps({
-                "valid": field_count > 0,
-                "field_count": field_count,
-                "validation_results": validation_results,
-                "fields": fields
-            }, indent=2)
-        except json.JSONDecodeError as e:
-            return json.dumps({
-                "valid": False,
-                "error": f"Invalid JSON in extracted fields: {e}",
-                "raw_data": extracted_fields[:500]
-            }, indent=2)
 
+
+def create_field_extractor(config: Dict[str, Any], context: Dict[str, Any]) -> GenericFieldExtractorTool:
+    """Create a GenericFieldExtractorTool from tool config and shared factory context."""
+    llm_client = context.get("llm_client")
+    if not llm_client:
+        raise ConfigurationError("llm_client required for field_extractor")
+    field_types = config.get("field_types")
+    if isinstance(field_types, str):
+        field_types = [t.strip() for t in field_types.split(",")]
+    return GenericFieldExtractorTool(
+        llm=llm_client._client,
+        model_name=config.get("model", "llama3.2"),
+        field_types=field_types,
+        async_llm=context.get("async_llm_client"),
+        cache=ExtractionCache.from_config(config),
+        chat_options=config.get("chat_options")
+    )
+
+
+def create_field_validator(config: Dict[str, Any], context: Dict[str, Any]) -> FieldValidatorTool:
+    """Create a FieldValidatorTool for generic extraction output."""
+    return FieldValidatorTool()
@@ -3,69 +3,211 @@ Financial field extraction tools.
 """
 import re
 import json
-from typing import Dict, Any, Optional, List
-from ollama import Client
+from typing import Dict, Any, Optional, List, Tuple
+import numpy as np
+import pandas as pd
+from ollama import Client, AsyncClient
 from core.tool import BaseTool
-from utils.logger import get_logger
-from utils.exceptions import ToolExecutionError
+from tools._validator_core import ExtractedFieldValidatorTool
+from utils.logger import get_logger, trace_scope
+from utils.extraction_cache import ExtractionCache
+from utils.validate_numeric import check_numeric_values
+from utils.retry import chat_with_json_feedback, achat_with_json_feedback
+from utils.exceptions import ToolExecutionError, ConfigurationError
 
 logger = get_logger(__name__)
 
+_FIELD_LIST = {"type": "array", "items": {"type": "object"}}
 
-class MessageParserTool(BaseTool):
-    """Tool for parsing messages from database."""
-    
-    def __init__(self):
-        super().__init__(
-            name="parse_messages",
-            description="Parse messages from database results",
-            parameter_schema={
-                "message_data": {
-                    "type": "str",
-                    "required": True,
-                    "description": "Message data from database"
-                }
+# JSON schema of a financial extraction, used to ask the model to self-correct
+FINANCIAL_EXTRACTION_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "amounts": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "required": ["value"],
+                "properties": {"value": {"type": "number"}}
             }
-        )
-    
-    def _execute_impl(self, args: Dict[str, Any], trace_id: Optional[str] = None) -> str:
-        """Parse message data."""
-        message_data = args["message_data"]
-        # Simple parsing - can be enhanced
-        return message_data
+        },
+        "dates": _FIELD_LIST,
+        "account_numbers": _FIELD_LIST,
+        "transaction_ids": _FIELD_LIST,
+        "other_numeric_fields": _FIELD_LIST,
+        "extraction_summary": {"type": "object"}
+    }
+}
 
+# Ollama options for extraction calls: deterministic output with bounded
+# generation and context windows. JSON output is enforced separately, by
+# passing FINANCIAL_EXTRACTION_SCHEMA as chat(format=...)
+DEFAULT_CHAT_OPTIONS = {"temperature": 0, "num_predict": 1024, "num_ctx": 4096}
 
-class FinancialExtractorTool(BaseTool):
-    """Tool for extracting financial numeric fields from messages using LLM."""
+
+# Deterministic pre-pass patterns, compiled once at import time
+_CURRENCY_SYMBOLS = {"$": "USD", "€": "EUR", "£": "GBP", "¥": "JPY"}
+_AMOUNT = r"\d{1,3}(?:,\d{3})+(?:\.\d+)?|\d+(?:\.\d+)?"
+_CURRENCY_CODES = r"USD|EUR|GBP|JPY|CHF|CAD|AUD"
+_MONEY_RE = re.compile(
+    rf"(?P<symbol>[$€£¥])\s?(?P<symbol_amount>{_AMOUNT})"
+    rf"|\b(?P<prefix_code>{_CURRENCY_CODES})\s?(?P<prefix_amount>{_AMOUNT})"
+    rf"|(?<![\w.,])(?P<suffix_amount>{_AMOUNT})\s?(?P<suffix_code>{_CURRENCY_CODES})\b"
+)
+_DATE_RE = re.compile(
+    r"\b\d{4}-(?:0[1-9]|1[0-2])-(?:0[1-9]|[12]\d|3[01])"
+    r"(?:[T ](?:[01]\d|2[0-3]):[0-5]\d(?::[0-5]\d(?:\.\d+)?)?(?:Z|[+-]\d{2}:?\d{2})?)?(?![\d:])"
+)
+_IBAN_RE = re.compile(r"\b[A-Z]{2}\d{2}(?: ?[A-Z0-9]{4}){2,7}(?: ?[A-Z0-9]{1,3})?\b")
+_UUID_RE = re.compile(r"\b[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}\b")
+_DIGITS_RE = re.compile(r"\d+")
+_CONTEXT_CHARS = 30
+
+
+def _context(message: str, start: int, end: int) -> str:
+    """Return the text surrounding a match."""
+    return message[max(0, start - _CONTEXT_CHARS):end + _CONTEXT_CHARS].strip()
+
+
+def _is_iban(candidate: str) -> bool:
+    """Check the ISO 13616 mod-97 checksum of an IBAN candidate."""
+    compact = candidate.replace(" ", "")
+    rearranged = compact[4:] + compact[:4]
+    digits = "".join(str(int(ch, 36)) for ch in rearranged)
+    return int(digits) % 97 == 1
+
+
+def _regex_prepass(message: str) -> Tuple[Dict[str, List[Dict[str, Any]]], bool]:
+    """
+    Extract obvious financial fields with precompiled patterns.
     
-    def __init__(self, llm: Client, model_name: str):
-        """
-        Initialize financial extractor.
+    Args:
+        message: Message text
         
-        Args:
-            llm: Ollama client
-            model_name: Model name for extraction
-        """
-        self.llm = llm
-        self.model_name = model_name
-        super().__init__(
-            name="extract_financial_fields",
-            description="Extract financial numeric fields (amounts, currencies, dates) from messages",
-            parameter_schema={
-                "message": {
-                    "type": "str",
-                    "required": True,
-                    "description": "Message text to extract from"
-                }
-            }
-        )
+    Returns:
+        (hits, complete) where hits uses the extraction output keys and
+        complete is True when every digit in the message is explained by a hit
+    """
+    hits: Dict[str, List[Dict[str, Any]]] = {}
+    spans: List[Tuple[int, int]] = []
     
-    def _execute_impl(self, args: Dict[str, Any], trace_id: Optional[str] = None) -> str:
-        """Extract financial fields from message."""
-        log = logger.bind(trace_id=trace_id)
-        message = args["message"]
+    for match in _MONEY_RE.finditer(message):
+        amount = match.group("symbol_amount") or match.group("prefix_amount") or match.group("suffix_amount")
+        currency = _CURRENCY_SYMBOLS.get(match.group("symbol")) or match.group("prefix_code") or match.group("suffix_code")
+        hits.setdefault("amounts", []).append({
+            "value": float(amount.replace(",", "")),
+            "currency": currency,
+            "context": _context(message, match.start(), match.end()),
+            "type": "amount"
+        })
+        spans.append(match.span())
+    
+    for match in _DATE_RE.finditer(message):
+        hits.setdefault("dates", []).append({
+            "value": match.group(),
+            "type": "date",
+            "context": _context(message, match.start(), match.end())
+        })
+        spans.append(match.span())
+    
+    for match in _IBAN_RE.finditer(message):
+        if _is_iban(match.group()):
+            hits.setdefault("account_numbers", []).append({
+                "value": match.group().replace(" ", ""),
+                "type": "iban",
+                "context": _context(message, match.start(), match.end())
+            })
+            spans.append(match.span())
+    
+    for match in _UUID_RE.finditer(message):
+        hits.setdefault("transaction_ids", []).append({
+            "value": match.group(),
+            "type": "uuid",
+            "context": _context(message, match.start(), match.end())
+        })
+        spans.append(match.span())
+    
+    complete = bool(spans) and all(
+        any(start <= run.start() and run.end() <= end for start, end in spans)
+        for run in _DIGITS_RE.finditer(message)
+    )
+    return hits, complete
+
+
+def _bulk_amounts(messages: List[str]) -> pd.DataFrame:
+    """
+    Match currency amounts across many messages in one vectorized pass.
+    
+    Args:
+        messages: Message texts
         
-        prompt = f"""# Role
+    Returns:
+        DataFrame with one row per match and columns msg_idx, amount, currency
+    """
+    matches = pd.Series(messages, dtype=object).str.extractall(_MONEY_RE)
+    amount = matches["symbol_amount"].fillna(matches["prefix_amount"]).fillna(matches["suffix_amount"])
+    currency = matches["symbol"].map(_CURRENCY_SYMBOLS).fillna(matches["prefix_code"]).fillna(matches["suffix_code"])
+    return pd.DataFrame({
+        "msg_idx": matches.index.get_level_values(0).to_numpy(dtype=np.int64),
+        "amount": amount.str.replace(",", "", regex=False).to_numpy(dtype=np.float64),
+        "currency": currency.to_numpy(dtype=object)
+    })
+
+
+def _validate_amounts(fields: Any, categories: Tuple[str, ...]) -> Tuple[int, List[str]]:
+    """
+    Check that every entry of every category list has a finite, in-range numeric value.
+    
+    Types are checked in Python; range/NaN checks run in one vectorized pass.
+    
+    Returns:
+        (field_count, validation_results)
+    """
+    if not isinstance(fields, dict):
+        return 0, []
+    entries = [
+        (category[:-1], entry)
+        for category in categories
+        if isinstance(fields.get(category), list)
+        for entry in fields[category]
+    ]
+    is_number = [
+        isinstance(entry, dict) and isinstance(entry.get("value"), (int, float))
+        for _, entry in entries
+    ]
+    values = np.fromiter(
+        (entry["value"] for (_, entry), ok in zip(entries, is_number) if ok),
+        dtype=np.float64,
+        count=sum(is_number)
+    )
+    in_range = iter(check_numeric_values(values))
+    results = [
+        f"Valid {label}: {entry}" if ok and next(in_range) else f"Invalid {label}: {entry}"
+        for (label, entry), ok in zip(entries, is_number)
+    ]
+    return len(results), results
+
+
+def _regex_extraction(hits: Dict[str, List[Dict[str, Any]]]) -> str:
+    """Render pre-pass hits in the extraction output format."""
+    return json.dumps({
+        "amounts": hits.get("amounts", []),
+        "dates": hits.get("dates", []),
+        "account_numbers": hits.get("account_numbers", []),
+        "transaction_ids": hits.get("transaction_ids", []),
+        "other_numeric_fields": [],
+        "extraction_summary": {
+            "total_fields_extracted": sum(len(v) for v in hits.values()),
+            "has_currency_info": any(a["currency"] for a in hits.get("amounts", [])),
+            "has_temporal_info": bool(hits.get("dates")),
+            "confidence": "high"
+        }
+    }, indent=2)
+
+
+# Static part of the extraction prompt; per-call data is appended after it so
+# KV-cache-aware backends can reuse the shared prefix
+FINANCIAL_PROMPT_PREFIX = """# Role
 You are a financial data extraction expert specializing in identifying and extracting financial information from unstructured text, with expertise in accounting, finance, banking, and trading systems.
 
 # Your Task
@@ -115,109 +257,361 @@ Extract the following types of financial data:
 # Output Format
 
 Return a comprehensive JSON object:
-{{
+{
     "amounts": [
-        {{
+        {
             "value": 1234.56,
             "currency": "USD|EUR|etc_or_null",
             "context": "description of where this amount appears in the message",
             "type": "payment|price|fee|refund|etc"
-        }}
+        }
     ],
     "dates": [
-        {{
+        {
             "value": "2024-01-15",
             "type": "transaction_date|due_date|settlement_date|etc",
             "context": "description of the date's significance"
-        }}
+        }
     ],
     "account_numbers": [
-        {{
+        {
             "value": "account_number_or_id",
             "type": "bank_account|credit_card|account_id|etc",
             "context": "description of the account"
-        }}
+        }
     ],
     "transaction_ids": [
-        {{
+        {
             "value": "transaction_id",
             "type": "transaction_ref|order_id|invoice_number|etc",
             "context": "description of the transaction"
-        }}
+        }
     ],
     "other_numeric_fields": [
-        {{
+        {
             "name": "descriptive_name",
             "value": 123.45,
             "type": "percentage|rate|ratio|price|volume|etc",
             "unit": "unit_if_applicable",
             "context": "description of the field"
-        }}
+        }
     ],
-    "extraction_summary": {{
+    "extraction_summary": {
         "total_fields_extracted": number,
         "has_currency_info": boolean,
         "has_temporal_info": boolean,
         "confidence": "high|medium|low"
-    }}
-}}
+    }
+}
 
-# Input Message
+"""
 
-{message}
+FINANCIAL_PROMPT_SUFFIX = """
 
 # Your Extraction (JSON only, no other text):
 """
-        
-        try:
-            response = self.llm.chat(
-                model=self.model_name,
-                messages=[{'role': 'user', 'content': prompt}],
-                options={"format": "json"}
-            )
-            return response['message']['content']
-        except Exception as e:
-            log.error("financial_extraction_failed", error=str(e))
-            raise ToolExecutionError(f"Financial extraction failed: {e}", "extract_financial_fields") from e
 
 
-class FieldValidatorTool(BaseTool):
-    """Tool for validating extracted financial fields."""
+class MessageParserTool(BaseTool):
+    """Tool for parsing messages from database."""
+    
+    __slots__ = ()
     
     def __init__(self):
         super().__init__(
-            name="validate_financial_fields",
-            description="Validate extracted financial fields",
+            name="parse_messages",
+            description="Parse messages from database results",
             parameter_schema={
-                "extracted_fields": {
+                "message_data": {
                     "type": "str",
                     "required": True,
-                    "description": "JSON string of extracted fields"
+                    "description": "Message data from database"
                 }
             }
         )
     
     def _execute_impl(self, args: Dict[str, Any], trace_id: Optional[str] = None) -> str:
-        """Validate extracted fields."""
-        extracted_fields = args["extracted_fields"]
+        """Parse message data."""
+        message_data = args["message_data"]
+        # Simple parsing - can be enhanced
+        return message_data
+
+
+class FinancialExtractorTool(BaseTool):
+    """Tool for extracting financial numeric fields from messages using LLM."""
+    
+    __slots__ = (
+        "llm",
+        "async_llm",
+        "model_name",
+        "cache",
+        "max_format_retries",
+        "retry_backoff",
+        "regex_fast_path",
+        "_chat_options",
+    )
+    
+    # Bump whenever the prompt changes so cached extractions are not reused
+    PROMPT_VERSION = "1"
+    
+    def __init__(
+        self,
+        llm: Client,
+        model_name: str,
+        async_llm: Optional[AsyncClient] = None,
+        cache: Optional[ExtractionCache] = None,
+        max_format_retries: int = 2,
+        retry_backoff: float = 1.0,
+        regex_fast_path: bool = True,
+        chat_options: Optional[Dict[str, Any]] = None
+    ):
+        """
+        Initialize financial extractor.
+        
+        Args:
+            llm: Ollama client
+            model_name: Model name for extraction
+            async_llm: Optional async Ollama client used by aexecute
+            cache: Optional extraction cache for repeated messages
+            max_format_retries: Correction rounds when the model returns malformed JSON
+            retry_backoff: Linear backoff in seconds between correction rounds
+            regex_fast_path: Answer fully pattern-matchable messages without the LLM
+                and pass partial matches to the LLM as hints
+            chat_options: Ollama options merged over DEFAULT_CHAT_OPTIONS
+        """
+        self.llm = llm
+        self.async_llm = async_llm
+        self.model_name = model_name
+        self.cache = cache
+        self.max_format_retries = max_format_retries
+        self.retry_backoff = retry_backoff
+        self.regex_fast_path = regex_fast_path
+        self._chat_options = {**DEFAULT_CHAT_OPTIONS, **(chat_options or {})}
+        super().__init__(
+            name="extract_financial_fields",
+            description="Extract financial numeric fields (amounts, currencies, dates) from messages",
+            parameter_schema={
+                "message": {
+                    "type": "str",
+                    "required": True,
+                    "description": "Message text to extract from"
+                },
+                "max_tokens": {
+                    "type": "int",
+                    "required": False,
+                    "description": "Maximum tokens to generate (overrides the configured num_predict)"
+                }
+            }
+        )
+    
+    def _build_prompt(self, message: str, hints: Optional[Dict[str, List[Dict[str, Any]]]] = None) -> str:
+        """Build the financial extraction prompt, optionally with pre-pass hints."""
+        hints_section = ""
+        if hints:
+            hints_section = f"""# Hints Already Detected
+
+Pattern matching already found these fields. Include them in your output and focus on anything they miss:
+{json.dumps(hints)}
+
+"""
+        return FINANCIAL_PROMPT_PREFIX + hints_section + "# Input Message\n\n" + message + FINANCIAL_PROMPT_SUFFIX
+    
+    def _options(self, max_tokens: Optional[int] = None) -> Dict[str, Any]:
+        """Return the chat options, with num_predict overridden when max_tokens is set."""
+        if max_tokens is None:
+            return self._chat_options
+        return {**self._chat_options, "num_predict": max_tokens}
+    
+    def _cache_key(self, message: str) -> Optional[str]:
+        """Return the extraction cache key for a message, or None if caching is off."""
+        if self.cache is None:
+            return None
+        return ExtractionCache.make_key("ollama", self.model_name, self.PROMPT_VERSION, message)
+    
+    def _store(self, key: Optional[str], content: str):
+        """Write an extraction back to the cache."""
+        if key is not None:
+            self.cache.put(key, content, {"model": self.model_name, "prompt_version": self.PROMPT_VERSION})
+    
+    def _prepare(self, message: str) -> Tuple[Optional[str], Optional[str], Optional[str]]:
+        """
+        Resolve a message without the LLM where possible.
+        
+        Returns:
+            (immediate_result, cache_key, prompt); immediate_result is set when
+            the message is blank or the regex pre-pass or the cache already answers it
+        """
+        if not message.strip():
+            return _regex_extraction({}), None, None
+        
+        hints: Dict[str, List[Dict[str, Any]]] = {}
+        if self.regex_fast_path:
+            hints, complete = _regex_prepass(message)
+            if complete:
+                logger.debug("financial_regex_fast_path", fields=sum(len(v) for v in hints.values()))
+                return _regex_extraction(hints), None, None
+        
+        key = self._cache_key(message)
+        if key is not None:
+            cached = self.cache.get(key)
+            if cached is not None:
+                logger.debug("extraction_cache_hit", tool="extract_financial_fields")
+                return cached, key, None
+        
+        return None, key, self._build_prompt(message, hints)
+    
+    def _execute_impl(self, args: Dict[str, Any], trace_id: Optional[str] = None) -> str:
+        """Extract financial fields from message."""
+        immediate, key, prompt = self._prepare(args["message"])
+        if immediate is not None:
+            return immediate
+        options = self._options(args.get("max_tokens"))
+        
+        def send(messages: List[Dict[str, str]]) -> str:
+            response = self.llm.chat(
+                model=self.model_name,
+                messages=messages,
+                options=options,
+                format=FINANCIAL_EXTRACTION_SCHEMA
+            )
+            return response['message']['content']
         
         try:
-            fields = json.loads(extracted_fields)
-            validation_results = []
+            content = chat_with_json_feedback(
+                send,
+                [{'role': 'user', 'content': prompt}],
+                FINANCIAL_EXTRACTION_SCHEMA,
+                self.max_format_retries,
+                self.retry_backoff,
+                trace_id
+            )
+            self._store(key, content)
+            return content
+        except Exception as e:
+            logger.error("financial_extraction_failed", error=str(e))
+            raise ToolExecutionError(f"Financial extraction failed: {e}", "extract_financial_fields") from e
+    
+    def extract_financial_fields_bulk(self, messages: List[str], trace_id: Optional[str] = None) -> pd.DataFrame:
+        """
+        Extract currency amounts from many messages as columns.
+        
+        Amounts are pattern-matched across all messages at once; only messages
+        with no match are sent through execute, one at a time. A message whose
+        extraction fails is logged and contributes no rows.
+        
+        Args:
+            messages: Message texts
+            trace_id: Optional trace ID for logging
             
-            # Validate amounts
-            if "amounts" in fields:
-                for amount in fields["amounts"]:
-                    if "value" in amount and isinstance(amount["value"], (int, float)):
-                        validation_results.append(f"Valid amount: {amount}")
-                    else:
-                        validation_results.append(f"Invalid amount: {amount}")
+        Returns:
+            DataFrame with columns msg_idx, amount, currency, ordered by msg_idx
+        """
+        with trace_scope(trace_id):
+            frame = _bulk_amounts(messages)
+            matched = set(frame["msg_idx"].tolist())
+            fallback = [i for i in range(len(messages)) if i not in matched]
+            logger.info("financial_bulk_extraction", message_count=len(messages), llm_fallback_count=len(fallback))
             
-            return json.dumps({
-                "valid": len(validation_results) > 0,
-                "validation_results": validation_results,
-                "fields": fields
-            }, indent=2)
-        except json.JSONDecodeError as e:
-            return f"Error: Invalid JSON in extracted fields: {e}"
+            msg_idx: List[int] = []
+            amounts: List[float] = []
+            currencies: List[Optional[str]] = []
+            for i in fallback:
+                # execute validates the arguments and reports failures as text instead of raising
+                extraction = self.execute({"message": messages[i]}, trace_id)
+                try:
+                    entries = json.loads(extraction).get("amounts", [])
+                except (ValueError, AttributeError) as e:
+                    logger.warning(
+                        "financial_bulk_extraction_failed",
+                        msg_idx=i,
+                        error=str(e),
+                        result_preview=extraction[:200]
+                    )
+                    continue
+                for entry in entries if isinstance(entries, list) else []:
+                    if isinstance(entry, dict) and isinstance(entry.get("value"), (int, float)):
+                        msg_idx.append(i)
+                        amounts.append(float(entry["value"]))
+                        currencies.append(entry.get("currency"))
+        
+        if msg_idx:
+            frame = pd.concat([frame, pd.DataFrame({
+                "msg_idx": np.array(msg_idx, dtype=np.int64),
+                "amount": np.array(amounts, dtype=np.float64),
+                "currency": np.array(currencies, dtype=object)
+            })], ignore_index=True)
+            frame = frame.sort_values("msg_idx", kind="stable", ignore_index=True)
+        return frame
+    
+    async def _aexecute_impl(self, args: Dict[str, Any], trace_id: Optional[str] = None) -> str:
+        """Extract financial fields from message using the async client."""
+        if self.async_llm is None:
+            return await super()._aexecute_impl(args, trace_id)
+        
+        immediate, key, prompt = self._prepare(args["message"])
+        if immediate is not None:
+            return immediate
+        options = self._options(args.get("max_tokens"))
+        
+        async def send(messages: List[Dict[str, str]]) -> str:
+            response = await self.async_llm.chat(
+                model=self.model_name,
+                messages=messages,
+                options=options,
+                format=FINANCIAL_EXTRACTION_SCHEMA
+            )
+            return response['message']['content']
+        
+        try:
+            content = await achat_with_json_feedback(
+                send,
+                [{'role': 'user', 'content': prompt}],
+                FINANCIAL_EXTRACTION_SCHEMA,
+                self.max_format_retries,
+                self.retry_backoff,
+                trace_id
+            )
+            self._store(key, content)
+            return content
+        except Exception as e:
+            logger.error("financial_extraction_failed", error=str(e))
+            raise ToolExecutionError(f"Financial extraction failed: {e}", "extract_financial_fields") from e
+
+
+class FieldValidatorTool(ExtractedFieldValidatorTool):
+    """Tool for validating extracted financial fields."""
+    
+    __slots__ = ()
+    
+    def __init__(self):
+        super().__init__(
+            name="validate_financial_fields",
+            description="Validate extracted financial fields",
+            categories=("amounts",),
+            check=_validate_amounts
+        )
+
+
+def create_financial_extractor(config: Dict[str, Any], context: Dict[str, Any]) -> FinancialExtractorTool:
+    """Create a FinancialExtractorTool from tool config and shared factory context."""
+    llm_client = context.get("llm_client")
+    if not llm_client:
+        raise ConfigurationError("llm_client required for financial_extractor")
+    return FinancialExtractorTool(
+        llm=llm_client._client,
+        model_name=config.get("model", "llama3.2"),
+        async_llm=context.get("async_llm_client"),
+        cache=ExtractionCache.from_config(config),
+        regex_fast_path=config.get("regex_fast_path", True),
+        chat_options=config.get("chat_options")
+    )
+
+
+def create_financial_field_validator(config: Dict[str, Any], context: Dict[str, Any]) -> FieldValidatorTool:
+    """Create a FieldValidatorTool for financial extraction output."""
+    return FieldValidatorTool()
+
 
+def create_message_parser(config: Dict[str, Any], context: Dict[str, Any]) -> MessageParserTool:
+    """Create a MessageParserTool."""
+    return MessageParserTool()
@@ -1,19 +1,97 @@
 """
 Log analysis tools.
 """
+import re
 import json
-from typing import Dict, Any, Optional, List
-from ollama import Client
+from functools import lru_cache
+from typing import Dict, Any, Optional, List, Iterator
+from ollama import Client, AsyncClient
 from core.tool import BaseTool
-from utils.logger import get_logger
-from utils.exceptions import ToolExecutionError
+from utils.logger import get_logger, trace_scope
+from utils.json_codec import loads as _loads, dumps as _dumps
+from utils.json_parser import iter_json_array_items
+from utils.extraction_cache import ExtractionCache
+from utils.exceptions import ToolExecutionError, ConfigurationError
 
 logger = get_logger(__name__)
 
+# Ollama options for pattern detection: deterministic output, room for a full
+# analysis, and a context window that fits DEFAULT_MAX_LOG_LINES of logs
+DEFAULT_CHAT_OPTIONS = {"temperature": 0, "num_predict": 2048, "num_ctx": 8192}
+
+# Default number of log lines sent to the LLM for pattern detection
+DEFAULT_MAX_LOG_LINES = 500
+
+_SEVERITY_RE = re.compile(r"\b(ERROR|CRIT(?:ICAL)?|FATAL|WARN(?:ING)?|INFO|DEBUG)\b", re.IGNORECASE)
+
+# Lower rank is kept first; lines without a recognized level rank between
+# WARN and INFO since they are often stack traces or unstructured anomalies
+_SEVERITY_RANK = {
+    "error": 0, "crit": 0, "critical": 0, "fatal": 0,
+    "warn": 1, "warning": 1,
+    "info": 3,
+    "debug": 4,
+}
+_UNKNOWN_SEVERITY_RANK = 2
+
+
+def _severity_rank(line: str) -> int:
+    """Rank a log line by the first severity level it mentions."""
+    match = _SEVERITY_RE.search(line)
+    if match is None:
+        return _UNKNOWN_SEVERITY_RANK
+    return _SEVERITY_RANK[match.group(1).lower()]
+
+
+def _trim(log_data: str, max_lines: int = DEFAULT_MAX_LOG_LINES) -> str:
+    """
+    Trim log data to at most max_lines lines, keeping the most severe ones.
+    
+    Lines are kept greedily from ERROR/FATAL down to DEBUG and emitted in
+    their original order, preceded by a note of how many were omitted.
+    A non-positive max_lines disables trimming.
+    
+    Args:
+        log_data: Raw log text
+        max_lines: Maximum number of log lines to keep
+        
+    Returns:
+        Trimmed log text (unchanged if already within the budget)
+    """
+    if max_lines <= 0:
+        return log_data
+    lines = log_data.splitlines()
+    if len(lines) <= max_lines:
+        return log_data
+    
+    ranks = [_severity_rank(line) for line in lines]
+    kept = sorted(sorted(range(len(lines)), key=ranks.__getitem__)[:max_lines])
+    omitted = len(lines) - max_lines
+    header = f"[{omitted} of {len(lines)} log lines omitted; lower-severity lines dropped first]"
+    return "\n".join([header] + [lines[i] for i in kept])
+
+
+def _parse_json_logs(log_data: str) -> Any:
+    """
+    Parse JSON log data, treating multi-line input of objects as NDJSON.
+    
+    Falls back to parsing the whole document when the lines are not
+    standalone objects (e.g. a pretty-printed JSON document).
+    """
+    text = log_data.strip()
+    if "\n" in text and text.startswith("{"):
+        try:
+            return [_loads(line) for line in text.splitlines() if line.strip()]
+        except json.JSONDecodeError:
+            pass
+    return _loads(text)
+
 
 class LogParserTool(BaseTool):
     """Tool for parsing log entries from various formats."""
     
+    __slots__ = ("log_format",)
+    
     def __init__(self, log_format: str = "json"):
         """
         Initialize log parser.
@@ -30,6 +108,12 @@ class LogParserTool(BaseTool):
                     "type": "str",
                     "required": True,
                     "description": "Raw log data to parse"
+                },
+                "pretty": {
+                    "type": "bool",
+                    "required": False,
+                    "default": False,
+                    "description": "Pretty-print JSON output with indentation"
                 }
             }
         )
@@ -40,13 +124,13 @@ class LogParserTool(BaseTool):
         
         try:
             if self.log_format == "json":
-                # Try to parse as JSON
-                parsed = json.loads(log_data)
-                return json.dumps(parsed, indent=2)
+                # Parse as JSON (or NDJSON) and re-emit compactly unless asked otherwise
+                parsed = _parse_json_logs(log_data)
+                return _dumps(parsed, indent=args.get("pretty", False))
             elif self.log_format == "csv":
-                # Parse CSV (simplified)
-                lines = log_data.split("\n")
-                return f"Parsed {len(lines)} log entries"
+                # Parse CSV (simplified); count lines without materializing them
+                entry_count = log_data.count("\n") + 1
+                return f"Parsed {entry_count} log entries"
             else:
                 # Text format - return as is
                 return log_data
@@ -54,44 +138,41 @@ class LogParserTool(BaseTool):
             return f"Error parsing logs: {e}"
 
 
-class PatternDetectorTool(BaseTool):
-    """Tool for detecting patterns in logs using LLM."""
-    
-    def __init__(self, llm: Client, model_name: str):
-        """
-        Initialize pattern detector.
-        
-        Args:
-            llm: Ollama client
-            model_name: Model name for pattern detection
-        """
-        self.llm = llm
-        self.model_name = model_name
-        super().__init__(
-            name="detect_patterns",
-            description="Detect patterns and anomalies in log data using LLM",
-            parameter_schema={
-                "log_data": {
-                    "type": "str",
-                    "required": True,
-                    "description": "Parsed log data"
-                },
-                "pattern_type": {
-                    "type": "str",
-                    "required": False,
-                    "default": "errors",
-                    "description": "Type of patterns to detect (errors, anomalies, trends)"
-                }
-            }
-        )
-    
-    def _execute_impl(self, args: Dict[str, Any], trace_id: Optional[str] = None) -> str:
-        """Detect patterns in logs."""
-        log = logger.bind(trace_id=trace_id)
-        log_data = args["log_data"]
-        pattern_type = args.get("pattern_type", "errors")
-        
-        prompt = f"""# Role
+# Log payloads that carry no entries, e.g. from an empty result set
+_EMPTY_LOG_PAYLOADS = ("", "[]", "{}", "null")
+
+
+def _is_empty_log_data(log_data: str) -> bool:
+    """Check whether log data has no entries to analyze."""
+    return log_data.strip() in _EMPTY_LOG_PAYLOADS
+
+
+def _empty_analysis(pattern_type: str) -> str:
+    """Return the canonical analysis for empty log data, without calling the LLM."""
+    return json.dumps({
+        "summary": {
+            "total_log_entries": 0,
+            "analysis_type": pattern_type,
+            "key_findings": "No log data provided",
+            "severity_assessment": "info"
+        },
+        "patterns": [],
+        "anomalies": [],
+        "recommendations": [],
+        "statistics": {
+            "error_count": 0,
+            "warning_count": 0,
+            "info_count": 0,
+            "unique_sources": 0,
+            "time_span": ""
+        }
+    })
+
+
+@lru_cache(maxsize=16)
+def _pattern_prompt_prefix(pattern_type: str) -> str:
+    """Build everything in the pattern detection prompt that precedes the log data."""
+    return f"""# Role
 You are an expert log analysis specialist with deep expertise in log parsing, pattern recognition, anomaly detection, and system diagnostics.
 
 # Your Task
@@ -168,26 +249,227 @@ Provide a comprehensive JSON analysis with this structure:
 
 # Log Data
 
-{log_data}
+"""
+
+
+_PATTERN_PROMPT_SUFFIX = """
 
 # Your Analysis (JSON only, no other text):
 """
+
+
+class PatternDetectorTool(BaseTool):
+    """Tool for detecting patterns in logs using LLM."""
+    
+    __slots__ = ("llm", "async_llm", "model_name", "cache", "_chat_options")
+    
+    # Bump whenever the prompt changes so cached analyses are not reused
+    PROMPT_VERSION = "1"
+    
+    def __init__(
+        self,
+        llm: Client,
+        model_name: str,
+        async_llm: Optional[AsyncClient] = None,
+        cache: Optional[ExtractionCache] = None,
+        chat_options: Optional[Dict[str, Any]] = None
+    ):
+        """
+        Initialize pattern detector.
+        
+        Args:
+            llm: Ollama client
+            model_name: Model name for pattern detection
+            async_llm: Optional async Ollama client used by aexecute
+            cache: Optional extraction cache for repeated log data
+            chat_options: Ollama options merged over DEFAULT_CHAT_OPTIONS
+        """
+        self.llm = llm
+        self.async_llm = async_llm
+        self.model_name = model_name
+        self.cache = cache
+        self._chat_options = {**DEFAULT_CHAT_OPTIONS, **(chat_options or {})}
+        super().__init__(
+            name="detect_patterns",
+            description="Detect patterns and anomalies in log data using LLM",
+            parameter_schema={
+                "log_data": {
+                    "type": "str",
+                    "required": True,
+                    "description": "Parsed log data"
+                },
+                "pattern_type": {
+                    "type": "str",
+                    "required": False,
+                    "default": "errors",
+                    "description": "Type of patterns to detect (errors, anomalies, trends)"
+                },
+                "max_log_lines": {
+                    "type": "int",
+                    "required": False,
+                    "default": DEFAULT_MAX_LOG_LINES,
+                    "description": "Maximum log lines sent to the LLM, keeping the most severe (0 disables trimming)"
+                },
+                "max_tokens": {
+                    "type": "int",
+                    "required": False,
+                    "description": "Maximum tokens to generate (overrides the configured num_predict)"
+                }
+            }
+        )
+    
+    def _build_prompt(self, log_data: str, pattern_type: str) -> str:
+        """Build the pattern detection prompt."""
+        return _pattern_prompt_prefix(pattern_type) + log_data + _PATTERN_PROMPT_SUFFIX
+    
+    def _options(self, max_tokens: Optional[int] = None) -> Dict[str, Any]:
+        """Return the chat options, with num_predict overridden when max_tokens is set."""
+        if max_tokens is None:
+            return self._chat_options
+        return {**self._chat_options, "num_predict": max_tokens}
+    
+    def _cache_key(self, log_data: str, pattern_type: str) -> Optional[str]:
+        """Return the extraction cache key for an analysis, or None if caching is off."""
+        if self.cache is None:
+            return None
+        return ExtractionCache.make_key("ollama", self.model_name, self.PROMPT_VERSION, log_data, pattern_type)
+    
+    def _store(self, key: Optional[str], content: str):
+        """Write an analysis back to the cache."""
+        if key is not None:
+            self.cache.put(key, content, {"model": self.model_name, "prompt_version": self.PROMPT_VERSION})
+    
+    def _execute_impl(self, args: Dict[str, Any], trace_id: Optional[str] = None) -> str:
+        """Detect patterns in logs."""
+        log_data = _trim(args["log_data"], args.get("max_log_lines", DEFAULT_MAX_LOG_LINES))
+        pattern_type = args.get("pattern_type", "errors")
+        if _is_empty_log_data(log_data):
+            return _empty_analysis(pattern_type)
+        key = self._cache_key(log_data, pattern_type)
+        if key is not None:
+            cached = self.cache.get(key)
+            if cached is not None:
+                logger.debug("extraction_cache_hit", tool="detect_patterns")
+                return cached
+        
+        prompt = self._build_prompt(log_data, pattern_type)
         
         try:
             response = self.llm.chat(
                 model=self.model_name,
-                messages=[{'role': 'user', 'content': prompt}]
+                messages=[{'role': 'user', 'content': prompt}],
+                options=self._options(args.get("max_tokens"))
+            )
+            content = response['message']['content']
+            self._store(key, content)
+            return content
+        except Exception as e:
+            logger.error("pattern_detection_failed", error=str(e))
+            raise ToolExecutionError(f"Pattern detection failed: {e}", "detect_patterns") from e
+    
+    def stream(self, args: Dict[str, Any], trace_id: Optional[str] = None) -> Iterator[str]:
+        """
+        Detect patterns in logs, yielding response content as the model produces it.
+        
+        Args:
+            args: Tool arguments (same as execute)
+            trace_id: Optional trace ID for logging
+            
+        Returns:
+            Iterator over content chunks; joined, they equal the execute result
+        """
+        is_valid, error_msg = self._validate_args(args)
+        if not is_valid:
+            raise ToolExecutionError(error_msg, "detect_patterns")
+        
+        log_data = _trim(args["log_data"], args.get("max_log_lines", DEFAULT_MAX_LOG_LINES))
+        pattern_type = args.get("pattern_type", "errors")
+        if _is_empty_log_data(log_data):
+            yield _empty_analysis(pattern_type)
+            return
+        key = self._cache_key(log_data, pattern_type)
+        if key is not None:
+            cached = self.cache.get(key)
+            if cached is not None:
+                # Scoped per call so the trace binding never stays open across a yield
+                with trace_scope(trace_id):
+                    logger.debug("extraction_cache_hit", tool="detect_patterns")
+                yield cached
+                return
+        
+        prompt = self._build_prompt(log_data, pattern_type)
+        chunks = []
+        try:
+            for chunk in self.llm.chat(
+                model=self.model_name,
+                messages=[{'role': 'user', 'content': prompt}],
+                options=self._options(args.get("max_tokens")),
+                stream=True
+            ):
+                content = chunk['message']['content']
+                chunks.append(content)
+                yield content
+        except Exception as e:
+            with trace_scope(trace_id):
+                logger.error("pattern_detection_failed", error=str(e))
+            raise ToolExecutionError(f"Pattern detection failed: {e}", "detect_patterns") from e
+        
+        self._store(key, "".join(chunks))
+    
+    def stream_patterns(self, args: Dict[str, Any], trace_id: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+        """Yield each entry of the "patterns" array as soon as the model has emitted it."""
+        chunks = self.stream(args, trace_id)
+        yield from iter_json_array_items(chunks, "patterns")
+        # Finish the response so the complete analysis is cached
+        for _ in chunks:
+            pass
+    
+    async def _aexecute_impl(self, args: Dict[str, Any], trace_id: Optional[str] = None) -> str:
+        """Detect patterns in logs using the async client."""
+        if self.async_llm is None:
+            return await super()._aexecute_impl(args, trace_id)
+        
+        log_data = _trim(args["log_data"], args.get("max_log_lines", DEFAULT_MAX_LOG_LINES))
+        pattern_type = args.get("pattern_type", "errors")
+        if _is_empty_log_data(log_data):
+            return _empty_analysis(pattern_type)
+        key = self._cache_key(log_data, pattern_type)
+        if key is not None:
+            cached = self.cache.get(key)
+            if cached is not None:
+                logger.debug("extraction_cache_hit", tool="detect_patterns")
+                return cached
+        
+        prompt = self._build_prompt(log_data, pattern_type)
+        
+        try:
+            response = await self.async_llm.chat(
+                model=self.model_name,
+                messages=[{'role': 'user', 'content': prompt}],
+                options=self._options(args.get("max_tokens"))
             )
-            return response['message']['content']
+            content = response['message']['content']
+            self._store(key, content)
+            return content
         except Exception as e:
-            log.error("pattern_detection_failed", error=str(e))
+            logger.error("pattern_detection_failed", error=str(e))
             raise ToolExecutionError(f"Pattern detection failed: {e}", "detect_patterns") from e
 
 
 class LogAnalyzerTool(BaseTool):
     """Combined log analysis tool."""
     
-    def __init__(self, llm: Client, model_name: str, log_format: str = "json"):
+    __slots__ = ("llm", "async_llm", "model_name", "log_format", "cache", "_detector")
+    
+    def __init__(
+        self,
+        llm: Client,
+        model_name: str,
+        log_format: str = "json",
+        async_llm: Optional[AsyncClient] = None,
+        cache: Optional[ExtractionCache] = None,
+        chat_options: Optional[Dict[str, Any]] = None
+    ):
         """
         Initialize log analyzer.
         
@@ -195,10 +477,16 @@ class LogAnalyzerTool(BaseTool):
             llm: Ollama client
             model_name: Model name
             log_format: Log format
+            async_llm: Optional async Ollama client used by aexecute
+            cache: Optional extraction cache for repeated log data
+            chat_options: Ollama options for pattern detection
         """
         self.llm = llm
+        self.async_llm = async_llm
         self.model_name = model_name
         self.log_format = log_format
+        self.cache = cache
+        self._detector = PatternDetectorTool(llm, model_name, async_llm, cache, chat_options)
         super().__init__(
             name="analyze_logs",
             description="Analyze logs from database and identify patterns, errors, and anomalies",
@@ -213,26 +501,74 @@ class LogAnalyzerTool(BaseTool):
                     "required": False,
                     "default": "comprehensive",
                     "description": "Type of analysis (comprehensive, errors, anomalies, trends)"
+                },
+                "max_log_lines": {
+                    "type": "int",
+                    "required": False,
+                    "default": DEFAULT_MAX_LOG_LINES,
+                    "description": "Maximum log lines sent to the LLM, keeping the most severe (0 disables trimming)"
+                },
+                "max_tokens": {
+                    "type": "int",
+                    "required": False,
+                    "description": "Maximum tokens to generate (overrides the configured num_predict)"
                 }
             }
         )
     
+    def _compact_log_data(self, log_data: str, trace_id: Optional[str] = None) -> str:
+        """
+        Compact JSON logs before they reach the LLM.
+        
+        A list of entries is emitted one compact entry per line, so the
+        max_log_lines budget applied by the detector trims whole entries.
+        Other formats, and JSON that fails to parse, are passed through unchanged.
+        """
+        if self.log_format != "json":
+            return log_data
+        try:
+            parsed = _parse_json_logs(log_data)
+        except json.JSONDecodeError as e:
+            logger.debug("log_data_not_json", error=str(e))
+            return log_data
+        if isinstance(parsed, list):
+            return "\n".join(_dumps(entry) for entry in parsed)
+        return _dumps(parsed)
+    
+    def _detector_args(self, args: Dict[str, Any], trace_id: Optional[str] = None) -> Dict[str, Any]:
+        """Map analyze_logs arguments onto detect_patterns arguments."""
+        detector_args = {
+            "log_data": self._compact_log_data(args["log_data"], trace_id),
+            "pattern_type": args.get("analysis_type", "comprehensive"),
+            "max_log_lines": args.get("max_log_lines", DEFAULT_MAX_LOG_LINES)
+        }
+        if args.get("max_tokens") is not None:
+            detector_args["max_tokens"] = args["max_tokens"]
+        return detector_args
+    
     def _execute_impl(self, args: Dict[str, Any], trace_id: Optional[str] = None) -> str:
         """Analyze logs."""
-        log = logger.bind(trace_id=trace_id)
-        log_data = args["log_data"]
-        analysis_type = args.get("analysis_type", "comprehensive")
+        patterns = self._detector.execute(self._detector_args(args, trace_id), trace_id)
         
-        # Parse logs first
-        parser = LogParserTool(self.log_format)
-        parsed_logs = parser.execute({"log_data": log_data}, trace_id)
-        
-        # Detect patterns
-        detector = PatternDetectorTool(self.llm, self.model_name)
-        patterns = detector.execute({
-            "log_data": parsed_logs,
-            "pattern_type": analysis_type
-        }, trace_id)
+        return f"Log Analysis Results:\n{patterns}"
+    
+    async def _aexecute_impl(self, args: Dict[str, Any], trace_id: Optional[str] = None) -> str:
+        """Analyze logs, awaiting pattern detection on the async client."""
+        patterns = await self._detector.aexecute(self._detector_args(args, trace_id), trace_id)
         
         return f"Log Analysis Results:\n{patterns}"
 
+
+def create_log_analyzer(config: Dict[str, Any], context: Dict[str, Any]) -> LogAnalyzerTool:
+    """Create a LogAnalyzerTool from tool config and shared factory context."""
+    llm_client = context.get("llm_client")
+    if not llm_client:
+        raise ConfigurationError("llm_client required for log_analyzer")
+    return LogAnalyzerTool(
+        llm=llm_client._client,
+        model_name=config.get("model", "llama3.2"),
+        log_format=config.get("log_format", "json"),
+        async_llm=context.get("async_llm_client"),
+        cache=ExtractionCache.from_config(config),
+        chat_options=config.get("chat_options")
+    )
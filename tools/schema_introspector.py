@@ -4,8 +4,9 @@ Database schema introspection tool.
 from typing import Dict, Any, Optional, List
 from core.tool import BaseTool
 from databases.base import IDatabaseAdapter
+from utils.cache import SimpleCache
 from utils.logger import get_logger
-from utils.exceptions import ToolExecutionError
+from utils.exceptions import ToolExecutionError, ConfigurationError
 
 logger = get_logger(__name__)
 
@@ -13,14 +14,18 @@ logger = get_logger(__name__)
 class SchemaIntrospectorTool(BaseTool):
     """Tool for introspecting database schema and listing available tables."""
     
-    def __init__(self, db_adapter: IDatabaseAdapter):
+    __slots__ = ("db_adapter", "_schema_cache")
+    
+    def __init__(self, db_adapter: IDatabaseAdapter, cache_ttl: int = 60):
         """
         Initialize schema introspector.
         
         Args:
             db_adapter: Database adapter instance
+            cache_ttl: Seconds a fetched schema is reused before hitting the database again
         """
         self.db_adapter = db_adapter
+        self._schema_cache = SimpleCache(default_ttl=cache_ttl)
         super().__init__(
             name="get_schema",
             description="Get schema information for tables. Use this to discover what tables exist and their structure before writing queries.",
@@ -33,9 +38,22 @@ class SchemaIntrospectorTool(BaseTool):
             }
         )
     
+    def invalidate_schema_cache(self):
+        """Drop cached schemas, e.g. after DDL changes."""
+        self._schema_cache.clear()
+    
+    def _get_schema(self, tables: List[str], trace_id: Optional[str] = None) -> str:
+        """Get schema information, reusing a recent snapshot for the same table set."""
+        key = "\x00".join(sorted(tables))
+        schema_info = self._schema_cache.get(key)
+        if schema_info is None:
+            schema_info = self.db_adapter.get_schema(tables, trace_id)
+            if schema_info and "Error:" not in schema_info:
+                self._schema_cache.set(key, schema_info)
+        return schema_info
+    
     def _execute_impl(self, args: Dict[str, Any], trace_id: Optional[str] = None) -> str:
         """Get schema information."""
-        log = logger.bind(trace_id=trace_id)
         
         try:
             tables = args.get("tables")
@@ -48,10 +66,10 @@ class SchemaIntrospectorTool(BaseTool):
             if not isinstance(tables, list):
                 tables = [tables] if tables else []
             
-            log.info("schema_introspection_requested", tables=tables)
+            logger.info("schema_introspection_requested", tables=tables)
             
             # Get schema for requested tables
-            schema_info = self.db_adapter.get_schema(tables, trace_id)
+            schema_info = self._get_schema(tables, trace_id)
             
             if not schema_info or "Error:" in schema_info:
                 # Try to list available tables
@@ -69,7 +87,7 @@ class SchemaIntrospectorTool(BaseTool):
             return result
             
         except Exception as e:
-            log.error("schema_introspection_failed", error=str(e), exc_info=True)
+            logger.error("schema_introspection_failed", error=str(e), exc_info=True)
             available_tables = self.db_adapter.get_allowed_tables()
             error_msg = f"Failed to get schema: {e}"
             if available_tables:
@@ -80,6 +98,8 @@ class SchemaIntrospectorTool(BaseTool):
 class ListTablesTool(BaseTool):
     """Tool for listing available tables in the database."""
     
+    __slots__ = ("db_adapter",)
+    
     def __init__(self, db_adapter: IDatabaseAdapter):
         """
         Initialize table lister.
@@ -96,7 +116,6 @@ class ListTablesTool(BaseTool):
     
     def _execute_impl(self, args: Dict[str, Any], trace_id: Optional[str] = None) -> str:
         """List available tables."""
-        log = logger.bind(trace_id=trace_id)
         
         try:
             tables = self.db_adapter.get_allowed_tables()
@@ -110,10 +129,28 @@ class ListTablesTool(BaseTool):
             
             result += "\nUse the 'get_schema' tool to get detailed schema information for any table."
             
-            log.info("tables_listed", table_count=len(tables))
+            logger.info("tables_listed", table_count=len(tables))
             return result
             
         except Exception as e:
-            log.error("list_tables_failed", error=str(e), exc_info=True)
+            logger.error("list_tables_failed", error=str(e), exc_info=True)
             return f"Failed to list tables: {e}"
 
+
+def create_schema_introspector(config: Dict[str, Any], context: Dict[str, Any]) -> SchemaIntrospectorTool:
+    """Create a SchemaIntrospectorTool from tool config and shared factory context."""
+    db_adapter = context.get("db_adapter")
+    if not db_adapter:
+        raise ConfigurationError("db_adapter required for schema_introspector")
+    return SchemaIntrospectorTool(
+        db_adapter=db_adapter,
+        cache_ttl=config.get("schema_cache_ttl", 60)
+    )
+
+
+def create_list_tables(config: Dict[str, Any], context: Dict[str, Any]) -> ListTablesTool:
+    """Create a ListTablesTool from tool config and shared factory context."""
+    db_adapter = context.get("db_adapter")
+    if not db_adapter:
+        raise ConfigurationError("db_adapter required for list_tables")
+    return ListTablesTool(db_adapter=db_adapter)
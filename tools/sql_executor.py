@@ -1,15 +1,17 @@
 """
 SQL execution tool.
 """
+import io
 from typing import Dict, Any, Optional, TYPE_CHECKING
 import pandas as pd
 from core.tool import BaseTool
 from databases.base import IDatabaseAdapter
 from utils.logger import get_logger
-from utils.exceptions import ToolExecutionError
+from utils.exceptions import ToolExecutionError, ConfigurationError
 
 if TYPE_CHECKING:
     from security.pii_masker import PIIMasker
+    from tools.sql_validator import SQLValidatorTool
 else:
     try:
         from security.pii_masker import PIIMasker
@@ -19,15 +21,51 @@ else:
 logger = get_logger(__name__)
 
 
+def _cell(value: Any) -> str:
+    """Render one value as a markdown table cell."""
+    return str(value).replace("|", "\\|").replace("\n", " ")
+
+
+def _to_markdown(data_df: pd.DataFrame, max_rows: Optional[int] = None) -> str:
+    """
+    Render a result DataFrame as a markdown table, one row at a time.
+    
+    Args:
+        data_df: Query result
+        max_rows: Maximum number of rows to render (None for all)
+        
+    Returns:
+        Markdown table, followed by a note when rows were omitted
+    """
+    total = len(data_df)
+    if max_rows is not None and total > max_rows:
+        data_df = data_df.head(max_rows)
+    
+    buf = io.StringIO()
+    columns = [_cell(c) for c in data_df.columns]
+    buf.write("| " + " | ".join(columns) + " |\n")
+    buf.write("|" + "|".join("---" for _ in columns) + "|\n")
+    for row in data_df.itertuples(index=False, name=None):
+        buf.write("| " + " | ".join(map(_cell, row)) + " |\n")
+    
+    if len(data_df) < total:
+        buf.write(f"\n[{total - len(data_df)} of {total} rows omitted]\n")
+    return buf.getvalue().rstrip("\n")
+
+
 class SQLExecutorTool(BaseTool):
     """
     Tool for executing SQL queries on a database.
     """
     
+    __slots__ = ("db_adapter", "pii_masker", "max_markdown_rows", "validator")
+    
     def __init__(
         self,
         db_adapter: IDatabaseAdapter,
-        pii_masker: Optional['PIIMasker'] = None
+        pii_masker: Optional['PIIMasker'] = None,
+        max_markdown_rows: Optional[int] = None,
+        validator: Optional['SQLValidatorTool'] = None
     ):
         """
         Initialize SQL executor tool.
@@ -35,9 +73,14 @@ class SQLExecutorTool(BaseTool):
         Args:
             db_adapter: Database adapter instance
             pii_masker: Optional PII masker for result sanitization
+            max_markdown_rows: Maximum number of result rows returned to the agent (None for all)
+            validator: Optional SQL validator; a query it has accepted is executed
+                as the statement it validated, without parsing it again
         """
         self.db_adapter = db_adapter
         self.pii_masker = pii_masker
+        self.max_markdown_rows = max_markdown_rows
+        self.validator = validator
         
         super().__init__(
             name="execute_sql",
@@ -53,26 +96,49 @@ class SQLExecutorTool(BaseTool):
     
     def _execute_impl(self, args: Dict[str, Any], trace_id: Optional[str] = None) -> str:
         """Execute SQL query."""
-        log = logger.bind(trace_id=trace_id)
         sql_query = args["sql_query"]
+        validated_sql = self.validator.get_validated_sql(sql_query) if self.validator is not None else None
+        if validated_sql is not None:
+            sql_query = validated_sql
         
         try:
-            log.info("executing_sql_query", sql_query=sql_query)
+            logger.info("executing_sql_query", sql_query=sql_query, prevalidated=validated_sql is not None)
             data_df = self.db_adapter.execute_query(sql_query, trace_id)
             
             if data_df.empty:
                 return "Query executed successfully, but returned no results."
             
-            data_markdown = data_df.to_markdown(index=False)
-            
-            # Mask PII if masker is available
+            # Mask PII on the structured result, before it is rendered
             if self.pii_masker:
-                masked_data = self.pii_masker.mask_text_result(data_markdown, trace_id)
-                return f"Query executed successfully. Data:\n{masked_data}"
-            else:
-                return f"Query executed successfully. Data:\n{data_markdown}"
+                data_df = self.pii_masker.mask_dataframe(data_df, trace_id)
+            
+            # Scalar results (e.g. SELECT count(*)) need no table
+            if data_df.shape == (1, 1):
+                return f"Query executed successfully. Result: {data_df.iat[0, 0]}"
+            
+            data_markdown = _to_markdown(data_df, self.max_markdown_rows)
+            return f"Query executed successfully. Data:\n{data_markdown}"
                 
         except Exception as e:
-            log.error("sql_execution_failed", error=str(e), exc_info=True)
+            logger.error("sql_execution_failed", error=str(e), exc_info=True)
             raise ToolExecutionError(f"SQL execution failed: {e}", "execute_sql") from e
 
+
+def create_sql_executor(config: Dict[str, Any], context: Dict[str, Any]) -> SQLExecutorTool:
+    """
+    Create a SQLExecutorTool from tool config and shared factory context.
+    
+    The executor shares the agent's SQL validator, so queries accepted by
+    validate_sql run as the statement that was validated.
+    """
+    from tools.sql_validator import shared_sql_validator
+    
+    db_adapter = context.get("db_adapter")
+    if not db_adapter:
+        raise ConfigurationError("db_adapter required for sql_executor")
+    return SQLExecutorTool(
+        db_adapter=db_adapter,
+        pii_masker=context.get("pii_masker"),
+        max_markdown_rows=config.get("max_markdown_rows"),
+        validator=shared_sql_validator(context)
+    )
@@ -2,84 +2,22 @@
 SQL generation tool using LLM.
 """
 import re
-from typing import Dict, Any, Optional
+from functools import lru_cache
+from typing import Dict, Any, Optional, Tuple
 from ollama import Client
 from core.tool import BaseTool
+from llm.ollama_client import get_shared_client
 from utils.logger import get_logger
-from utils.exceptions import ToolExecutionError
+from utils.exceptions import ToolExecutionError, ConfigurationError
 
 logger = get_logger(__name__)
 
+# Patterns for pulling the SQL out of a model response, compiled once at import time
+_SQL_BLOCK_RE = re.compile(r'```sql\s*(.*?)\s*```', re.DOTALL | re.IGNORECASE)
+_LEADING_LABEL_RE = re.compile(r'sql\s+query\s*:\s*', re.IGNORECASE)
 
-class SQLGeneratorTool(BaseTool):
-    """
-    Tool for generating SQL queries from natural language.
-    """
-    
-    def __init__(
-        self,
-        sql_llm: Client,
-        model_name: str,
-        database_type: str = "clickhouse"
-    ):
-        """
-        Initialize SQL generator tool.
-        
-        Args:
-            sql_llm: Ollama client instance
-            model_name: Model name for SQL generation
-            database_type: Database type (clickhouse, postgresql, mysql, etc.)
-        """
-        self.sql_llm = sql_llm
-        self.model_name = model_name
-        self.database_type = database_type
-        
-        super().__init__(
-            name="generate_sql",
-            description="Generate a SQL query from a natural language question",
-            parameter_schema={
-                "natural_language_query": {
-                    "type": "str",
-                    "required": True,
-                    "description": "Natural language description of the query"
-                },
-                "schema_info": {
-                    "type": "str",
-                    "required": True,
-                    "description": "Database schema information"
-                },
-                "correction_context": {
-                    "type": "str",
-                    "required": False,
-                    "description": "Context from previous failed query attempts"
-                }
-            }
-        )
-    
-    def _construct_prompt(
-        self,
-        natural_language_query: str,
-        schema_info: str,
-        correction_context: Optional[str] = None
-    ) -> str:
-        """Construct prompt for SQL generation."""
-        # Database-specific instructions
-        db_instructions = {
-            "clickhouse": """
--- 2. Pay close attention to ClickHouse-specific functions, especially for date and time (e.g., use toStartOfMonth(), toYYYYMM(), now()).
--- 3. Do not use syntax from other SQL dialects like T-SQL or PostgreSQL (e.g., GETDATE(), ::date).
-""",
-            "postgresql": """
--- 2. Use PostgreSQL-specific functions and syntax (e.g., NOW(), DATE_TRUNC(), ::text).
-""",
-            "mysql": """
--- 2. Use MySQL-specific functions and syntax (e.g., NOW(), DATE_FORMAT()).
-""",
-        }
-        
-        db_instruction = db_instructions.get(self.database_type.lower(), "")
-        
-        few_shot_examples = """
+# Few-shot examples shown in every generation prompt
+_FEW_SHOT_EXAMPLES = """
 ---
 -- Few-shot Examples:
 -- Question: How many orders were placed last month?
@@ -94,20 +32,10 @@ GROUP BY c.customer_name
 ORDER BY total_spent DESC
 LIMIT 3;
 """
-        
-        correction_prompt = ""
-        if correction_context:
-            correction_prompt = f"""
----
--- Previous Attempt Failed:
--- You previously generated a query that failed to execute.
--- {correction_context}
--- Please analyze the error and the failed query, then generate a new, corrected query.
-"""
-        
-        # Database-specific best practices
-        db_best_practices = {
-            "clickhouse": """
+
+# Database-specific best practices
+_DB_BEST_PRACTICES = {
+    "clickhouse": """
 -- ClickHouse-Specific Guidelines:
 -- ✅ Use ClickHouse functions: toStartOfMonth(), toYYYYMM(), now(), toDate(), toString()
 -- ✅ Use proper ClickHouse types: String, UInt64, DateTime, Date
@@ -116,33 +44,45 @@ LIMIT 3;
 -- ❌ DO NOT use: GETDATE(), DATE_TRUNC(), PostgreSQL/MySQL syntax
 -- ❌ DO NOT use: ::date, ::text type casting (use ClickHouse functions instead)
 """,
-            "postgresql": """
+    "postgresql": """
 -- PostgreSQL-Specific Guidelines:
 -- ✅ Use PostgreSQL functions: NOW(), DATE_TRUNC(), TO_CHAR(), EXTRACT()
 -- ✅ Use proper type casting: ::date, ::text, ::integer
 -- ✅ Use window functions when appropriate: ROW_NUMBER(), RANK(), LAG()
 -- ✅ Use proper PostgreSQL types: TIMESTAMP, VARCHAR, INTEGER, NUMERIC
 """,
-            "mysql": """
+    "mysql": """
 -- MySQL-Specific Guidelines:
 -- ✅ Use MySQL functions: NOW(), DATE_FORMAT(), CURDATE(), STR_TO_DATE()
 -- ✅ Use proper MySQL types: DATETIME, VARCHAR, INT, DECIMAL
 -- ✅ Use LIMIT for result limiting
 -- ✅ Use proper MySQL date functions
 """
-        }
-        
-        db_practices = db_best_practices.get(self.database_type.lower(), "")
-        
-        prompt = f"""# Role
-You are a world-class {self.database_type.upper()} SQL expert specializing in translating natural language questions into precise, optimized SQL queries.
+}
+
+
+@lru_cache(maxsize=8)
+def _static_prompt_parts(database_type: str) -> Tuple[str, str]:
+    """
+    Build the parts of the generation prompt that depend only on the database type.
+    
+    Returns:
+        (head, middle): the text before the schema, and the text between the
+        schema and the error-correction context
+    """
+    db_upper = database_type.upper()
+    db_practices = _DB_BEST_PRACTICES.get(database_type.lower(), "")
+    
+    head = f"""# Role
+You are a world-class {db_upper} SQL expert specializing in translating natural language questions into precise, optimized SQL queries.
 
 # Your Task
-Translate the user's natural language question into a single, syntactically correct {self.database_type.upper()} SQL query.
+Translate the user's natural language question into a single, syntactically correct {db_upper} SQL query.
 
 # Database Schema
 The following tables and their structures are available:
-{schema_info}
+"""
+    middle = f"""
 
 # Critical Requirements
 
@@ -152,7 +92,7 @@ The following tables and their structures are available:
    - Any DDL or DML operations
    - Stored procedures or functions
 
-2. **Syntax**: Use {self.database_type.upper()}-specific syntax and functions only
+2. **Syntax**: Use {db_upper}-specific syntax and functions only
 {db_practices}
 
 3. **Output Format**: 
@@ -174,27 +114,104 @@ The following tables and their structures are available:
 1. **Analyze** the user's question to understand what data they need
 2. **Identify** which tables and columns are relevant from the schema
 3. **Plan** the query structure (SELECT, FROM, JOINs, WHERE, GROUP BY, ORDER BY, LIMIT)
-4. **Write** the query using correct {self.database_type.upper()} syntax
+4. **Write** the query using correct {db_upper} syntax
 5. **Verify** the query is syntactically correct and only uses SELECT
 
 # Examples
 
-{few_shot_examples}
+{_FEW_SHOT_EXAMPLES}
 
 # Error Correction Context
-{correction_prompt if correction_prompt else "-- No previous errors. Generate a fresh query."}
+"""
+    return head, middle
 
-# User's Question
-{natural_language_query}
 
-# Your SQL Query (ONLY the query, nothing else):
+_QUESTION_HEADER = "\n\n# User's Question\n"
+_PROMPT_TAIL = "\n\n# Your SQL Query (ONLY the query, nothing else):"
+_NO_CORRECTION = "-- No previous errors. Generate a fresh query."
+
+
+class SQLGeneratorTool(BaseTool):
+    """
+    Tool for generating SQL queries from natural language.
+    """
+    
+    __slots__ = ("sql_llm", "model_name", "database_type", "_prompt_parts")
+    
+    def __init__(
+        self,
+        sql_llm: Client,
+        model_name: str,
+        database_type: str = "clickhouse"
+    ):
+        """
+        Initialize SQL generator tool.
+        
+        Args:
+            sql_llm: Ollama client instance
+            model_name: Model name for SQL generation
+            database_type: Database type (clickhouse, postgresql, mysql, etc.)
+        """
+        self.sql_llm = sql_llm
+        self.model_name = model_name
+        self.database_type = database_type
+        self._prompt_parts = _static_prompt_parts(database_type)
+        
+        super().__init__(
+            name="generate_sql",
+            description="Generate a SQL query from a natural language question",
+            parameter_schema={
+                "natural_language_query": {
+                    "type": "str",
+                    "required": True,
+                    "description": "Natural language description of the query"
+                },
+                "schema_info": {
+                    "type": "str",
+                    "required": True,
+                    "description": "Database schema information"
+                },
+                "correction_context": {
+                    "type": "str",
+                    "required": False,
+                    "description": "Context from previous failed query attempts"
+                }
+            }
+        )
+    
+    def _construct_prompt(
+        self,
+        natural_language_query: str,
+        schema_info: str,
+        correction_context: Optional[str] = None
+    ) -> str:
+        """Construct prompt for SQL generation."""
+        head, middle = self._prompt_parts
+        
+        correction_prompt = _NO_CORRECTION
+        if correction_context:
+            correction_prompt = f"""
+---
+-- Previous Attempt Failed:
+-- You previously generated a query that failed to execute.
+-- {correction_context}
+-- Please analyze the error and the failed query, then generate a new, corrected query.
 """
-        return prompt.strip()
+        
+        return "".join((
+            head,
+            schema_info,
+            middle,
+            correction_prompt,
+            _QUESTION_HEADER,
+            natural_language_query,
+            _PROMPT_TAIL
+        )).strip()
     
     def _parse_sql_from_response(self, response_text: str) -> str:
         """Extract SQL query from LLM response."""
         # Remove markdown code blocks
-        match = re.search(r'```sql\s*(.*?)\s*```', response_text, re.DOTALL | re.IGNORECASE)
+        match = _SQL_BLOCK_RE.search(response_text)
         if match:
             sql_query = match.group(1)
         else:
@@ -203,14 +220,14 @@ The following tables and their structures are available:
         sql_query = sql_query.strip().rstrip(';')
         
         # Remove any leading labels
-        if sql_query.lower().startswith("sql query:"):
-            sql_query = sql_query[10:].strip()
+        label = _LEADING_LABEL_RE.match(sql_query)
+        if label:
+            sql_query = sql_query[label.end():]
         
         return sql_query
     
     def _execute_impl(self, args: Dict[str, Any], trace_id: Optional[str] = None) -> str:
         """Execute SQL generation."""
-        log = logger.bind(trace_id=trace_id)
         
         nl_query = args["natural_language_query"]
         schema_info = args["schema_info"]
@@ -218,7 +235,7 @@ The following tables and their structures are available:
         
         prompt = self._construct_prompt(nl_query, schema_info, correction_context)
         
-        log.info("tool_call_sql_generate", model=self.model_name)
+        logger.info("tool_call_sql_generate", model=self.model_name)
         
         try:
             response = self.sql_llm.chat(
@@ -229,10 +246,27 @@ The following tables and their structures are available:
             generated_text = response['message']['content']
             sql_query = self._parse_sql_from_response(generated_text)
             
-            log.info("tool_result_sql_generate", extracted_sql=sql_query)
+            logger.info("tool_result_sql_generate", extracted_sql=sql_query)
             return f"Successfully generated SQL: {sql_query}"
             
         except Exception as e:
-            log.error("tool_call_sql_generate_failed", error=str(e), exc_info=True)
+            logger.error("tool_call_sql_generate_failed", error=str(e), exc_info=True)
             raise ToolExecutionError(f"SQL generation failed: {e}", "generate_sql") from e
 
+
+def create_sql_generator(config: Dict[str, Any], context: Dict[str, Any]) -> SQLGeneratorTool:
+    """
+    Create a SQLGeneratorTool from tool config and shared factory context.
+    
+    A "host" in the tool config points SQL generation at a separate Ollama
+    server, using that host's shared pooled client.
+    """
+    llm_client = get_shared_client(config["host"]) if config.get("host") else context.get("llm_client")
+    db_adapter = context.get("db_adapter")
+    if not llm_client:
+        raise ConfigurationError("llm_client required for sql_generator")
+    return SQLGeneratorTool(
+        sql_llm=llm_client._client,
+        model_name=config.get("model", "HridaAI/hrida-t2sql"),
+        database_type=db_adapter.get_database_type() if db_adapter else "clickhouse"
+    )
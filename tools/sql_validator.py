@@ -1,33 +1,57 @@
 """
 SQL validation tool.
 """
+import re
+import hashlib
+import threading
+from collections import OrderedDict
 import sqlglot
-import sqlparse
 from typing import Dict, Any, Optional, List, Tuple, Set
 from core.tool import BaseTool
+from security.pii_masker import PII_COLUMN_PATTERNS
 from utils.logger import get_logger
-from utils.exceptions import ToolExecutionError
+from utils.exceptions import ToolExecutionError, ConfigurationError
 
 logger = get_logger(__name__)
 
-PII_COLUMN_PATTERNS = [
-    r'ssn', r'social_security', r'credit_card', r'cc_num',
-    r'phone', r'email', r'address', r'dob', r'date_of_birth'
-]
-
 DIALECTS_TO_TRY = ["tsql", "postgres", "mysql"]
 
+# Correction source dialects in order; None is sqlglot's dialect-agnostic parser,
+# which accepts most plain ANSI SQL and so usually succeeds on the first attempt
+CORRECTION_DIALECTS = [None] + DIALECTS_TO_TRY
+
+# Maximum number of validation outcomes (and parse trees) kept per validator
+VALIDATION_CACHE_SIZE = 512
+
+
+def _query_key(database_type: str, sql_query: str) -> str:
+    """Hash a query together with the dialect it is parsed as."""
+    return hashlib.blake2b(f"{database_type}\0{sql_query}".encode("utf-8"), digest_size=16).hexdigest()
+
 
 class SQLValidatorTool(BaseTool):
     """
     Tool for validating SQL queries.
     """
     
+    __slots__ = (
+        "allowed_tables",
+        "database_type",
+        "pii_patterns",
+        "_pii_combined",
+        "cache_size",
+        "_validation_cache",
+        "_parse_cache",
+        "_validated_statements",
+        "_cache_lock",
+    )
+    
     def __init__(
         self,
         allowed_tables: List[str],
         database_type: str = "clickhouse",
-        pii_patterns: Optional[List[str]] = None
+        pii_patterns: Optional[List[str]] = None,
+        cache_size: int = VALIDATION_CACHE_SIZE
     ):
         """
         Initialize SQL validator tool.
@@ -36,11 +60,19 @@ class SQLValidatorTool(BaseTool):
             allowed_tables: List of allowed table names
             database_type: Database type for parsing
             pii_patterns: Optional custom PII column patterns
+            cache_size: Maximum number of cached validation outcomes and parse trees
         """
-        import re
         self.allowed_tables = {table.lower() for table in allowed_tables}
         self.database_type = database_type
         self.pii_patterns = [re.compile(p, re.IGNORECASE) for p in (pii_patterns or PII_COLUMN_PATTERNS)]
+        # One alternation so each column name is checked with a single search
+        self._pii_combined = re.compile("|".join(f"(?:{p.pattern})" for p in self.pii_patterns), re.IGNORECASE)
+        self.cache_size = cache_size
+        self._validation_cache: "OrderedDict[str, str]" = OrderedDict()
+        self._parse_cache: "OrderedDict[str, List[sqlglot.exp.Expression]]" = OrderedDict()
+        # Query key -> statement that passed validation (after any correction)
+        self._validated_statements: "OrderedDict[str, sqlglot.exp.Expression]" = OrderedDict()
+        self._cache_lock = threading.Lock()
         
         super().__init__(
             name="validate_sql",
@@ -54,102 +86,192 @@ class SQLValidatorTool(BaseTool):
             }
         )
     
-    def _get_all_queried_tables(self, parsed_statement: sqlglot.exp.Expression) -> Set[str]:
-        """Find all tables in the query."""
-        return {
-            table.name.lower()
-            for table in parsed_statement.find_all(sqlglot.exp.Table)
-        }
+    def _cache_get(self, cache: OrderedDict, key: str) -> Optional[Any]:
+        """Look up an LRU entry, marking it most recently used."""
+        with self._cache_lock:
+            value = cache.get(key)
+            if value is not None:
+                cache.move_to_end(key)
+        return value
     
-    def _get_all_selected_columns(self, parsed_statement: sqlglot.exp.Expression) -> Set[str]:
-        """Find all columns being selected."""
-        return {
-            col.name.lower()
-            for col in parsed_statement.find_all(sqlglot.exp.Column)
-        }
+    def _cache_put(self, cache: OrderedDict, key: str, value: Any):
+        """Insert an LRU entry, evicting the least recently used beyond cache_size."""
+        with self._cache_lock:
+            cache[key] = value
+            cache.move_to_end(key)
+            while len(cache) > self.cache_size:
+                cache.popitem(last=False)
+    
+    def _parse(self, sql_query: str) -> List[sqlglot.exp.Expression]:
+        """
+        Parse every statement of a query in the validator's dialect.
+        
+        Parse trees are cached; empty statements (e.g. from ";;") are dropped.
+        """
+        key = _query_key(self.database_type, sql_query)
+        statements = self._cache_get(self._parse_cache, key)
+        if statements is None:
+            statements = [s for s in sqlglot.parse(sql_query, read=self.database_type) if s is not None]
+            self._cache_put(self._parse_cache, key, statements)
+        return statements
+    
+    def _scan_statement(self, parsed_statement: sqlglot.exp.Expression) -> Tuple[Set[str], Optional[str]]:
+        """
+        Collect queried tables and the first PII column in one walk of the AST.
+        
+        Returns:
+            (queried_tables, pii_column or None)
+        """
+        queried_tables: Set[str] = set()
+        pii_column = None
+        for node in parsed_statement.walk():
+            if isinstance(node, sqlglot.exp.Table):
+                queried_tables.add(node.name.lower())
+            elif pii_column is None and isinstance(node, sqlglot.exp.Column):
+                col_name = node.name.lower()
+                if self._pii_combined.search(col_name):
+                    pii_column = col_name
+        return queried_tables, pii_column
     
     def _validate_internal(
         self,
         sql_query: str,
-        log,
         is_correction: bool = False
     ) -> Tuple[bool, str, Optional[sqlglot.exp.Expression]]:
         """Internal validation logic."""
         try:
-            parsed_statement = sqlglot.parse_one(sql_query, read=self.database_type)
+            statements = self._parse(sql_query)
         except sqlglot.errors.ParseError as e:
             if is_correction:
                 return False, f"Corrected query still fails to parse: {e}", None
-            log.warning("sql_parse_failed_trying_correction", error=str(e))
+            logger.warning("sql_parse_failed_trying_correction", error=str(e))
             return False, f"Initial parse failed: {e}", None
         except Exception as e:
             msg = f"Unexpected parsing error: {e}"
-            log.warning("sql_validation_failed", reason=msg, error=str(e))
+            logger.warning("sql_validation_failed", reason=msg, error=str(e))
+            return False, msg, None
+        
+        if len(statements) > 1:
+            msg = "Validation Failed: Multiple SQL statements are not allowed."
+            logger.warning("sql_validation_failed", reason=msg)
             return False, msg, None
         
+        parsed_statement = statements[0] if statements else None
         if not isinstance(parsed_statement, sqlglot.exp.Select):
             msg = "Validation Failed: Only SELECT statements are allowed."
-            log.warning("sql_validation_failed", reason=msg)
+            logger.warning("sql_validation_failed", reason=msg)
             return False, msg, None
         
-        queried_tables = self._get_all_queried_tables(parsed_statement)
+        # Table access is reported before PII, so the walk always covers the whole tree
+        queried_tables, pii_column = self._scan_statement(parsed_statement)
         if queried_tables and not queried_tables.issubset(self.allowed_tables):
             disallowed_tables = queried_tables - self.allowed_tables
             msg = f"Validation Failed: Access to unauthorized tables is forbidden: {disallowed_tables}."
-            log.warning("sql_validation_failed", reason=msg, disallowed_tables=list(disallowed_tables))
+            logger.warning("sql_validation_failed", reason=msg, disallowed_tables=list(disallowed_tables))
             return False, msg, None
         
-        selected_columns = self._get_all_selected_columns(parsed_statement)
-        for col_name in selected_columns:
-            for pattern in self.pii_patterns:
-                if pattern.search(col_name):
-                    msg = f"Validation Failed: Query appears to be selecting PII column: '{col_name}'."
-                    log.warning("sql_validation_failed", reason=msg, pii_column=col_name)
-                    return False, msg, None
+        if pii_column is not None:
+            msg = f"Validation Failed: Query appears to be selecting PII column: '{pii_column}'."
+            logger.warning("sql_validation_failed", reason=msg, pii_column=pii_column)
+            return False, msg, None
         
         return True, "", parsed_statement
     
     def _execute_impl(self, args: Dict[str, Any], trace_id: Optional[str] = None) -> str:
-        """Execute SQL validation."""
-        log = logger.bind(trace_id=trace_id)
+        """Execute SQL validation, reusing the outcome for repeated queries."""
         sql_query = args["sql_query"]
+        key = _query_key(self.database_type, sql_query)
         
-        # Check for multiple statements
-        try:
-            statements = sqlparse.split(sql_query)
-            if len(statements) > 1:
-                msg = "Validation Failed: Multiple SQL statements are not allowed."
-                log.warning("sql_validation_failed", reason=msg)
-                return f"Error: {msg}"
-        except Exception as e:
-            msg = f"Validation Failed: SQL parsing error (sqlparse): {e}"
-            log.warning("sql_validation_failed", reason=msg, error=str(e))
-            return f"Error: {msg}"
+        result = self._cache_get(self._validation_cache, key)
+        if result is not None:
+            logger.debug("sql_validation_cache_hit")
+            return result
+        
+        result = self._validate(sql_query)
+        self._cache_put(self._validation_cache, key, result)
+        return result
+    
+    def get_validated_sql(self, sql_query: str) -> Optional[str]:
+        """
+        Return the SQL to execute for a query this validator has accepted.
+        
+        The statement is rendered in the validator's dialect from the tree kept
+        at validation time (the corrected one, if correction was needed), so
+        SQLExecutorTool can run it without parsing the query again.
         
-        is_valid, error_msg, parsed_statement = self._validate_internal(sql_query, log)
+        Args:
+            sql_query: Query exactly as it was validated
+            
+        Returns:
+            Validated SQL, or None if the query was not validated or was rejected
+        """
+        statement = self._cache_get(self._validated_statements, _query_key(self.database_type, sql_query))
+        if statement is None:
+            return None
+        return statement.sql(dialect=self.database_type)
+    
+    def _validate(self, sql_query: str) -> str:
+        """Run multi-statement, structural and auto-correction checks on a query."""
+        is_valid, error_msg, parsed_statement = self._validate_internal(sql_query)
         
         if is_valid:
-            log.info("sql_validation_success")
+            logger.info("sql_validation_success")
+            self._cache_put(self._validated_statements, _query_key(self.database_type, sql_query), parsed_statement)
             return "SQL query is valid."
         
         # Try auto-correction
         if "Initial parse failed" in error_msg:
-            for dialect in DIALECTS_TO_TRY:
+            for dialect in CORRECTION_DIALECTS:
+                source_dialect = dialect or "default"
                 try:
-                    corrected_query = sqlglot.transpile(sql_query, read=dialect, write=self.database_type)[0]
-                    log.info("sql_correction_attempt", source_dialect=dialect, corrected_query=corrected_query)
+                    corrected_statements = sqlglot.transpile(sql_query, read=dialect, write=self.database_type)
+                    if len(corrected_statements) != 1:
+                        logger.info("sql_correction_dialect_failed", dialect=source_dialect, error="not a single statement")
+                        continue
+                    corrected_query = corrected_statements[0]
+                    logger.info("sql_correction_attempt", source_dialect=source_dialect, corrected_query=corrected_query)
                     
-                    is_valid_corrected, error_msg_corrected, _ = self._validate_internal(
-                        corrected_query, log, is_correction=True
+                    is_valid_corrected, error_msg_corrected, corrected_statement = self._validate_internal(
+                        corrected_query, is_correction=True
                     )
                     
                     if is_valid_corrected:
-                        log.info("sql_correction_success", source_dialect=dialect)
+                        logger.info("sql_correction_success", source_dialect=source_dialect)
+                        self._cache_put(
+                            self._validated_statements,
+                            _query_key(self.database_type, sql_query),
+                            corrected_statement
+                        )
                         return f"SQL query corrected and validated. Corrected query: {corrected_query}"
                 except Exception as e:
-                    log.info("sql_correction_dialect_failed", dialect=dialect, error=str(e))
+                    logger.info("sql_correction_dialect_failed", dialect=source_dialect, error=str(e))
                     continue
         
-        log.warning("sql_validation_failed_final", reason=error_msg)
+        logger.warning("sql_validation_failed_final", reason=error_msg)
         return f"Error: {error_msg}"
 
+
+def shared_sql_validator(context: Dict[str, Any]) -> SQLValidatorTool:
+    """
+    Return the SQL validator shared by the tools built from one factory context.
+    
+    The validator is created on first use and stored in the context, so
+    validate_sql and execute_sql see the same validated statements whatever
+    order they are configured in.
+    """
+    validator = context.get("sql_validator")
+    if validator is None:
+        db_adapter = context.get("db_adapter")
+        if not db_adapter:
+            raise ConfigurationError("db_adapter required for sql_validator")
+        validator = SQLValidatorTool(
+            allowed_tables=db_adapter.get_allowed_tables(),
+            database_type=db_adapter.get_database_type()
+        )
+        context["sql_validator"] = validator
+    return validator
+
+
+def create_sql_validator(config: Dict[str, Any], context: Dict[str, Any]) -> SQLValidatorTool:
+    """Create a SQLValidatorTool from tool config and shared factory context."""
+    return shared_sql_validator(context)
@@ -1,42 +1,69 @@
 """
 Caching utilities for performance optimization.
 """
-from typing import Dict, Any, Optional, Callable
+from typing import Any, Optional, Callable, Hashable, Tuple
+from collections import OrderedDict
 from functools import wraps
 import hashlib
 import json
-from datetime import datetime, timedelta
+import threading
+import time
 from utils.logger import get_logger
 
 logger = get_logger(__name__)
 
+# Argument types keyed directly, tagged with their type so 1, 1.0 and True stay apart
+_PRIMITIVE_TYPES = frozenset({str, int, float, bool, bytes, type(None)})
+
 
 class SimpleCache:
     """
-    Simple in-memory cache with TTL support.
+    Simple in-memory cache with TTL support and least-recently-used eviction.
+    
+    Instances are shared across threads, so every access to the LRU order
+    goes through a lock.
     """
     
-    def __init__(self, default_ttl: int = 3600):
+    def __init__(self, default_ttl: Optional[int] = 3600, maxsize: Optional[int] = 1024, purge_interval: int = 256):
         """
         Initialize cache.
         
         Args:
-            default_ttl: Default time-to-live in seconds
+            default_ttl: Default time-to-live in seconds (None for entries that never expire)
+            maxsize: Maximum number of entries (None for unbounded)
+            purge_interval: Drop all expired entries every this many sets
         """
-        self._cache: Dict[str, Dict[str, Any]] = {}
+        # key -> (value, expires_at on the time.monotonic() clock), least recently used first
+        self._cache: "OrderedDict[Hashable, Tuple[Any, float]]" = OrderedDict()
         self.default_ttl = default_ttl
-        logger.info("cache_initialized", default_ttl=default_ttl)
+        self.maxsize = maxsize
+        self.purge_interval = purge_interval
+        self._sets_since_purge = 0
+        self._lock = threading.Lock()
+        logger.info("cache_initialized", default_ttl=default_ttl, maxsize=maxsize)
     
-    def _make_key(self, *args, **kwargs) -> str:
-        """Generate cache key from arguments."""
-        key_data = {
-            "args": args,
-            "kwargs": sorted(kwargs.items())
-        }
-        key_str = json.dumps(key_data, sort_keys=True)
-        return hashlib.md5(key_str.encode()).hexdigest()
+    def _make_key(self, *args, **kwargs) -> Optional[Hashable]:
+        """
+        Generate cache key from arguments.
+        
+        Primitive arguments are used directly as a type-tagged tuple key.
+        Other JSON-serializable arguments are keyed by a blake2b digest of
+        their JSON form. Returns None for arguments that cannot be keyed
+        faithfully (arrays, DataFrames, arbitrary objects).
+        """
+        items = sorted(kwargs.items())
+        if all(type(a) in _PRIMITIVE_TYPES for a in args) and all(type(v) in _PRIMITIVE_TYPES for _, v in items):
+            return (
+                tuple((type(a), a) for a in args),
+                tuple((k, type(v), v) for k, v in items)
+            )
+        try:
+            key_str = json.dumps({"args": args, "kwargs": items}, sort_keys=True)
+        except (TypeError, ValueError):
+            return None
+        return hashlib.blake2b(key_str.encode("utf-8"), digest_size=16).digest()
     
-    def get(self, key: str) -> Optional[Any]:
+    def get(self, key: Hashable) -> Optional[Any]:
         """
         Get value from cache.
         
@@ -46,19 +73,20 @@ class SimpleCache:
         Returns:
             Cached value or None
         """
-        if key not in self._cache:
-            return None
-        
-        entry = self._cache[key]
-        expires_at = entry.get("expires_at")
-        
-        if expires_at and datetime.utcnow() > expires_at:
-            del self._cache[key]
-            return None
-        
-        return entry["value"]
+        with self._lock:
+            entry = self._cache.get(key)
+            if entry is None:
+                return None
+            
+            value, expires_at = entry
+            if expires_at < time.monotonic():
+                del self._cache[key]
+                return None
+            
+            self._cache.move_to_end(key)
+            return value
     
-    def set(self, key: str, value: Any, ttl: Optional[int] = None):
+    def set(self, key: Hashable, value: Any, ttl: Optional[int] = None):
         """
         Set value in cache.
         
@@ -68,33 +96,50 @@ class SimpleCache:
             ttl: Time-to-live in seconds (defaults to default_ttl)
         """
         ttl = ttl or self.default_ttl
-        expires_at = datetime.utcnow() + timedelta(seconds=ttl)
-        
-        self._cache[key] = {
-            "value": value,
-            "expires_at": expires_at
-        }
+        with self._lock:
+            self._cache[key] = (value, time.monotonic() + ttl if ttl is not None else float("inf"))
+            self._cache.move_to_end(key)
+            
+            self._sets_since_purge += 1
+            if self._sets_since_purge >= self.purge_interval:
+                self._purge_expired()
+            
+            if self.maxsize is not None:
+                while len(self._cache) > self.maxsize:
+                    self._cache.popitem(last=False)
+    
+    def _purge_expired(self):
+        """Drop every expired entry so TTL'd values are freed without a lookup; caller holds the lock."""
+        self._sets_since_purge = 0
+        now = time.monotonic()
+        expired = [key for key, (_, expires_at) in self._cache.items() if expires_at < now]
+        for key in expired:
+            del self._cache[key]
+        if expired:
+            logger.debug("cache_purged", expired=len(expired))
     
     def clear(self):
         """Clear all cache entries."""
-        self._cache.clear()
+        with self._lock:
+            self._cache.clear()
         logger.info("cache_cleared")
     
-    def invalidate(self, key: str):
+    def invalidate(self, key: Hashable):
         """Invalidate a specific cache entry."""
-        if key in self._cache:
-            del self._cache[key]
+        with self._lock:
+            self._cache.pop(key, None)
 
 
-def cached(ttl: int = 3600, key_func: Optional[Callable] = None):
+def cached(ttl: int = 3600, key_func: Optional[Callable] = None, maxsize: Optional[int] = 1024):
     """
     Decorator for caching function results.
     
     Args:
         ttl: Time-to-live in seconds
         key_func: Optional function to generate cache key
+        maxsize: Maximum number of cached results (None for unbounded)
     """
-    cache = SimpleCache(default_ttl=ttl)
+    cache = SimpleCache(default_ttl=ttl, maxsize=maxsize)
     
     def decorator(func: Callable) -> Callable:
         @wraps(func)
@@ -103,6 +148,9 @@ def cached(ttl: int = 3600, key_func: Optional[Callable] = None):
                 cache_key = key_func(*args, **kwargs)
             else:
                 cache_key = cache._make_key(*args, **kwargs)
+                if cache_key is None:
+                    logger.debug("cache_bypass", function=func.__name__, reason="arguments cannot be keyed")
+                    return func(*args, **kwargs)
             
             # Try to get from cache
             cached_value = cache.get(cache_key)
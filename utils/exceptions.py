@@ -5,12 +5,30 @@ from typing import Optional
 
 
 class AgentFrameworkError(Exception):
-    """Base exception for all framework errors."""
-    pass
+    """
+    Base exception for all framework errors.
+    
+    Subclasses keep their context attribute in __slots__, so raising one does
+    not allocate an instance __dict__.
+    """
+    __slots__ = ()
+    
+    def __reduce__(self):
+        """Pickle slot attributes too; BaseException only carries args and __dict__."""
+        state = dict(self.__dict__)
+        state.update(
+            (name, getattr(self, name))
+            for klass in type(self).__mro__
+            for name in klass.__dict__.get("__slots__", ())
+            if hasattr(self, name)
+        )
+        return type(self), self.args, state
 
 
 class AgentError(AgentFrameworkError):
     """Base exception for agent-related errors."""
+    __slots__ = ("agent_name",)
+    
     def __init__(self, message: str, agent_name: Optional[str] = None):
         super().__init__(message)
         self.agent_name = agent_name
@@ -18,6 +36,8 @@ class AgentError(AgentFrameworkError):
 
 class ToolExecutionError(AgentFrameworkError):
     """Exception raised when tool execution fails."""
+    __slots__ = ("tool_name",)
+    
     def __init__(self, message: str, tool_name: Optional[str] = None):
         super().__init__(message)
         self.tool_name = tool_name
@@ -25,6 +45,8 @@ class ToolExecutionError(AgentFrameworkError):
 
 class DatabaseError(AgentFrameworkError):
     """Exception raised when database operations fail."""
+    __slots__ = ("database_type",)
+    
     def __init__(self, message: str, database_type: Optional[str] = None):
         super().__init__(message)
         self.database_type = database_type
@@ -32,6 +54,8 @@ class DatabaseError(AgentFrameworkError):
 
 class LLMError(AgentFrameworkError):
     """Exception raised when LLM API calls fail."""
+    __slots__ = ("model_name",)
+    
     def __init__(self, message: str, model_name: Optional[str] = None):
         super().__init__(message)
         self.model_name = model_name
@@ -39,6 +63,8 @@ class LLMError(AgentFrameworkError):
 
 class ConfigurationError(AgentFrameworkError):
     """Exception raised when configuration is invalid."""
+    __slots__ = ("config_path",)
+    
     def __init__(self, message: str, config_path: Optional[str] = None):
         super().__init__(message)
         self.config_path = config_path
@@ -46,6 +72,17 @@ class ConfigurationError(AgentFrameworkError):
 
 class ValidationError(AgentFrameworkError):
     """Exception raised when validation fails."""
+    __slots__ = ("field",)
+    
     def __init__(self, message: str, field: Optional[str] = None):
         super().__init__(message)
         self.field = field
+
+
+class CircuitOpenError(AgentFrameworkError):
+    """Exception raised when a circuit breaker refuses a call."""
+    __slots__ = ("target",)
+    
+    def __init__(self, message: str, target: Optional[str] = None):
+        super().__init__(message)
+        self.target = target
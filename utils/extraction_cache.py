@@ -0,0 +1,186 @@
+"""
+Content-addressable cache for LLM extraction results.
+"""
+import os
+import json
+import hashlib
+import threading
+from datetime import datetime, timezone
+from typing import Dict, Any, Optional, Callable
+from utils.cache import SimpleCache
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+def _is_json_object(value: Any) -> bool:
+    """Default validator: cached extractions must decode to a JSON object."""
+    return isinstance(value, dict)
+
+
+class ExtractionCache:
+    """
+    Cache of LLM extraction outputs keyed by a hash of everything that shaped them.
+    
+    Entries live in a bounded in-memory SimpleCache (LRU, no expiry) and, when
+    cache_dir is set, in one JSON file per key so results survive restarts and
+    can be replayed.
+    """
+    
+    def __init__(self, cache_dir: Optional[str] = None, max_entries: int = 1024):
+        """
+        Initialize extraction cache.
+        
+        Args:
+            cache_dir: Optional directory for persistent entries
+            max_entries: Maximum number of entries kept in memory
+        """
+        self.cache_dir = cache_dir
+        self.max_entries = max_entries
+        self._entries = SimpleCache(default_ttl=None, maxsize=max_entries)
+        self._lock = threading.Lock()
+        if cache_dir:
+            os.makedirs(cache_dir, exist_ok=True)
+        logger.info("extraction_cache_initialized", cache_dir=cache_dir, max_entries=max_entries)
+    
+    @classmethod
+    def from_config(cls, config: Dict[str, Any]) -> Optional["ExtractionCache"]:
+        """
+        Build a cache from tool config, or return None when caching is not enabled.
+        
+        Recognized keys: extraction_cache (bool), cache_dir, cache_max_entries.
+        """
+        if not config.get("extraction_cache") and not config.get("cache_dir"):
+            return None
+        return cls(
+            cache_dir=config.get("cache_dir"),
+            max_entries=config.get("cache_max_entries", 1024)
+        )
+    
+    @staticmethod
+    def make_key(*parts: str) -> str:
+        """
+        Build a cache key from its parts.
+        
+        Each part is prefixed with its 8-byte length so that, e.g., a message
+        ending in "x" plus domain "y" cannot collide with message "" plus "xy".
+        """
+        digest = hashlib.sha256()
+        for part in parts:
+            encoded = str(part).encode("utf-8")
+            digest.update(len(encoded).to_bytes(8, "big"))
+            digest.update(encoded)
+        return digest.hexdigest()
+    
+    def _path(self, key: str) -> str:
+        """Return the file path for a persisted entry."""
+        return os.path.join(self.cache_dir, key[:2], f"{key}.json")
+    
+    def _remember(self, key: str, value: str):
+        """Insert an entry into the in-memory LRU, evicting the oldest if full."""
+        with self._lock:
+            self._entries.set(key, value)
+    
+    @staticmethod
+    def _is_valid(value: str, validator: Optional[Callable[[Any], bool]]) -> bool:
+        """Check that an extraction decodes as JSON and passes the validator."""
+        validator = validator or _is_json_object
+        try:
+            return bool(validator(json.loads(value)))
+        except (TypeError, ValueError):
+            return False
+    
+    def get(self, key: str, validator: Optional[Callable[[Any], bool]] = None) -> Optional[str]:
+        """
+        Get a cached extraction.
+        
+        The entry is re-validated on every hit; invalid entries are evicted.
+        
+        Args:
+            key: Cache key from make_key
+            validator: Predicate over the decoded JSON (defaults to "is an object")
+        
+        Returns:
+            Cached extraction text or None
+        """
+        with self._lock:
+            value = self._entries.get(key)
+        
+        if value is None and self.cache_dir:
+            try:
+                with open(self._path(key), "r", encoding="utf-8") as f:
+                    record = json.load(f)
+            except (OSError, ValueError):
+                record = None
+            # A file that is valid JSON but not an entry record is a miss
+            value = record.get("value") if isinstance(record, dict) else None
+            if value is not None:
+                self._remember(key, value)
+        
+        if value is None:
+            return None
+        
+        if not self._is_valid(value, validator):
+            logger.warning("extraction_cache_entry_invalid", key=key)
+            self.invalidate(key)
+            return None
+        
+        return value
+    
+    def put(
+        self,
+        key: str,
+        value: str,
+        meta: Optional[Dict[str, Any]] = None,
+        validator: Optional[Callable[[Any], bool]] = None
+    ) -> bool:
+        """
+        Store an extraction if it is valid.
+        
+        Args:
+            key: Cache key from make_key
+            value: Extraction text returned by the LLM
+            meta: Optional configuration metadata persisted alongside the entry
+            validator: Predicate over the decoded JSON (defaults to "is an object")
+        
+        Returns:
+            True if the extraction was stored
+        """
+        if not self._is_valid(value, validator):
+            return False
+        
+        self._remember(key, value)
+        
+        if self.cache_dir:
+            path = self._path(key)
+            record = {
+                "value": value,
+                "created_at": datetime.now(timezone.utc).isoformat(),
+                "meta": meta or {}
+            }
+            try:
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+                with open(tmp_path, "w", encoding="utf-8") as f:
+                    json.dump(record, f)
+                os.replace(tmp_path, path)
+            except OSError as e:
+                logger.warning("extraction_cache_write_failed", key=key, error=str(e))
+        
+        return True
+    
+    def invalidate(self, key: str):
+        """Invalidate a specific cache entry."""
+        with self._lock:
+            self._entries.invalidate(key)
+        if self.cache_dir:
+            try:
+                os.remove(self._path(key))
+            except OSError:
+                pass
+    
+    def clear(self):
+        """Clear in-memory entries (persisted entries are left on disk)."""
+        with self._lock:
+            self._entries.clear()
+        logger.info("extraction_cache_cleared")
@@ -0,0 +1,69 @@
+"""
+Fast JSON encoding/decoding backed by orjson, with a stdlib fallback.
+"""
+import json
+import re
+from typing import Any, Union
+
+try:
+    import orjson
+except ImportError:  # orjson is optional; fall back to the stdlib codec
+    orjson = None
+
+# Integer literals this long may not fit in 64 bits, which orjson decodes as lossy floats
+_WIDE_INT = re.compile(r"\d{19}")
+_WIDE_INT_BYTES = re.compile(rb"\d{19}")
+
+
+def loads(data: Union[str, bytes]) -> Any:
+    """
+    Parse a JSON document.
+
+    Accepts the same documents as json.loads: input orjson rejects (NaN,
+    Infinity, out-of-range floats) or would decode lossily (ints wider than
+    64 bits) goes through the stdlib parser.
+
+    Args:
+        data: JSON text as str or bytes
+
+    Returns:
+        Parsed Python object
+
+    Raises:
+        json.JSONDecodeError: If the document is not valid JSON
+            (orjson.JSONDecodeError is a subclass)
+    """
+    if orjson is not None:
+        wide_int = _WIDE_INT_BYTES if isinstance(data, (bytes, bytearray)) else _WIDE_INT
+        if wide_int.search(data) is None:
+            try:
+                return orjson.loads(data)
+            except orjson.JSONDecodeError as e:
+                try:
+                    return json.loads(data)
+                except RecursionError:
+                    # Nesting too deep for the stdlib parser; keep orjson's decode error
+                    raise e from None
+    return json.loads(data)
+
+
+def dumps(obj: Any, indent: bool = False, sort_keys: bool = False) -> str:
+    """
+    Serialize an object to a JSON string.
+
+    Args:
+        obj: Object to serialize
+        indent: Pretty-print with two-space indentation
+        sort_keys: Sort object keys
+
+    Returns:
+        JSON string
+    """
+    if orjson is not None:
+        option = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        if sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        return orjson.dumps(obj, option=option).decode("utf-8")
+    return json.dumps(obj, indent=2 if indent else None, sort_keys=sort_keys)
@@ -3,11 +3,43 @@ Robust JSON parsing utilities for LLM responses.
 """
 import json
 import re
-from typing import Dict, Any, Optional, Tuple
+from typing import Dict, Any, Optional, Tuple, Iterable, Iterator
+import jsonschema
 from utils.logger import get_logger
+from utils.json_codec import loads as _loads, dumps as _dumps
 
 logger = get_logger(__name__)
 
+_DECODER = json.JSONDecoder()
+
+# Markers for "Thought: ... Tool call: {...}" responses. Each is a plain search;
+# the span between them is sliced out rather than matched with a lazy group,
+# which backtracked cubically on repeated markers without a following "{".
+_THOUGHT_RE = re.compile(r'Thought:', re.IGNORECASE)
+_TOOL_CALL_RE = re.compile(r'Tool\s+call:\s*\{', re.IGNORECASE)
+
+
+def _split_thought_tool_call(text: str) -> Optional[Tuple[str, str]]:
+    """
+    Split "Thought: <text> Tool call: {...}" into its thought and tool-call parts.
+    
+    The tool call runs from its "{" to the last "}" in the text.
+    
+    Returns:
+        (thought_text, tool_call_text), or None if the text has no such shape
+    """
+    thought = _THOUGHT_RE.search(text)
+    if not thought:
+        return None
+    tool_call = _TOOL_CALL_RE.search(text, thought.end())
+    if not tool_call:
+        return None
+    start = tool_call.end() - 1
+    end = text.rfind('}')
+    if end < start:
+        return None
+    return text[thought.end():tool_call.start()].strip(), text[start:end + 1].strip()
+
 
 def extract_json_from_text(text: str) -> Tuple[Optional[str], bool]:
     """
@@ -37,7 +69,7 @@ def extract_json_from_text(text: str) -> Tuple[Optional[str], bool]:
     
     # Try direct parsing first (most reliable)
     try:
-        test_parse = json.loads(text_clean)
+        test_parse = _loads(text_clean)
         if isinstance(test_parse, dict):
             logger.debug("json_parsed_directly", keys=list(test_parse.keys()))
             return text_clean, True
@@ -46,59 +78,35 @@ def extract_json_from_text(text: str) -> Tuple[Optional[str], bool]:
     
     # Try to extract JSON from text that has "Thought:" and "Tool call:" as separate lines
     # Pattern: Thought: ... Tool call: {...}
-    thought_tool_match = re.search(
-        r'Thought:\s*(.*?)\s*Tool\s+call:\s*(\{.*\})',
-        text_clean,
-        re.DOTALL | re.IGNORECASE
-    )
-    if thought_tool_match:
-        thought_text = thought_tool_match.group(1).strip()
-        tool_call_text = thought_tool_match.group(2).strip()
+    thought_tool_parts = _split_thought_tool_call(text_clean)
+    if thought_tool_parts:
+        thought_text, tool_call_text = thought_tool_parts
         try:
-            tool_call_json = json.loads(tool_call_text)
+            tool_call_json = _loads(tool_call_text)
             # Construct proper JSON structure
             constructed_json = {
                 "thought": thought_text,
                 "tool_call": tool_call_json
             }
-            json_str = json.dumps(constructed_json)
+            json_str = _dumps(constructed_json)
             logger.debug("json_constructed_from_thought_toolcall")
             return json_str, True
         except json.JSONDecodeError:
             pass
     
-    # Try to find the outermost JSON object using balanced braces
-    brace_count = 0
-    start_idx = -1
-    for i, char in enumerate(text_clean):
-        if char == '{':
-            if start_idx == -1:
-                start_idx = i
-            brace_count += 1
-        elif char == '}':
-            brace_count -= 1
-            if brace_count == 0 and start_idx != -1:
-                # Found complete outermost JSON object
-                extracted = text_clean[start_idx:i+1]
-                try:
-                    test = json.loads(extracted)
-                    if isinstance(test, dict):
-                        logger.debug("json_extracted_with_braces", keys=list(test.keys()))
-                        return extracted, True
-                except json.JSONDecodeError:
-                    pass
-    
-    # Fallback: try regex to find any JSON object
-    json_match = re.search(r'\{[^{}]*(?:\{[^{}]*\}[^{}]*)*\}', text_clean, re.DOTALL)
-    if json_match:
-        potential_json = json_match.group(0)
+    # Decode from each "{" in turn; raw_decode stops at the end of the object
+    # and handles braces inside strings
+    idx = text_clean.find('{')
+    while idx != -1:
         try:
-            test = json.loads(potential_json)
+            test, end = _DECODER.raw_decode(text_clean, idx)
             if isinstance(test, dict):
-                logger.debug("json_extracted_with_regex", keys=list(test.keys()))
-                return potential_json, True
-        except json.JSONDecodeError:
+                logger.debug("json_extracted_with_raw_decode", keys=list(test.keys()))
+                return text_clean[idx:end], True
+        except (json.JSONDecodeError, RecursionError):
+            # RecursionError: pathologically deep nesting, e.g. '{"a":{"a":...'
             pass
+        idx = text_clean.find('{', idx + 1)
     
     return None, False
 
@@ -128,7 +136,7 @@ def parse_llm_response(
     
     # Parse JSON
     try:
-        parsed = json.loads(json_str)
+        parsed = _loads(json_str)
         if not isinstance(parsed, dict):
             return None, f"Parsed JSON is not a dictionary, got {type(parsed).__name__}"
         
@@ -156,3 +164,79 @@ def parse_llm_response(
         logger.error("json_parse_unexpected_error", error=str(e), exc_info=True)
         return None, error_msg
 
+
+def validate_json_response(
+    response_text: str,
+    schema: Optional[Dict[str, Any]] = None
+) -> Optional[str]:
+    """
+    Check that an LLM response is a JSON object matching an optional JSON schema.
+    
+    Args:
+        response_text: Raw response text from LLM
+        schema: Optional JSON schema the decoded object must satisfy
+        
+    Returns:
+        None if the response is valid, otherwise a short error description
+        suitable for feeding back to the model
+    """
+    try:
+        parsed = _loads(response_text)
+    except (TypeError, json.JSONDecodeError) as e:
+        return f"invalid JSON ({e})"
+    
+    if not isinstance(parsed, dict):
+        return f"expected a JSON object, got {type(parsed).__name__}"
+    
+    if schema is not None:
+        error = jsonschema.exceptions.best_match(jsonschema.Draft7Validator(schema).iter_errors(parsed))
+        if error is not None:
+            location = ".".join(str(p) for p in error.absolute_path) or "<root>"
+            return f"schema violation at {location}: {error.message}"
+    
+    return None
+
+
+def iter_json_array_items(chunks: Iterable[str], key: str) -> Iterator[Any]:
+    """
+    Yield the items of a JSON array as soon as each one is complete in a text stream.
+    
+    Used to consume streamed LLM output incrementally, e.g. each entry of
+    "patterns" before the model has finished the rest of the document.
+    
+    Args:
+        chunks: Streamed text fragments of one JSON document
+        key: Name of the array-valued key whose items should be yielded
+        
+    Returns:
+        Iterator over decoded array items
+    """
+    decoder = json.JSONDecoder()
+    marker = re.compile(r'"%s"\s*:\s*\[' % re.escape(key))
+    buffer = ""
+    pos = None
+    
+    for chunk in chunks:
+        buffer += chunk
+        if pos is None:
+            match = marker.search(buffer)
+            if not match:
+                continue
+            pos = match.end()
+        
+        while True:
+            while pos < len(buffer) and buffer[pos] in " \t\r\n,":
+                pos += 1
+            if pos >= len(buffer):
+                break
+            if buffer[pos] == "]":
+                return
+            try:
+                item, end = decoder.raw_decode(buffer, pos)
+            except json.JSONDecodeError:
+                break
+            # A scalar at the very end of the buffer may still be growing
+            if end >= len(buffer):
+                break
+            yield item
+            pos = end
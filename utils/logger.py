@@ -1,22 +1,62 @@
 import sys
+import json
+from contextlib import nullcontext
+from typing import Any, Callable, ContextManager, Optional
 import structlog
 
+try:
+    import orjson
+except ImportError:  # orjson is optional; fall back to the stdlib encoder
+    orjson = None
+
+
+def _orjson_serializer(obj: Any, default: Optional[Callable[[Any], Any]] = None, **kwargs: Any) -> str:
+    """
+    JSONRenderer serializer backed by orjson.
+    
+    structlog passes its repr-based fallback as default, so values orjson
+    cannot encode natively (sets, exceptions, ...) still render. Values orjson
+    rejects outright, such as ints wider than 64 bits, go through the stdlib
+    encoder so logging never fails the call that logs.
+    """
+    try:
+        return orjson.dumps(obj, default=default, option=orjson.OPT_NON_STR_KEYS).decode("utf-8")
+    except TypeError:  # orjson.JSONEncodeError subclasses TypeError
+        return json.dumps(obj, default=default)
+
+
+def trace_scope(trace_id: Optional[str]) -> ContextManager:
+    """
+    Bind trace_id into the structlog context for the enclosed block.
+    
+    Without a trace_id the surrounding context, such as the one bound by
+    BaseTool.execute, is left as it is.
+    """
+    return structlog.contextvars.bound_contextvars(trace_id=trace_id) if trace_id else nullcontext()
+
+
 def get_logger(name: str) -> structlog.stdlib.BoundLogger:
     """
     Configures and returns a structured logger.
     
     This setup is done once and provides JSON-formatted logs
     for production-ready observability, as described in the blueprint.
+    
+    Per-request fields such as trace_id are bound with
+    structlog.contextvars (see BaseTool.execute) rather than logger.bind,
+    so hot paths reuse one logger instead of allocating a bound copy per call.
     """
     if not structlog.is_configured():
         structlog.configure(
             processors=[
+                structlog.contextvars.merge_contextvars,
                 structlog.stdlib.add_logger_name,
                 structlog.stdlib.add_log_level,
-                structlog.processors.TimeStamper(fmt="iso"),
-                structlog.processors.StackInfoRenderer(),
+                structlog.processors.TimeStamper(fmt="iso", utc=True),
                 structlog.processors.format_exc_info,
-                structlog.processors.JSONRenderer(),
+                structlog.processors.JSONRenderer(
+                    serializer=_orjson_serializer if orjson is not None else json.dumps
+                ),
             ],
             context_class=dict,
             logger_factory=structlog.stdlib.LoggerFactory(),
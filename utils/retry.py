@@ -2,37 +2,85 @@
 Retry logic with exponential backoff.
 """
 import time
-from typing import Callable, TypeVar, Optional, List, Type
+import random
+import logging
+import asyncio
+import inspect
+import threading
+from typing import Callable, Awaitable, TypeVar, Optional, List, Type, Dict, Any, Tuple, Hashable
 from functools import wraps
-from utils.logger import get_logger
-from utils.exceptions import AgentFrameworkError
+from utils.logger import get_logger, trace_scope
+from utils.exceptions import AgentFrameworkError, CircuitOpenError, ConfigurationError, ValidationError
+from utils.json_parser import validate_json_response
 
 logger = get_logger(__name__)
 
 T = TypeVar('T')
 
+# Jitter strategies: "none" sleeps the capped exponential delay, "full" a uniform
+# draw from [0, delay], "equal" half the delay plus a uniform draw from the other half
+JITTER_MODES = ("none", "full", "equal")
+
+# Private generator so retry jitter neither consumes nor depends on global random state
+_rng = random.SystemRandom()
+
+
+def _check_jitter(jitter: str):
+    """Reject unknown jitter strategies up front rather than on the first failure."""
+    if jitter not in JITTER_MODES:
+        raise ValueError(f"jitter must be one of {JITTER_MODES}, got {jitter!r}")
+
+
+def _delay_schedule(
+    max_retries: int,
+    initial_delay: float,
+    max_delay: float,
+    exponential_base: float
+) -> Tuple[float, ...]:
+    """Capped exponential delay before each retry, indexed by the failed attempt."""
+    return tuple(min(max_delay, initial_delay * exponential_base ** i) for i in range(max(max_retries - 1, 0)))
+
+
+def _jittered(capped: float, jitter: str) -> float:
+    """Apply a jitter strategy to a capped exponential delay."""
+    if jitter == "full":
+        return _rng.uniform(0, capped)
+    if jitter == "equal":
+        half = capped / 2
+        return half + _rng.uniform(0, half)
+    return capped
+
 
 def retry_with_backoff(
     max_retries: int = 3,
     initial_delay: float = 1.0,
     max_delay: float = 60.0,
     exponential_base: float = 2.0,
-    exceptions: tuple = (Exception,)
+    exceptions: tuple = (Exception,),
+    jitter: str = "full"
 ):
     """
     Decorator for retrying functions with exponential backoff.
     
+    Coroutine functions get an async wrapper that backs off with asyncio.sleep,
+    so waiting for a retry does not block the event loop.
+    
     Args:
         max_retries: Maximum number of retry attempts
         initial_delay: Initial delay in seconds
         max_delay: Maximum delay in seconds
         exponential_base: Base for exponential backoff
         exceptions: Tuple of exceptions to catch and retry on
+        jitter: Jitter strategy, one of JITTER_MODES
     """
+    _check_jitter(jitter)
+    delays = _delay_schedule(max_retries, initial_delay, max_delay, exponential_base)
+    
     def decorator(func: Callable[..., T]) -> Callable[..., T]:
+        func_name = func.__name__
+        
         @wraps(func)
         def wrapper(*args, **kwargs) -> T:
-            delay = initial_delay
             last_exception = None
             
             for attempt in range(max_retries):
@@ -41,33 +89,188 @@ def retry_with_backoff(
                 except exceptions as e:
                     last_exception = e
                     if attempt < max_retries - 1:
-                        logger.warning(
-                            "retry_attempt",
-                            function=func.__name__,
-                            attempt=attempt + 1,
+                        delay = _jittered(delays[attempt], jitter)
+                        if logger.isEnabledFor(logging.WARNING):
+                            logger.warning(
+                                "retry_attempt",
+                                function=func_name,
+                                attempt=attempt + 1,
+                                max_retries=max_retries,
+                                delay=delay,
+                                error_type=type(e).__name__
+                            )
+                        time.sleep(delay)
+                    else:
+                        logger.error(
+                            "retry_exhausted",
+                            function=func_name,
                             max_retries=max_retries,
-                            delay=delay,
                             error=str(e)
                         )
-                        time.sleep(delay)
-                        delay = min(delay * exponential_base, max_delay)
+            
+            raise last_exception
+        
+        @wraps(func)
+        async def async_wrapper(*args, **kwargs) -> T:
+            last_exception = None
+            
+            for attempt in range(max_retries):
+                try:
+                    return await func(*args, **kwargs)
+                except exceptions as e:
+                    last_exception = e
+                    if attempt < max_retries - 1:
+                        delay = _jittered(delays[attempt], jitter)
+                        if logger.isEnabledFor(logging.WARNING):
+                            logger.warning(
+                                "retry_attempt",
+                                function=func_name,
+                                attempt=attempt + 1,
+                                max_retries=max_retries,
+                                delay=delay,
+                                error_type=type(e).__name__
+                            )
+                        await asyncio.sleep(delay)
                     else:
                         logger.error(
                             "retry_exhausted",
-                            function=func.__name__,
+                            function=func_name,
                             max_retries=max_retries,
                             error=str(e)
                         )
             
             raise last_exception
         
+        if inspect.iscoroutinefunction(func):
+            return async_wrapper
         return wrapper
     return decorator
 
 
+# Errors that a retry cannot fix; RetryHandler re-raises them immediately
+NON_RETRYABLE_EXCEPTIONS = (ConfigurationError, ValidationError)
+
+
+class CircuitBreaker:
+    """
+    Closed/open/half-open circuit breaker for one retry target.
+    
+    After failure_threshold consecutive failures the circuit opens and calls are
+    refused until recovery_timeout has passed. One probe call is then let through
+    (half-open): success closes the circuit, failure reopens it.
+    """
+    
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+    
+    def __init__(self, name: str, failure_threshold: int = 5, recovery_timeout: float = 30.0):
+        """
+        Initialize circuit breaker.
+        
+        Args:
+            name: Target name used in logs and errors
+            failure_threshold: Consecutive failures that open the circuit
+            recovery_timeout: Seconds the circuit stays open before a probe is allowed
+        """
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.state = self.CLOSED
+        self._failures = 0
+        # Time the circuit opened, or the current probe started, on the time.monotonic() clock
+        self._since = 0.0
+        self._lock = threading.Lock()
+    
+    def allow(self) -> bool:
+        """Return True if a call may proceed now."""
+        with self._lock:
+            if self.state == self.CLOSED:
+                return True
+            # Open: wait out the recovery timeout. Half-open: one probe at a time,
+            # unless the probe never reported back (e.g. it was cancelled)
+            if time.monotonic() - self._since < self.recovery_timeout:
+                return False
+            self.state = self.HALF_OPEN
+            self._since = time.monotonic()
+            return True
+    
+    def record_success(self):
+        """Close the circuit after a successful call."""
+        with self._lock:
+            self.state = self.CLOSED
+            self._failures = 0
+    
+    def record_failure(self):
+        """Count a failed call, opening the circuit at the threshold or on a failed probe."""
+        with self._lock:
+            self._failures += 1
+            if self.state == self.HALF_OPEN or self._failures >= self.failure_threshold:
+                if self.state != self.OPEN:
+                    logger.warning("circuit_opened", target=self.name, failures=self._failures)
+                self.state = self.OPEN
+                self._since = time.monotonic()
+    
+    def call(self, func: Callable[..., T], *args, **kwargs) -> T:
+        """
+        Call a function through the breaker.
+        
+        Raises:
+            CircuitOpenError: If the circuit is open
+        """
+        if not self.allow():
+            raise CircuitOpenError(f"Circuit open for {self.name}", self.name)
+        try:
+            result = func(*args, **kwargs)
+        except Exception:
+            self.record_failure()
+            raise
+        self.record_success()
+        return result
+
+
+class RetryBudget:
+    """
+    Token-bucket retry budget.
+    
+    Every call deposits `rate` tokens, up to `burst`, and every retry spends one,
+    so across many calls retries stay near `rate` of traffic while a sick
+    dependency is not hammered with max_retries attempts per call.
+    """
+    
+    def __init__(self, rate: float = 0.1, burst: int = 10):
+        """
+        Initialize retry budget.
+        
+        Args:
+            rate: Tokens deposited per call (the sustained retry ratio)
+            burst: Maximum tokens, and the initial balance
+        """
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._lock = threading.Lock()
+    
+    def record_call(self):
+        """Deposit tokens for a new call."""
+        with self._lock:
+            self._tokens = min(self.burst, self._tokens + self.rate)
+    
+    def try_acquire(self) -> bool:
+        """Spend a token for a retry; False if the budget is exhausted."""
+        with self._lock:
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return True
+            return False
+
+
 class RetryHandler:
     """
     Retry handler for operations with exponential backoff.
+    
+    Optionally guards each target function with a CircuitBreaker and caps
+    retries with a shared RetryBudget.
     """
     
     def __init__(
@@ -75,7 +278,12 @@ class RetryHandler:
         max_retries: int = 3,
         initial_delay: float = 1.0,
         max_delay: float = 60.0,
-        exponential_base: float = 2.0
+        exponential_base: float = 2.0,
+        jitter: str = "full",
+        failure_threshold: Optional[int] = None,
+        recovery_timeout: float = 30.0,
+        retry_budget: Optional[RetryBudget] = None,
+        non_retryable: tuple = NON_RETRYABLE_EXCEPTIONS
     ):
         """
         Initialize retry handler.
@@ -85,17 +293,102 @@ class RetryHandler:
             initial_delay: Initial delay in seconds
             max_delay: Maximum delay in seconds
             exponential_base: Base for exponential backoff
+            jitter: Jitter strategy, one of JITTER_MODES ("none" for deterministic delays)
+            failure_threshold: Consecutive failures that open a target's circuit
+                (None disables circuit breaking)
+            recovery_timeout: Seconds an open circuit waits before a probe call
+            retry_budget: Optional budget consulted before every retry
+            non_retryable: Exceptions re-raised without retrying
         """
+        _check_jitter(jitter)
         self.max_retries = max_retries
         self.initial_delay = initial_delay
         self.max_delay = max_delay
         self.exponential_base = exponential_base
+        self.jitter = jitter
+        self._delays = _delay_schedule(max_retries, initial_delay, max_delay, exponential_base)
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.retry_budget = retry_budget
+        self.non_retryable = non_retryable
+        # Breaker key (see _breaker_for) -> its circuit breaker
+        self._breakers: Dict[Hashable, CircuitBreaker] = {}
+    
+    def _breaker_for(self, func: Callable, breaker_key: Optional[Hashable] = None) -> Optional[CircuitBreaker]:
+        """
+        Return the circuit breaker for a target, if circuit breaking is enabled.
+        
+        Without an explicit breaker_key, plain functions are keyed by
+        __qualname__ and bound methods by (__qualname__, id(instance)), so two
+        clients of the same class aimed at different hosts trip independently.
+        """
+        if self.failure_threshold is None:
+            return None
+        if breaker_key is None:
+            qualname = getattr(func, "__qualname__", None) or repr(func)
+            owner = getattr(func, "__self__", None)
+            if owner is None or inspect.ismodule(owner):
+                breaker_key, name = qualname, qualname
+            else:
+                breaker_key, name = (qualname, id(owner)), f"{qualname}@{id(owner):#x}"
+        else:
+            name = str(breaker_key)
+        breaker = self._breakers.get(breaker_key)
+        if breaker is None:
+            breaker = self._breakers.setdefault(
+                breaker_key, CircuitBreaker(name, self.failure_threshold, self.recovery_timeout)
+            )
+        return breaker
+    
+    @staticmethod
+    def _check_circuit(breaker: Optional[CircuitBreaker], last_exception: Optional[BaseException]):
+        """Stop before an attempt the breaker refuses, keeping the last real error if any."""
+        if breaker is not None and not breaker.allow():
+            if last_exception is not None:
+                raise last_exception
+            raise CircuitOpenError(f"Circuit open for {breaker.name}", breaker.name)
+    
+    def _next_delay(self, attempt: int, func_name: str, error: Exception) -> Optional[float]:
+        """
+        Decide whether to retry after a failed attempt.
+        
+        Intermediate attempts log only the error type; the message is
+        stringified once, when retrying stops.
+        
+        Returns:
+            Seconds to sleep before the next attempt, or None to give up
+        """
+        if attempt >= self.max_retries - 1:
+            logger.error(
+                "retry_exhausted",
+                function=func_name,
+                max_retries=self.max_retries,
+                error=str(error)
+            )
+            return None
+        
+        if self.retry_budget is not None and not self.retry_budget.try_acquire():
+            logger.warning("retry_budget_exhausted", function=func_name, error=str(error))
+            return None
+        
+        delay = _jittered(self._delays[attempt], self.jitter)
+        if logger.isEnabledFor(logging.WARNING):
+            logger.warning(
+                "retry_attempt",
+                function=func_name,
+                attempt=attempt + 1,
+                max_retries=self.max_retries,
+                delay=delay,
+                error_type=type(error).__name__
+            )
+        return delay
     
     def execute(
         self,
         func: Callable[..., T],
         *args,
         exceptions: tuple = (Exception,),
+        breaker_key: Optional[Hashable] = None,
         **kwargs
     ) -> T:
         """
@@ -105,40 +398,174 @@ class RetryHandler:
             func: Function to execute
             *args: Positional arguments
             exceptions: Exceptions to catch and retry on
+            breaker_key: Optional key naming the circuit breaker to use, e.g. a host
+            **kwargs: Keyword arguments
+            
+        Returns:
+            Function result
+            
+        Raises:
+            Last exception if all retries fail, or CircuitOpenError if the
+            target's circuit is open
+        """
+        breaker = self._breaker_for(func, breaker_key)
+        func_name = func.__name__
+        if self.retry_budget is not None:
+            self.retry_budget.record_call()
+        last_exception = None
+        
+        for attempt in range(self.max_retries):
+            self._check_circuit(breaker, last_exception)
+            try:
+                result = func(*args, **kwargs)
+            except self.non_retryable:
+                # The target answered; the request itself is at fault
+                if breaker is not None:
+                    breaker.record_success()
+                raise
+            except exceptions as e:
+                if breaker is not None:
+                    breaker.record_failure()
+                last_exception = e
+                delay = self._next_delay(attempt, func_name, e)
+                if delay is None:
+                    break
+                time.sleep(delay)
+            except Exception:
+                if breaker is not None:
+                    breaker.record_failure()
+                raise
+            else:
+                if breaker is not None:
+                    breaker.record_success()
+                return result
+        
+        raise last_exception
+    
+    async def execute_async(
+        self,
+        func: Callable[..., Awaitable[T]],
+        *args,
+        exceptions: tuple = (Exception,),
+        breaker_key: Optional[Hashable] = None,
+        **kwargs
+    ) -> T:
+        """
+        Execute a coroutine function with retry logic, backing off with asyncio.sleep.
+        
+        Args:
+            func: Coroutine function to execute
+            *args: Positional arguments
+            exceptions: Exceptions to catch and retry on
+            breaker_key: Optional key naming the circuit breaker to use, e.g. a host
             **kwargs: Keyword arguments
             
         Returns:
             Function result
             
         Raises:
-            Last exception if all retries fail
+            Last exception if all retries fail, or CircuitOpenError if the
+            target's circuit is open
         """
-        delay = self.initial_delay
+        breaker = self._breaker_for(func, breaker_key)
+        func_name = func.__name__
+        if self.retry_budget is not None:
+            self.retry_budget.record_call()
         last_exception = None
         
         for attempt in range(self.max_retries):
+            self._check_circuit(breaker, last_exception)
             try:
-                return func(*args, **kwargs)
+                result = await func(*args, **kwargs)
+            except self.non_retryable:
+                if breaker is not None:
+                    breaker.record_success()
+                raise
             except exceptions as e:
+                if breaker is not None:
+                    breaker.record_failure()
                 last_exception = e
-                if attempt < self.max_retries - 1:
-                    logger.warning(
-                        "retry_attempt",
-                        function=func.__name__,
-                        attempt=attempt + 1,
-                        max_retries=self.max_retries,
-                        delay=delay,
-                        error=str(e)
-                    )
-                    time.sleep(delay)
-                    delay = min(delay * self.exponential_base, self.max_delay)
-                else:
-                    logger.error(
-                        "retry_exhausted",
-                        function=func.__name__,
-                        max_retries=self.max_retries,
-                        error=str(e)
-                    )
+                delay = self._next_delay(attempt, func_name, e)
+                if delay is None:
+                    break
+                await asyncio.sleep(delay)
+            except Exception:
+                if breaker is not None:
+                    breaker.record_failure()
+                raise
+            else:
+                if breaker is not None:
+                    breaker.record_success()
+                return result
         
         raise last_exception
 
+
+JSON_FEEDBACK_PROMPT = "Your output had error: {error}. Fix and retry, JSON only."
+
+
+def _append_feedback(messages: List[Dict[str, str]], content: str, error: str) -> List[Dict[str, str]]:
+    """Return the conversation extended with the bad answer and a correction request."""
+    return messages + [
+        {"role": "assistant", "content": content},
+        {"role": "user", "content": JSON_FEEDBACK_PROMPT.format(error=error)}
+    ]
+
+
+def chat_with_json_feedback(
+    chat: Callable[[List[Dict[str, str]]], str],
+    messages: List[Dict[str, str]],
+    schema: Optional[Dict[str, Any]] = None,
+    max_retries: int = 2,
+    backoff: float = 1.0,
+    trace_id: Optional[str] = None
+) -> str:
+    """
+    Call an LLM and ask it to self-correct when its JSON output is malformed.
+    
+    Args:
+        chat: Function sending a message list to the LLM and returning the content
+        messages: Initial conversation
+        schema: Optional JSON schema the response must satisfy
+        max_retries: Maximum number of correction rounds
+        backoff: Linear backoff in seconds (attempt N sleeps N * backoff)
+        trace_id: Optional trace ID for logging
+        
+    Returns:
+        The first valid response, or the last response if retries are exhausted
+    """
+    for attempt in range(max_retries + 1):
+        content = chat(messages)
+        error = validate_json_response(content, schema)
+        if error is None:
+            return content
+        with trace_scope(trace_id):
+            if attempt == max_retries:
+                logger.warning("json_feedback_exhausted", max_retries=max_retries, error=error)
+                return content
+            logger.warning("json_feedback_retry", attempt=attempt + 1, max_retries=max_retries, error=error)
+        messages = _append_feedback(messages, content, error)
+        time.sleep(backoff * (attempt + 1))
+
+
+async def achat_with_json_feedback(
+    chat: Callable[[List[Dict[str, str]]], Awaitable[str]],
+    messages: List[Dict[str, str]],
+    schema: Optional[Dict[str, Any]] = None,
+    max_retries: int = 2,
+    backoff: float = 1.0,
+    trace_id: Optional[str] = None
+) -> str:
+    """Async variant of chat_with_json_feedback for coroutine chat functions."""
+    for attempt in range(max_retries + 1):
+        content = await chat(messages)
+        error = validate_json_response(content, schema)
+        if error is None:
+            return content
+        with trace_scope(trace_id):
+            if attempt == max_retries:
+                logger.warning("json_feedback_exhausted", max_retries=max_retries, error=error)
+                return content
+            logger.warning("json_feedback_retry", attempt=attempt + 1, max_retries=max_retries, error=error)
+        messages = _append_feedback(messages, content, error)
+        await asyncio.sleep(backoff * (attempt + 1))
@@ -0,0 +1,53 @@
+"""
+Vectorized range/NaN checks for extracted numeric values.
+"""
+import numpy as np
+
+try:
+    from numba import njit, prange
+except ImportError:  # Numba is optional; fall back to plain numpy
+    njit = None
+    prange = range
+
+# Values at or beyond this magnitude are treated as extraction noise
+MAX_ABS_VALUE = 1e18
+
+# Below this size the JIT kernel's thread start-up costs more than numpy
+JIT_MIN_SIZE = 1000
+
+
+def _check_numpy(values: np.ndarray) -> np.ndarray:
+    """Return a mask of values that are finite and within +/- MAX_ABS_VALUE."""
+    return (values > -MAX_ABS_VALUE) & (values < MAX_ABS_VALUE)
+
+
+def _check_loop(values: np.ndarray) -> np.ndarray:
+    """Loop form of _check_numpy, compiled with numba when it is installed."""
+    out = np.ones(values.size, np.bool_)
+    for i in prange(values.size):
+        v = values[i]
+        out[i] = (not np.isnan(v)) and v > -MAX_ABS_VALUE and v < MAX_ABS_VALUE
+    return out
+
+
+if njit is not None:
+    _check_loop = njit(cache=True, parallel=True)(_check_loop)
+
+
+def check_numeric_values(values: np.ndarray) -> np.ndarray:
+    """
+    Check a batch of numeric values in one pass.
+
+    NaN and infinities fail because every comparison against them is False
+    (or out of range).
+
+    Args:
+        values: float64 array of values
+
+    Returns:
+        Boolean array, True where the value is valid
+    """
+    values = np.asarray(values, dtype=np.float64)
+    if njit is not None and values.size >= JIT_MIN_SIZE:
+        return _check_loop(values)
+    return _check_numpy(values)
@@ -1,27 +1,120 @@
 """
 Input validation and sanitization utilities.
+
+The module is fully annotated so it can be compiled in place with
+``mypyc utils/validation.py`` (the Docker image does this at build time); the
+resulting extension shadows this file on import. Without it, this pure-Python
+module is used unchanged.
 """
-from typing import Any, Dict, Optional, List
+import threading
+from collections import OrderedDict
+from types import MappingProxyType
+from typing import AbstractSet, Any, Callable, Dict, Optional, List, Tuple, Union
 from utils.logger import get_logger
 from utils.exceptions import ValidationError
 
 logger = get_logger(__name__)
 
+# Schema "type" names understood by validate_dict_structure
+_TYPE_MAP = MappingProxyType({
+    "str": str,
+    "int": int,
+    "float": float,
+    "bool": bool,
+    "list": list,
+    "dict": dict,
+})
+
+# (value, field_name) -> value; raises ValidationError on a type mismatch
+TypeCheck = Callable[[Any, str], Any]
+
+# (field_name, required, type check, default)
+CompiledField = Tuple[str, bool, TypeCheck, Any]
+
+# Maximum number of compiled schemas kept by validate_dict_structure
+SCHEMA_CACHE_SIZE = 256
 
-def validate_required_fields(data: Dict[str, Any], required_fields: List[str]) -> None:
+# id(schema) -> (schema, compiled fields); holding the schema keeps its id from being reused
+_SCHEMA_CACHE: "OrderedDict[int, Tuple[Dict[str, Dict[str, Any]], Tuple[CompiledField, ...]]]" = OrderedDict()
+_SCHEMA_CACHE_LOCK = threading.Lock()
+
+
+def validate_required_fields(
+    data: Dict[str, Any],
+    required_fields: Union[List[str], AbstractSet[str]]
+) -> None:
     """
     Validate that required fields are present in a dictionary.
     
     Args:
         data: Dictionary to validate
-        required_fields: List of required field names
+        required_fields: Required field names; callers validating repeatedly
+            can pass a prebuilt frozenset to skip the conversion
         
     Raises:
-        ValidationError: If any required field is missing
+        ValidationError: If any required field is missing (listed sorted)
     """
-    missing = [field for field in required_fields if field not in data or data[field] is None]
+    required = required_fields if isinstance(required_fields, AbstractSet) else set(required_fields)
+    missing = required - {key for key, value in data.items() if value is not None}
     if missing:
-        raise ValidationError(f"Missing required fields: {', '.join(missing)}")
+        raise ValidationError(f"Missing required fields: {', '.join(sorted(missing))}")
+
+
+def make_string_validator(
+    field_name: str,
+    min_length: Optional[int] = None,
+    max_length: Optional[int] = None,
+    allowed_values: Optional[List[str]] = None
+) -> Callable[[Any], str]:
+    """
+    Build a reusable validator for a string field.
+    
+    Only the checks that were configured end up in the returned function, so
+    validators built once from a schema cost nothing for unused options.
+    
+    Args:
+        field_name: Name of the field (for error messages)
+        min_length: Minimum length (optional)
+        max_length: Maximum length (optional)
+        allowed_values: List of allowed values (optional)
+        
+    Returns:
+        Function that returns the value if valid and raises ValidationError otherwise
+    """
+    checks: List[Callable[[str, int], None]] = []
+    
+    if min_length is not None:
+        def check_min(value: str, length: int) -> None:
+            if length < min_length:
+                raise ValidationError(f"{field_name} must be at least {min_length} characters")
+        checks.append(check_min)
+    
+    if max_length is not None:
+        def check_max(value: str, length: int) -> None:
+            if length > max_length:
+                raise ValidationError(f"{field_name} must be at most {max_length} characters")
+        checks.append(check_max)
+    
+    if allowed_values is not None:
+        allowed = frozenset(allowed_values)
+        
+        def check_allowed(value: str, length: int) -> None:
+            if value not in allowed:
+                raise ValidationError(f"{field_name} must be one of {allowed_values}, got '{value}'")
+        checks.append(check_allowed)
+    
+    checks_tuple = tuple(checks)
+    
+    def validate(value: Any) -> str:
+        if not isinstance(value, str):
+            raise ValidationError(f"{field_name} must be a string, got {type(value).__name__}")
+        if checks_tuple:
+            length = len(value)
+            for check in checks_tuple:
+                check(value, length)
+        return value
+    
+    return validate
 
 
 def validate_string_field(
@@ -34,6 +127,9 @@ def validate_string_field(
     """
     Validate a string field.
     
+    Callers validating the same field repeatedly should build a validator
+    once with make_string_validator instead.
+    
     Args:
         value: Value to validate
         field_name: Name of the field (for error messages)
@@ -47,19 +143,7 @@ def validate_string_field(
     Raises:
         ValidationError: If validation fails
     """
-    if not isinstance(value, str):
-        raise ValidationError(f"{field_name} must be a string, got {type(value).__name__}")
-    
-    if min_length is not None and len(value) < min_length:
-        raise ValidationError(f"{field_name} must be at least {min_length} characters")
-    
-    if max_length is not None and len(value) > max_length:
-        raise ValidationError(f"{field_name} must be at most {max_length} characters")
-    
-    if allowed_values is not None and value not in allowed_values:
-        raise ValidationError(f"{field_name} must be one of {allowed_values}, got '{value}'")
-    
-    return value
+    return make_string_validator(field_name, min_length, max_length, allowed_values)(value)
 
 
 def sanitize_string(value: Any, max_length: Optional[int] = None) -> str:
@@ -76,15 +160,80 @@ def sanitize_string(value: Any, max_length: Optional[int] = None) -> str:
     if value is None:
         return ""
     
-    sanitized = str(value).strip()
+    text = value if type(value) is str else str(value)
+    sanitized = text.strip()
     
     if max_length and len(sanitized) > max_length:
         sanitized = sanitized[:max_length]
-        logger.warning("string_truncated", original_length=len(str(value)), truncated_length=max_length)
+        logger.warning("string_truncated", original_length=len(text), truncated_length=max_length)
     
     return sanitized
 
 
+def _make_type_check(python_type: type, type_name: str) -> TypeCheck:
+    """Build the type check for one schema type name."""
+    def check(value: Any, field_name: str) -> Any:
+        # Exact-type compare first; isinstance keeps subclasses (and bool as int) valid
+        if type(value) is python_type or isinstance(value, python_type):
+            return value
+        raise ValidationError(
+            f"Field '{field_name}' has wrong type. Expected {type_name}, got {type(value).__name__}"
+        )
+    return check
+
+
+def _unchecked(value: Any, field_name: str) -> Any:
+    """Type check for schema types validate_dict_structure does not know."""
+    return value
+
+
+# Prebuilt type checks for the canonical schema type names
+_CHECKERS = MappingProxyType({
+    type_name: _make_type_check(python_type, type_name)
+    for type_name, python_type in _TYPE_MAP.items()
+})
+
+
+def _type_check_for(type_name: str) -> TypeCheck:
+    """Return the type check for a schema type name, keeping its spelling in errors."""
+    check = _CHECKERS.get(type_name)
+    if check is not None:
+        return check
+    python_type = _TYPE_MAP.get(type_name.lower())
+    return _make_type_check(python_type, type_name) if python_type is not None else _unchecked
+
+
+def _compile_schema(schema: Dict[str, Dict[str, Any]]) -> Tuple[CompiledField, ...]:
+    """Resolve every field spec of a schema once into a flat record."""
+    compiled = []
+    for field_name, field_spec in schema.items():
+        compiled.append((
+            field_name,
+            field_spec.get("required", False),
+            _type_check_for(field_spec.get("type", "str")),
+            field_spec.get("default")
+        ))
+    return tuple(compiled)
+
+
+def _compiled_schema(schema: Dict[str, Dict[str, Any]]) -> Tuple[CompiledField, ...]:
+    """Return the compiled form of a schema, compiling it on first use."""
+    key = id(schema)
+    with _SCHEMA_CACHE_LOCK:
+        entry = _SCHEMA_CACHE.get(key)
+        if entry is not None and entry[0] is schema:
+            _SCHEMA_CACHE.move_to_end(key)
+            return entry[1]
+    
+    compiled = _compile_schema(schema)
+    with _SCHEMA_CACHE_LOCK:
+        _SCHEMA_CACHE[key] = (schema, compiled)
+        _SCHEMA_CACHE.move_to_end(key)
+        while len(_SCHEMA_CACHE) > SCHEMA_CACHE_SIZE:
+            _SCHEMA_CACHE.popitem(last=False)
+    return compiled
+
+
 def validate_dict_structure(
     data: Dict[str, Any],
     schema: Dict[str, Dict[str, Any]]
@@ -92,6 +241,9 @@ def validate_dict_structure(
     """
     Validate dictionary structure against a schema.
     
+    Schemas are compiled on first use and the compiled form is reused for the
+    same schema object, so a schema must not be mutated after it is used.
+    
     Args:
         data: Dictionary to validate
         schema: Schema definition
@@ -111,37 +263,16 @@ def validate_dict_structure(
     """
     validated = {}
     
-    for field_name, field_spec in schema.items():
-        is_required = field_spec.get("required", False)
-        expected_type = field_spec.get("type", "str")
-        default_value = field_spec.get("default")
-        
-        if field_name not in data or data[field_name] is None:
+    for field_name, is_required, check, default_value in _compiled_schema(schema):
+        value = data.get(field_name)
+        if value is None:
             if is_required:
                 raise ValidationError(f"Required field '{field_name}' is missing")
             if default_value is not None:
                 validated[field_name] = default_value
             continue
         
-        value = data[field_name]
-        
-        # Type checking
-        type_map = {
-            "str": str,
-            "int": int,
-            "float": float,
-            "bool": bool,
-            "list": list,
-            "dict": dict,
-        }
-        
-        expected_python_type = type_map.get(expected_type.lower())
-        if expected_python_type and not isinstance(value, expected_python_type):
-            raise ValidationError(
-                f"Field '{field_name}' has wrong type. Expected {expected_type}, got {type(value).__name__}"
-            )
-        
-        validated[field_name] = value
+        validated[field_name] = check(value, field_name)
     
     return validated
 